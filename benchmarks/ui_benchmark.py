@@ -0,0 +1,255 @@
+"""Headless UI benchmarks of FocusTUI driven by Textual's Pilot.
+
+Save results:
+    python benchmarks/ui_benchmark.py --output baseline.json
+
+Compare with saved results, exit code is 1 when any benchmark is slower
+than baseline by more than tolerance:
+    python benchmarks/ui_benchmark.py --baseline baseline.json
+"""
+import asyncio
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import click
+
+from focustui.audio_backend import RecordingBackend
+
+# App reads its paths on import, so point it to a throwaway folder first
+os.environ["FOCUSTUI_DATA_DIR"] = tempfile.mkdtemp(prefix="focustui-bench-")
+os.environ.setdefault("FOCUSTUI_AUDIO", "null")
+
+from focustui.main import (
+    SHORTS_PATH,
+    SOUNDS_PATH,
+    Button,
+    ConfigManager,
+    DatabaseManager,
+    EditSound,
+    FocusScreen,
+    FocusTUI,
+    Input,
+    OptionList,
+    SettingsScreen,
+    SoundManager,
+    setup_app,
+)
+from focustui.sound_store import SoundStore
+
+DEFAULT_SIZES: tuple[int, ...] = (10, 1_000, 10_000)
+TICKS: int = 10_000
+AUDIO_COMMANDS: int = 1_000
+SOUND_PREFIX: str = "bench_"
+TIMEOUT: float = 600
+
+
+async def _wait_until(predicate: Callable[[], bool]) -> None:
+    """Let app process messages until predicate is true.
+
+    Pilot.pause is not used because it gives up on slow screens.
+    """
+    deadline = time.perf_counter() + TIMEOUT
+    while not predicate():
+        if time.perf_counter() > deadline:
+            msg = "Benchmark timed out"
+            raise TimeoutError(msg)
+        await asyncio.sleep(0.001)
+
+
+async def _timed(coroutine: Awaitable) -> float:
+    start = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - start
+
+
+def populate_sounds(count: int) -> None:
+    """Replace benchmark sounds with `count` empty sound files.
+
+    Sounds live in the sound store, files put in the shorts folder
+    are moved to it when SoundManager is created.
+    """
+    store = SoundStore(SOUNDS_PATH)
+    store.remove_many(
+        [name for name, _ in store.sounds() if name.startswith(SOUND_PREFIX)],
+    )
+    for i in range(count):
+        (SHORTS_PATH / f"{SOUND_PREFIX}{i:05}.wav").touch()
+
+
+async def bench_focus_screen(results: dict[str, float]) -> None:
+    """Mount FocusScreen and simulate clock ticks."""
+    sm = SoundManager()
+    app = FocusTUI(
+        db=DatabaseManager(), cm=ConfigManager(), sm=sm, analyse_sounds=False,
+    )
+    start = time.perf_counter()
+    async with app.run_test() as pilot:
+        await _wait_until(lambda: isinstance(app.screen, FocusScreen))
+        results["focus_screen.mount"] = time.perf_counter() - start
+
+        async def ticks() -> None:
+            for _ in range(TICKS):
+                app.session._stopwatch_tick()
+            await pilot.pause()
+
+        results[f"clock.ticks[{TICKS}]"] = await _timed(ticks())
+
+
+def bench_audio(results: dict[str, float]) -> None:
+    """Measure time from play request to the backend call on audio thread."""
+    populate_sounds(1)
+    backend = RecordingBackend()
+    sm = SoundManager(backend=backend)
+    latencies = []
+    for _ in range(AUDIO_COMMANDS):
+        start = time.perf_counter()
+        sm.play_sound(f"{SOUND_PREFIX}00000", 50)
+        sm.wait_audio()
+        played = next(e for e in reversed(backend.events) if e["command"] == "play")
+        latencies.append(played["time"] - start)
+    sm.shutdown_audio()
+    latencies.sort()
+    results[f"audio.play_latency.p50[{AUDIO_COMMANDS}]"] = latencies[
+        len(latencies) // 2
+    ]
+    results[f"audio.play_latency.max[{AUDIO_COMMANDS}]"] = latencies[-1]
+    populate_sounds(0)
+
+
+async def bench_sounds(results: dict[str, float], size: int) -> None:
+    """Compose SettingsScreen, EditSound and rename a sound."""
+    populate_sounds(size)
+    cm = ConfigManager()
+    sm = SoundManager()
+    app = FocusTUI(db=DatabaseManager(), cm=cm, sm=sm, analyse_sounds=False)
+    async with app.run_test():
+        await _wait_until(lambda: isinstance(app.screen, FocusScreen))
+
+        app.open_settings()
+        results[f"settings_screen.compose[{size}]"] = await _timed(
+            _wait_until(
+                lambda: isinstance(app.screen, SettingsScreen)
+                and app.screen.is_mounted,
+            ),
+        )
+
+        screen = EditSound("short", sm=sm, cm=cm)
+        app.push_screen(screen)
+        results[f"edit_sound.compose[{size}]"] = await _timed(
+            _wait_until(lambda: app.screen is screen and screen.is_mounted),
+        )
+
+        new_name = f"{SOUND_PREFIX}renamed"
+        sounds_list = screen.query_one("#sounds-list", OptionList)
+        sounds_list.highlighted = 0
+        await _wait_until(lambda: not screen.query_one("#sound-name-input").disabled)
+        screen.query_one("#sound-name-input", Input).value = new_name
+        rename_button = screen.query_one("#sound-rename-bt", Button)
+        await _wait_until(lambda: not rename_button.disabled)
+        rename_button.press()
+        results[f"edit_sound.rename[{size}]"] = await _timed(
+            _wait_until(lambda: rename_button.disabled),
+        )
+    populate_sounds(0)
+
+
+async def run_benchmarks(sizes: tuple[int, ...], repeat: int) -> dict[str, float]:
+    """Run every benchmark `repeat` times and keep the fastest result."""
+    setup_app()
+    best: dict[str, float] = {}
+    for _ in range(repeat):
+        results: dict[str, float] = {}
+        await bench_focus_screen(results)
+        bench_audio(results)
+        for size in sizes:
+            await bench_sounds(results, size)
+        for name, value in results.items():
+            best[name] = min(value, best.get(name, value))
+    return best
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+) -> list[str]:
+    """Return names of benchmarks slower than baseline by more than tolerance."""
+    return [
+        name
+        for name, value in results.items()
+        if name in baseline and value > baseline[name] * (1 + tolerance)
+    ]
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default=",".join(map(str, DEFAULT_SIZES)),
+    show_default=True,
+    help="Comma separated numbers of sounds in the library.",
+)
+@click.option("--repeat", default=1, show_default=True, help="Runs per benchmark.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write results as JSON.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Compare with results saved with --output.",
+)
+@click.option(
+    "--tolerance",
+    default=0.25,
+    show_default=True,
+    help="Allowed slowdown compared to baseline, 0.25 means 25%.",
+)
+def main(
+    sizes: str,
+    repeat: int,
+    output: Path | None,
+    baseline: Path | None,
+    tolerance: float,
+) -> None:
+    """Run UI benchmarks."""
+    parsed_sizes = tuple(int(size) for size in sizes.split(","))
+    try:
+        results = asyncio.run(run_benchmarks(parsed_sizes, repeat))
+    finally:
+        shutil.rmtree(os.environ["FOCUSTUI_DATA_DIR"], ignore_errors=True)
+
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if output is not None:
+        output.write_text(json.dumps(document, indent=4))
+
+    base: dict[str, float] = {}
+    if baseline is not None:
+        base = json.loads(baseline.read_text())["results"]
+
+    click.echo(f"{'Benchmark':<36}{'Seconds':>12}{'Baseline':>12}{'Ratio':>8}")
+    for name, value in results.items():
+        line = f"{name:<36}{value:>12.4f}"
+        if name in base:
+            line += f"{base[name]:>12.4f}{value / base[name]:>8.2f}"
+        click.echo(line)
+
+    regressions = compare(results, base, tolerance)
+    if regressions:
+        click.echo(click.style("Regressions: " + ", ".join(regressions), "red"))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
 import os
+import time
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+
+# Used by profiler to measure how long it takes to import the app
+IMPORT_STARTED: tuple[float, float] = (time.perf_counter(), time.process_time())
@@ -0,0 +1,347 @@
+"""Analysis of sounds: duration, format, peak and loudness.
+
+Sounds are decoded and analysed in a process pool, so UI is never blocked.
+Results are cached in library metadata keyed by content hash of the file,
+so unchanged file is never analysed twice.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import struct
+import wave
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+HASH_CHUNK_SIZE: int = 1024 * 1024
+ANALYSIS_FREQUENCY: int = 44100
+# Values used when sound is silent
+SILENCE_DB: float = -120.0
+# Loudness is measured in blocks of 400 ms overlapping by 75% like in BS.1770
+LOUDNESS_BLOCK: float = 0.4
+LOUDNESS_ABSOLUTE_GATE: float = -70.0
+LOUDNESS_RELATIVE_GATE: float = -10.0
+# Loudness every sound is brought to when normalization is on
+NORMALIZED_LOUDNESS: float = -18.0
+
+_mixer_ready = False
+
+T = TypeVar("T")
+
+
+class SoundAnalysis(BaseModel):
+    """Result of analysis of a single sound."""
+
+    duration: float
+    channels: int
+    sample_rate: int
+    peak: float
+    """Peak level in dBFS."""
+    loudness: float
+    """Gated loudness in LUFS, without K-weighting filter."""
+
+
+class _FileStamp(BaseModel):
+    size: int
+    mtime_ns: int
+    hash: str
+
+
+def _stamp_file(path: Path) -> _FileStamp:
+    """Return size, modification time and hash of the file."""
+    stat = path.stat()
+    return _FileStamp(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        hash=file_hash(path),
+    )
+
+
+class LibraryModel(BaseModel):
+    """Metadata of sounds library stored next to config."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    files: dict[str, _FileStamp] = {}
+    analysis: dict[str, SoundAnalysis | None] = {}
+    """Content hash mapped to analysis, None if file could not be decoded."""
+
+
+def file_hash(path: Path) -> str:
+    """Return hash of file content, file is read in chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _probe_format(path: Path) -> tuple[int, int] | None:
+    """Return channels and sample rate read from the file header."""
+    try:
+        with path.open("rb") as file:
+            header = file.read(4096)
+    except OSError:
+        return None
+
+    if header.startswith(b"RIFF"):
+        try:
+            with wave.open(str(path)) as wav:
+                return wav.getnchannels(), wav.getframerate()
+        except (wave.Error, EOFError):
+            return None
+
+    if header.startswith(b"fLaC") and len(header) >= 42:  # noqa: PLR2004
+        # STREAMINFO: 20 bits of sample rate and 3 bits of channels - 1
+        info = header[8:42]
+        sample_rate = int.from_bytes(info[10:13]) >> 4
+        channels = ((info[12] >> 1) & 0b111) + 1
+        return channels, sample_rate
+
+    if header.startswith(b"OggS"):
+        return _probe_ogg(header)
+
+    return None
+
+
+def _probe_ogg(header: bytes) -> tuple[int, int] | None:
+    """Return channels and sample rate of Vorbis or Opus stream."""
+    vorbis = header.find(b"\x01vorbis")
+    if vorbis != -1:
+        channels, sample_rate = struct.unpack_from("<BI", header, vorbis + 11)
+        return channels, sample_rate
+    opus = header.find(b"OpusHead")
+    if opus != -1:
+        # Opus is always decoded at 48 kHz
+        return header[opus + 9], 48000
+    return None
+
+
+def _is_mp3(header: bytes) -> bool:
+    """MP3 starts with ID3 tag or with sync word of its first frame."""
+    return header.startswith(b"ID3") or (
+        len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0  # noqa: PLR2004
+    )
+
+
+def probe_sound(path: Path) -> bool:
+    """Return True if header of the file is of a format mixer decodes.
+
+    Only header is read, so thousands of files are probed in a moment.
+    """
+    if path.suffix.lower() == ".mp3":
+        try:
+            with path.open("rb") as file:
+                return _is_mp3(file.read(4))
+        except OSError:
+            return False
+    return _probe_format(path) is not None
+
+
+def init_worker_mixer() -> None:
+    """Init mixer once per worker process, it is needed only to decode."""
+    global _mixer_ready  # noqa: PLW0603
+    if _mixer_ready:
+        return
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    import pygame
+
+    pygame.mixer.init(frequency=ANALYSIS_FREQUENCY, size=-16, channels=2)
+    _mixer_ready = True
+
+
+def _to_db(value: float) -> float:
+    if value <= 0:
+        return SILENCE_DB
+    return max(SILENCE_DB, 10 * math.log10(value))
+
+
+def analyse_sound(path: Path) -> SoundAnalysis | None:
+    """Decode sound and measure it, return None if it can't be decoded.
+
+    Run it in a worker process.
+    """
+    # Optional dependency and mixer, only worker processes import them
+    import numpy as np
+    import pygame
+
+    init_worker_mixer()
+    try:
+        sound = pygame.mixer.Sound(path)
+    except pygame.error:
+        return None
+
+    frequency, _, mixer_channels = pygame.mixer.get_init()
+    channels, sample_rate = _probe_format(path) or (mixer_channels, frequency)
+
+    # Mixer duplicates mono to both channels, so measure only one of them
+    samples = pygame.sndarray.array(sound)
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+    samples = samples[:, :channels].astype(np.float32) / 32768.0
+    frames = samples.shape[0]
+    if frames == 0:
+        return SoundAnalysis(
+            duration=0,
+            channels=channels,
+            sample_rate=sample_rate,
+            peak=SILENCE_DB,
+            loudness=SILENCE_DB,
+        )
+
+    peak = float(np.abs(samples).max())
+
+    # Mean square of every block computed from cumulative sum of power
+    power = np.square(samples, dtype=np.float64).sum(axis=1)
+    cumulative = np.concatenate(([0.0], np.cumsum(power)))
+    block = min(int(LOUDNESS_BLOCK * frequency), frames)
+    starts = np.arange(0, frames - block + 1, max(1, block // 4))
+    mean_squares = (cumulative[starts + block] - cumulative[starts]) / block
+    with np.errstate(divide="ignore"):
+        blocks_loudness = -0.691 + 10 * np.log10(mean_squares)
+
+    gated = mean_squares[blocks_loudness > LOUDNESS_ABSOLUTE_GATE]
+    if gated.size:
+        relative_gate = -0.691 + _to_db(gated.mean()) + LOUDNESS_RELATIVE_GATE
+        gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+    loudness = -0.691 + _to_db(gated.mean()) if gated.size else SILENCE_DB
+
+    return SoundAnalysis(
+        duration=frames / frequency,
+        channels=channels,
+        sample_rate=sample_rate,
+        peak=_to_db(peak ** 2),
+        loudness=max(SILENCE_DB, loudness),
+    )
+
+
+def loudness_gain(analysis: SoundAnalysis | None) -> float:
+    """Return linear gain that brings sound to NORMALIZED_LOUDNESS,
+    limited so peak of the sound never clips.
+    """
+    if analysis is None or analysis.loudness <= SILENCE_DB:
+        return 1.0
+    gain_db = min(NORMALIZED_LOUDNESS - analysis.loudness, -analysis.peak)
+    return 10 ** (gain_db / 20)
+
+
+def is_analysis_available() -> bool:
+    """Analysis needs optional numpy dependency."""
+    return find_spec("numpy") is not None
+
+
+class SoundAnalyser:
+    """Analyse sounds in a process pool and cache results by content hash."""
+
+    def __init__(self, library_path: Path, max_workers: int | None = None) -> None:
+        self._library_path = library_path
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+        self.library = self._load_library()
+
+    def _load_library(self) -> LibraryModel:
+        try:
+            with self._library_path.open() as file:
+                return LibraryModel.model_validate(json.load(file))
+        except (OSError, ValueError):
+            return LibraryModel()
+
+    def save_library(self) -> None:
+        """Write metadata to temporary file and replace old one with it."""
+        temp_path = self._library_path.with_suffix(".tmp")
+        with temp_path.open("w") as file:
+            json.dump(self.library.model_dump(), file)
+        temp_path.replace(self._library_path)
+
+    def start(self) -> None:
+        """Create the pool before Textual replaces stderr,
+        multiprocessing needs its file descriptor to start.
+        """
+        self._get_pool()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawn, because forking process with running SDL is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def run(self, function: Callable[..., T], *args: object) -> T:
+        """Run function in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), function, *args)
+
+    def cached(self, path: Path) -> tuple[bool, SoundAnalysis | None]:
+        """Return analysis of unchanged file without reading it."""
+        stamp = self.library.files.get(str(path))
+        try:
+            stat = path.stat()
+        except OSError:
+            return False, None
+        if (
+            stamp is None
+            or stamp.size != stat.st_size
+            or stamp.mtime_ns != stat.st_mtime_ns
+            or stamp.hash not in self.library.analysis
+        ):
+            return False, None
+        return True, self.library.analysis[stamp.hash]
+
+    async def _analyse_one(self, path: Path) -> tuple[Path, SoundAnalysis | None]:
+        stamp = await self.run(_stamp_file, path)
+        self.library.files[str(path)] = stamp
+        content_hash = stamp.hash
+        if content_hash not in self.library.analysis:
+            result = await self.run(analyse_sound, path)
+            self.library.analysis[content_hash] = result
+        return path, self.library.analysis[content_hash]
+
+    async def analyse(
+        self,
+        paths: Iterable[Path],
+    ) -> AsyncIterator[tuple[Path, SoundAnalysis | None]]:
+        """Yield analysis of every path as soon as it is ready.
+
+        Cached results are yielded first, then the rest is analysed
+        in the pool and library metadata is saved once at the end.
+        """
+        missing: list[Path] = []
+        for path in paths:
+            is_cached, analysis = self.cached(path)
+            if is_cached:
+                yield path, analysis
+            else:
+                missing.append(path)
+        if not missing:
+            return
+
+        tasks = [asyncio.ensure_future(self._analyse_one(path)) for path in missing]
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    yield await task
+                except OSError:
+                    continue
+                except BrokenExecutor:
+                    # Worker died, rest of sounds will be analysed next time
+                    self._pool = None
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.save_library()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
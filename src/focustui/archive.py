@@ -0,0 +1,180 @@
+"""Per-year archives of old sessions.
+
+Archive is a compact columnar binary file: header followed by columns
+of session starts (epoch seconds), ids, lengths (minutes) and done
+flags, sorted by start. That is 11 bytes per session. Files are
+memory-mapped only when they are read, so a query of one year never
+touches other archives.
+"""
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+
+ARCHIVE_MAGIC: bytes = b"FTSA"
+ARCHIVE_VERSION: int = 1
+_HEADER = struct.Struct("<4sBxxxI")
+# Column typecode, every column has one value per session
+_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("starts", "I"),
+    ("ids", "I"),
+    ("lengths", "H"),
+    ("done", "B"),
+)
+
+
+class ArchiveError(Exception):
+    """Archive file is not valid."""
+
+
+class ArchiveColumns:
+    """Columns of sessions, each is a sequence of ints of the same length."""
+
+    __slots__ = ("done", "ids", "lengths", "starts")
+
+    def __init__(
+        self,
+        starts: array | memoryview,
+        ids: array | memoryview,
+        lengths: array | memoryview,
+        done: array | memoryview,
+    ) -> None:
+        self.starts = starts
+        self.ids = ids
+        self.lengths = lengths
+        self.done = done
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def write_archive(path: Path, columns: ArchiveColumns) -> None:
+    """Write columns sorted by start to archive, file is replaced atomically."""
+    order = sorted(range(len(columns)), key=columns.starts.__getitem__)
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as file:
+        file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(order)))
+        for name, typecode in _COLUMNS:
+            column = getattr(columns, name)
+            file.write(array(typecode, (column[i] for i in order)).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+
+
+class ArchiveReader:
+    """Lazily memory-mapped archive of one year."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._mmap: mmap.mmap | None = None
+        self._columns: ArchiveColumns | None = None
+
+    @property
+    def columns(self) -> ArchiveColumns:
+        """Columns as views of the mapped file, nothing is copied."""
+        if self._columns is None:
+            self._columns = self._map()
+        return self._columns
+
+    def _map(self) -> ArchiveColumns:
+        with self.path.open("rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            magic, version, count = _HEADER.unpack_from(view)
+        except struct.error:
+            magic, version, count = b"", 0, 0
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            view.release()
+            self.close()
+            msg = f"{self.path.name} is not a session archive"
+            raise ArchiveError(msg)
+
+        offset = _HEADER.size
+        columns = {}
+        for name, typecode in _COLUMNS:
+            size = count * array(typecode).itemsize
+            columns[name] = view[offset:offset + size].cast(typecode)
+            offset += size
+        return ArchiveColumns(**columns)
+
+    def slice(self, start: float, end: float) -> tuple[int, int]:
+        """Return indexes of first and after last session in [start, end)."""
+        starts = self.columns.starts
+        return bisect_left(starts, start), bisect_left(starts, end)
+
+    def close(self) -> None:
+        if self._columns is not None:
+            for name, _ in _COLUMNS:
+                getattr(self._columns, name).release()
+            self._columns = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class SessionArchive:
+    """Folder with one archive file per year."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._readers: dict[int, ArchiveReader] = {}
+
+    def _file(self, year: int) -> Path:
+        return self.path / f"sessions-{year}.bin"
+
+    def years(self) -> list[int]:
+        return sorted(int(path.stem[9:]) for path in self.path.glob("sessions-*.bin"))
+
+    def reader(self, year: int) -> ArchiveReader | None:
+        """Return reader of the year, None if it has no archive."""
+        if year not in self._readers:
+            if not self._file(year).exists():
+                return None
+            self._readers[year] = ArchiveReader(self._file(year))
+        return self._readers[year]
+
+    def rows(
+        self, year: int, start: float, end: float,
+    ) -> Iterator[tuple[int, int, int]]:
+        """Yield start, length and done of archived sessions in [start, end)."""
+        reader = self.reader(year)
+        if reader is None:
+            return
+        first, last = reader.slice(start, end)
+        columns = reader.columns
+        for i in range(first, last):
+            yield columns.starts[i], columns.lengths[i], columns.done[i]
+
+    def add(self, year: int, columns: ArchiveColumns) -> None:
+        """Merge sessions into archive of the year.
+
+        Sessions that are already in the archive are skipped.
+        """
+        self.path.mkdir(exist_ok=True)
+        reader = self.reader(year)
+        merged = ArchiveColumns(array("I"), array("I"), array("H"), array("B"))
+        known: set[int] = set()
+        if reader is not None:
+            old = reader.columns
+            for name, _ in _COLUMNS:
+                getattr(merged, name).extend(getattr(old, name))
+            known.update(old.ids)
+            # Mapped file can't be replaced on Windows
+            reader.close()
+            del self._readers[year]
+        for i in range(len(columns)):
+            if columns.ids[i] in known:
+                continue
+            for name, _ in _COLUMNS:
+                getattr(merged, name).append(getattr(columns, name)[i])
+        write_archive(self._file(year), merged)
+
+    def close(self) -> None:
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
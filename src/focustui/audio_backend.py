@@ -0,0 +1,169 @@
+"""Audio backends used by SoundManager.
+
+Pygame backend plays sounds, null backend does nothing and recording
+backend logs every command with its time, so app can run without
+an audio device and benchmarks can see when sounds would be played.
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Literal
+
+from focustui.profiler import profiler
+
+AudioBackendTypeLit = Literal["pygame", "null", "recording"]
+AUDIO_BACKENDS: tuple[AudioBackendTypeLit, ...] = ("pygame", "null", "recording")
+
+
+class AudioBackend(ABC):
+    """Interface of audio backend, channels are numbered from 0."""
+
+    name: AudioBackendTypeLit
+
+    @abstractmethod
+    def init(self, channels: int) -> None:
+        """Open audio device with `channels` mixer channels."""
+
+    @abstractmethod
+    def load(self, path: Path) -> object:
+        """Decode sound and return object that can be played."""
+
+    @abstractmethod
+    def play(self, channel: int, sound: object, loops: int = 0) -> None: ...
+
+    @abstractmethod
+    def stop(self, channel: int) -> None: ...
+
+    @abstractmethod
+    def set_volume(self, channel: int, volume: float) -> None: ...
+
+    @abstractmethod
+    def is_busy(self, channel: int) -> bool: ...
+
+    def close(self) -> None:  # noqa: B027 - most backends hold nothing
+        """Release resources, backend can still be used after it."""
+
+
+class PygameBackend(AudioBackend):
+    name = "pygame"
+
+    def __init__(self) -> None:
+        # Imported here, so headless runs never import pygame
+        import pygame
+
+        self._pygame = pygame
+        self._channels: list[pygame.mixer.Channel] = []
+
+    def init(self, channels: int) -> None:
+        pygame = self._pygame
+        # Same phase as before backends, so startup reports stay comparable
+        with profiler.phase("pygame.init"):
+            pygame.init()
+        pygame.mixer.init(channels=2)
+        pygame.mixer.set_num_channels(channels)
+        # Reserved channels are never picked by pygame on its own
+        pygame.mixer.set_reserved(channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def load(self, path: Path) -> object:
+        return self._pygame.mixer.Sound(path)
+
+    def play(self, channel: int, sound: object, loops: int = 0) -> None:
+        self._channels[channel].play(sound, loops=loops)
+
+    def stop(self, channel: int) -> None:
+        self._channels[channel].stop()
+
+    def set_volume(self, channel: int, volume: float) -> None:
+        self._channels[channel].set_volume(volume)
+
+    def is_busy(self, channel: int) -> bool:
+        return self._channels[channel].get_busy()
+
+
+class NullBackend(AudioBackend):
+    """Backend that plays nothing and costs nothing."""
+
+    name = "null"
+
+    def init(self, channels: int) -> None:
+        pass
+
+    def load(self, path: Path) -> object:
+        return path
+
+    def play(self, channel: int, sound: object, loops: int = 0) -> None:
+        pass
+
+    def stop(self, channel: int) -> None:
+        pass
+
+    def set_volume(self, channel: int, volume: float) -> None:
+        pass
+
+    def is_busy(self, channel: int) -> bool:
+        return False
+
+
+class RecordingBackend(AudioBackend):
+    """Backend that records every command with its time.
+
+    Played sound keeps its channel busy until it is stopped.
+    Events are written as JSON lines to `log_path` on close.
+    """
+
+    name = "recording"
+
+    def __init__(self, log_path: Path | None = None) -> None:
+        self.log_path = log_path
+        self.events: list[dict] = []
+        self._busy: set[int] = set()
+
+    def _record(self, command: str, **arguments: object) -> None:
+        self.events.append(
+            {"time": time.perf_counter(), "command": command, **arguments},
+        )
+
+    def init(self, channels: int) -> None:
+        self._record("init", channels=channels)
+
+    def load(self, path: Path) -> object:
+        self._record("load", path=str(path))
+        return path
+
+    def play(self, channel: int, sound: object, loops: int = 0) -> None:
+        self._record("play", channel=channel, sound=str(sound), loops=loops)
+        self._busy.add(channel)
+
+    def stop(self, channel: int) -> None:
+        self._record("stop", channel=channel)
+        self._busy.discard(channel)
+
+    def set_volume(self, channel: int, volume: float) -> None:
+        self._record("set_volume", channel=channel, volume=volume)
+
+    def is_busy(self, channel: int) -> bool:
+        return channel in self._busy
+
+    def close(self) -> None:
+        if self.log_path is None:
+            return
+        with self.log_path.open("a") as file:
+            for event in self.events:
+                file.write(json.dumps(event) + "\n")
+        self.events.clear()
+
+
+def create_backend(
+    name: AudioBackendTypeLit,
+    log_path: Path | None = None,
+) -> AudioBackend:
+    """Return backend by its name, `log_path` is used by recording one."""
+    match name:
+        case "null":
+            return NullBackend()
+        case "recording":
+            return RecordingBackend(log_path)
+        case _:
+            return PygameBackend()
@@ -0,0 +1,77 @@
+"""Thread that runs audio commands away from the event loop."""
+import queue
+import threading
+import time
+from collections.abc import Callable
+
+from focustui.metrics import metrics
+
+
+class AudioCommand:
+    """Function queued to run on the audio thread."""
+
+    __slots__ = ("function", "name", "submitted")
+
+    def __init__(self, name: str, function: Callable[[], object]) -> None:
+        self.name: str = name
+        self.function: Callable[[], object] = function
+        self.submitted: float = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return f"AudioCommand({self.name})"
+
+
+class AudioWorker:
+    """Run audio commands one by one on a single thread.
+
+    Submitting never blocks, `on_done` is called on the audio thread
+    after every command with error raised by it or None.
+    """
+
+    def __init__(
+        self,
+        on_done: Callable[[AudioCommand, BaseException | None], None] | None = None,
+    ) -> None:
+        self.on_done = on_done
+        self._queue: queue.Queue[AudioCommand | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, name: str, function: Callable[[], object]) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="focustui-audio",
+                daemon=True,
+            )
+            self._thread.start()
+        self._queue.put_nowait(AudioCommand(name, function))
+
+    def _run(self) -> None:
+        while (command := self._queue.get()) is not None:
+            metrics.observe(
+                "audio.queue_ms",
+                (time.perf_counter() - command.submitted) * 1000,
+            )
+            error = None
+            try:
+                command.function()
+            except Exception as exception:  # noqa: BLE001
+                error = exception
+                metrics.increment("audio.errors")
+            if self.on_done is not None:
+                self.on_done(command, error)
+            self._queue.task_done()
+        self._queue.task_done()
+
+    def wait(self) -> None:
+        """Block until every submitted command is done."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Finish queued commands and stop the thread."""
+        if self._thread is None:
+            return
+        self._queue.put_nowait(None)
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,123 @@
+"""Command line of the app.
+
+Commands that only read files never import the app, so they don't pay
+for importing Textual and pygame and can run from shell prompts.
+"""
+import json
+from pathlib import Path
+
+import click
+from click import Choice, echo, style
+
+from focustui.audio_backend import AUDIO_BACKENDS, AudioBackendTypeLit
+from focustui.paths import ARCHIVE_PATH, DB_FILE_PATH, LOCATABLE_PATHS, SOUNDS_PATH
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    help="Measure startup phases, close app after first paint and print report.",
+)
+@click.option(
+    "--profile-json",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write startup report as JSON to the file instead of printing it.",
+)
+@click.option(
+    "--profile-cprofile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Dump cProfile stats of the startup to the file.",
+)
+@click.option(
+    "--audio",
+    type=Choice(AUDIO_BACKENDS),
+    help="Audio backend, 'null' plays nothing and 'recording' logs "
+         "every audio command to the audio log instead of playing it. "
+         "[default: FOCUSTUI_AUDIO or pygame]",
+)
+@click.pass_context
+def main(
+    ctx,
+    profile_startup: bool,
+    profile_json: Path | None,
+    profile_cprofile: Path | None,
+    audio: AudioBackendTypeLit | None,
+) -> None:
+    """Start app."""
+    if ctx.invoked_subcommand is not None:
+        # Prevent app start on command use
+        return
+
+    # Commands that don't start the app don't import it
+    from focustui.main import start_app
+
+    start_app(
+        audio=audio,
+        profile_startup=profile_startup,
+        profile_json=profile_json,
+        profile_cprofile=profile_cprofile,
+    )
+
+
+@main.command()
+@click.argument("what", type=Choice(list(LOCATABLE_PATHS.keys())))
+def locate(what: str) -> None:
+    """Help you find location of a needed resource used by the app."""
+    echo(style("Path: ", "green") + str(LOCATABLE_PATHS[what]))
+
+
+@main.command()
+@click.option("--json", "as_json", is_flag=True, help="Print report as JSON.")
+def stats(as_json: bool) -> None:
+    """Print focus of today, this week and the streak."""
+    from focustui.history import SessionHistory
+    from focustui.stats import StatsEngine, stats_report
+
+    history = SessionHistory(DB_FILE_PATH, ARCHIVE_PATH)
+    # Numpy import takes longer than loops over history of a few years
+    report = stats_report(StatsEngine(history, vectorized=False))
+    history.close()
+
+    if as_json:
+        echo(json.dumps(report))
+        return
+    for name in ("today", "week"):
+        totals = report[name]
+        echo(
+            style(f"{name.capitalize() + ':':<8}", "green")
+            + f"{totals['done_minutes']} min focused in {totals['done']} of "
+            f"{totals['sessions']} sessions",
+        )
+    streak = report["streak"]
+    echo(
+        style(f"{'Streak:':<8}", "green")
+        + f"{streak['current']} days, longest {streak['longest']} days",
+    )
+
+
+@main.command("import-sounds")
+@click.argument(
+    "folder",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option(
+    "--type",
+    "length_type",
+    type=Choice(["short", "long"]),
+    default="short",
+    show_default=True,
+    help="Import as sounds played once or as ambients.",
+)
+def import_sounds(folder: Path, length_type: str) -> None:
+    """Import sounds of the folder and its subfolders.
+
+    Running app lists them after restart.
+    """
+    from focustui.sound_store import SoundStore, walk_sounds
+
+    store = SoundStore(SOUNDS_PATH)
+    summary = store.import_files(walk_sounds(folder), length_type)
+    for path in summary.skipped:
+        echo(style("Skipped: ", "yellow") + str(path))
+    echo(style("Done: ", "green") + summary.describe())
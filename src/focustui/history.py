@@ -0,0 +1,230 @@
+"""History of focus sessions in SQLite with old sessions archived.
+
+Sessions older than the archive horizon are moved to per-year
+archives. Their rollups per day and hour stay in the database,
+statistics are computed from them and never read the archive.
+Queries of sessions read the archive for ranges before
+`archived_until` and the database after it.
+"""
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from sqlite3 import Connection, connect
+
+from focustui.archive import ArchiveColumns, SessionArchive
+
+# Seconds to wait for other instance writing to DB
+DB_BUSY_TIMEOUT: float = 5.0
+
+SCHEMA: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS study_sessions(
+        id INTEGER PRIMARY KEY,
+        length INTEGER,
+        date DATE,
+        done BIT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS session_rollups(
+        day TEXT,
+        hour INTEGER,
+        sessions INTEGER,
+        done INTEGER,
+        minutes INTEGER,
+        done_minutes INTEGER,
+        PRIMARY KEY (day, hour)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS archive_state(
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        archived_until TEXT
+    )
+    """,
+)
+
+
+def format_date(date: datetime) -> str:
+    """Return date as it is stored in DB, local time without zone."""
+    return date.isoformat(" ", "seconds")
+
+
+class SessionHistory:
+    def __init__(self, db_file: Path, archive_path: Path) -> None:
+        self.db_file = db_file
+        self.archive = SessionArchive(archive_path)
+        self._prepared = False
+
+    def connect(self) -> Connection:
+        """Connect to DB, waiting while other instance writes to it.
+
+        In WAL mode readers of other instances never block a writer.
+        """
+        con = connect(self.db_file, timeout=DB_BUSY_TIMEOUT)
+        if not self._prepared:
+            # Mode is saved in DB file, set it for DBs created without it
+            con.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                con.execute(statement)
+            self._prepared = True
+        return con
+
+    def setup(self) -> None:
+        """Create tables that don't exist yet."""
+        self.connect().close()
+
+    def record(self, length: int, is_successful: int, date: datetime) -> None:
+        with self.connect() as con:
+            con.execute(
+                "INSERT INTO study_sessions(length, date, done) VALUES (?, ?, ?)",
+                (length, format_date(date), is_successful),
+            )
+
+    def archived_until(self, con: Connection) -> str | None:
+        row = con.execute("SELECT archived_until FROM archive_state").fetchone()
+        return None if row is None else row[0]
+
+    def archive_before(self, cutoff: datetime) -> int:
+        """Move sessions older than cutoff to archive and return their number.
+
+        Archive is written before rows are deleted in the same transaction,
+        if app dies in between, rows stay in DB and are archived next time.
+        """
+        cutoff_date = format_date(cutoff)
+        with self.connect() as con:
+            con.execute("BEGIN IMMEDIATE")
+            rows = con.execute(
+                "SELECT id, date, length, done FROM study_sessions WHERE date < ?",
+                (cutoff_date,),
+            ).fetchall()
+            if not rows:
+                return 0
+
+            years: dict[int, list[tuple]] = defaultdict(list)
+            rollups: dict[tuple[str, int], list[int]] = defaultdict(lambda: [0] * 4)
+            for session_id, date, length, done in rows:
+                started = datetime.fromisoformat(date)
+                years[started.year].append(
+                    (int(started.timestamp()), session_id, length, done),
+                )
+                rollup = rollups[date[:10], started.hour]
+                rollup[0] += 1
+                rollup[1] += done
+                rollup[2] += length
+                rollup[3] += length * done
+
+            for year, year_rows in years.items():
+                self.archive.add(year, ArchiveColumns(*zip(*year_rows, strict=True)))
+            con.executemany(
+                """
+                INSERT INTO session_rollups(
+                    day, hour, sessions, done, minutes, done_minutes
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(day, hour) DO UPDATE SET
+                    sessions = sessions + excluded.sessions,
+                    done = done + excluded.done,
+                    minutes = minutes + excluded.minutes,
+                    done_minutes = done_minutes + excluded.done_minutes
+                """,
+                [(*key, *values) for key, values in rollups.items()],
+            )
+            con.execute("DELETE FROM study_sessions WHERE date < ?", (cutoff_date,))
+            archived_until = self.archived_until(con)
+            con.execute(
+                "INSERT OR REPLACE INTO archive_state VALUES (0, ?)",
+                (max(archived_until or cutoff_date, cutoff_date),),
+            )
+        return len(rows)
+
+    def session_count(self) -> int:
+        """Return number of sessions in DB and in rollups of archived ones."""
+        if not self.db_file.exists():
+            return 0
+        with self.connect() as con:
+            return con.execute(
+                """
+                SELECT (SELECT COUNT(*) FROM study_sessions)
+                    + (SELECT IFNULL(SUM(sessions), 0) FROM session_rollups)
+                """,
+            ).fetchone()[0]
+
+    def statistics_rows(
+        self,
+    ) -> tuple[list[tuple[datetime, int, int, int, int]], list[tuple[int, int, int]]]:
+        """Return rollups of archived sessions and sessions in DB.
+
+        Rollups are hour, sessions, done, minutes and done minutes sorted
+        by hour, sessions are start epoch, length and done.
+        """
+        if not self.db_file.exists():
+            # App was never started, nothing to read
+            return [], []
+        with self.connect() as con:
+            # Both tables in one snapshot, so sessions archived meanwhile
+            # by other instance are counted once
+            con.execute("BEGIN")
+            rollups = con.execute(
+                """
+                SELECT day, hour, sessions, done, minutes, done_minutes
+                FROM session_rollups ORDER BY day, hour
+                """,
+            ).fetchall()
+            rows = con.execute(
+                "SELECT date, length, done FROM study_sessions ORDER BY date",
+            ).fetchall()
+        return (
+            [
+                (datetime.fromisoformat(day).replace(hour=hour), *sums)
+                for day, hour, *sums in rollups
+            ],
+            [
+                (int(datetime.fromisoformat(date).timestamp()), length, done)
+                for date, length, done in rows
+            ],
+        )
+
+    def sessions(
+        self, start: datetime | None = None, end: datetime | None = None,
+    ) -> Iterator[tuple[int, int, int]]:
+        """Yield start epoch, length and done of sessions in [start, end).
+
+        Range without start or end is open on that side. Sessions before
+        `archived_until` are read from the archive.
+        """
+        if not self.db_file.exists():
+            # App was never started, nothing to read
+            return
+        # Dates are compared as text, empty one is before every date
+        start_date = "" if start is None else format_date(start)
+        end_date = None if end is None else format_date(end)
+        with self.connect() as con:
+            archived_until = self.archived_until(con)
+            rows = con.execute(
+                """
+                SELECT date, length, done FROM study_sessions
+                WHERE date >= ? AND (? IS NULL OR date < ?) ORDER BY date
+                """,
+                (start_date, end_date, end_date),
+            ).fetchall()
+
+        if archived_until is not None and start_date < archived_until:
+            archive_end = datetime.fromisoformat(
+                archived_until if end_date is None else min(end_date, archived_until),
+            )
+            for year in self.archive.years():
+                if start is not None and year < start.year:
+                    continue
+                if year > archive_end.year:
+                    break
+                yield from self.archive.rows(
+                    year,
+                    0 if start is None else start.timestamp(),
+                    archive_end.timestamp(),
+                )
+        for date, length, done in rows:
+            yield int(datetime.fromisoformat(date).timestamp()), length, done
+
+    def close(self) -> None:
+        self.archive.close()
@@ -0,0 +1,102 @@
+"""Coordination of app instances running at the same time.
+
+Instances in several terminals share the app folder. Writes of shared
+files are done under an advisory file lock and merged with changes
+of other instances. One instance at a time is the leader, it holds
+the instance lock as long as it runs and owns files that can have
+only one writer.
+"""
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(file: IO[str], *, blocking: bool) -> None:
+        file.seek(0)
+        mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+        msvcrt.locking(file.fileno(), mode, 1)
+
+    def _unlock(file: IO[str]) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(file: IO[str], *, blocking: bool) -> None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        fcntl.flock(file.fileno(), flags)
+
+    def _unlock(file: IO[str]) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def lock_path(path: Path) -> Path:
+    """Return path of the lock file next to the file."""
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Wait for exclusive lock of the file and hold it while block runs.
+
+    Lock is taken on a separate lock file, so the file itself can be
+    replaced while it is locked.
+    """
+    with lock_path(path).open("a") as file:
+        _lock(file, blocking=True)
+        try:
+            yield
+        finally:
+            _unlock(file)
+
+
+def merge_changes(base: dict, mine: dict, theirs: dict) -> dict:
+    """Merge top level keys changed by this and other instances.
+
+    Key changed by this instance since `base` takes its value,
+    every other key takes value written by other instances.
+    """
+    return {
+        key: value if value != base.get(key) else theirs.get(key, value)
+        for key, value in mine.items()
+    }
+
+
+class InstanceLock:
+    """Lock that the leader instance holds as long as it runs.
+
+    First instance becomes the leader, others are followers until the
+    leader exits and one of them takes the lock on its next try.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: IO[str] | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Become the leader if no other instance is, never waits."""
+        if self._file is not None:
+            return True
+        file = self.path.open("a")
+        try:
+            _lock(file, blocking=False)
+        except OSError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        _unlock(self._file)
+        self._file.close()
+        self._file = None
@@ -0,0 +1,137 @@
+"""Append-only journal of the running session.
+
+Session writes a start record, a checkpoint every minute and an end
+record. Every record is flushed, so it survives a killed process,
+and synced to disk in batches, so power loss costs a few minutes
+at most. If the journal has no end record, the app was closed in the
+middle of a session, and next launch can resume it or record it.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO, Literal
+
+SessionResultTypeLit = Literal["successful", "killed", "cancelled"]
+
+# Start and end records are always synced
+CHECKPOINTS_PER_FSYNC: int = 5
+
+
+class UnfinishedSession:
+    """Session read from journal without an end record."""
+
+    __slots__ = ("elapsed", "length", "mode", "queue", "started")
+
+    def __init__(
+        self,
+        mode: str,
+        length: int,
+        started: float,
+        elapsed: int,
+        queue: str | None,
+    ) -> None:
+        self.mode: str = mode
+        self.length: int = length
+        self.started: float = started
+        """Wall clock time of session start."""
+        self.elapsed: int = elapsed
+        """Seconds of the session at last checkpoint."""
+        self.queue: str | None = queue
+
+    def __repr__(self) -> str:
+        return f"UnfinishedSession({self.mode}, {self.elapsed}/{self.length})"
+
+    def remaining(self, now: float | None = None) -> int:
+        """Return seconds left to the deadline of timer or queue."""
+        now = time.time() if now is None else now
+        return max(0, int(self.started + self.length - now))
+
+
+class SessionJournal:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: IO[str] | None = None
+        self._unsynced: int = 0
+
+    def _write(self, record: dict, *, sync: bool) -> None:
+        if self._file is None:
+            self._file = self.path.open("a")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= CHECKPOINTS_PER_FSYNC:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def start(
+        self,
+        mode: str,
+        length: int,
+        queue: str | None = None,
+        started: float | None = None,
+    ) -> None:
+        """Begin journal of new session, journal of previous one is dropped."""
+        self.close()
+        self._file = self.path.open("w")
+        self._write(
+            {
+                "type": "start",
+                "mode": mode,
+                "length": length,
+                "queue": queue,
+                "started": time.time() if started is None else started,
+            },
+            sync=True,
+        )
+
+    def checkpoint(self, elapsed: int) -> None:
+        self._write({"type": "checkpoint", "elapsed": elapsed}, sync=False)
+
+    def end(self, result: SessionResultTypeLit, elapsed: int) -> None:
+        self._write(
+            {"type": "end", "result": result, "elapsed": elapsed},
+            sync=True,
+        )
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+
+
+def read_unfinished(path: Path) -> UnfinishedSession | None:
+    """Return session from journal if it has no end record."""
+    try:
+        lines = path.read_text().splitlines()
+    except FileNotFoundError:
+        return None
+
+    start = None
+    elapsed = 0
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # Last line can be cut off by a crash
+            break
+        match record.get("type"):
+            case "start":
+                start = record
+                elapsed = 0
+            case "checkpoint":
+                elapsed = record["elapsed"]
+            case "end":
+                start = None
+
+    if start is None:
+        return None
+    return UnfinishedSession(
+        mode=start["mode"],
+        length=start["length"],
+        started=start["started"],
+        elapsed=elapsed,
+        queue=start.get("queue"),
+    )
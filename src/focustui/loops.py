@@ -0,0 +1,85 @@
+"""Gapless ambient loops.
+
+Tail of the sound is blended into its head once, and the result is saved
+as a WAV file, so looping it has no seam and costs nothing at runtime.
+"""
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from focustui.analysis import init_worker_mixer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+LOOPS_DIR_NAME: str = ".loops"
+CROSSFADE_SECONDS: float = 2.0
+# Crossfade never takes more than this part of the sound
+MAX_CROSSFADE_PART: float = 0.25
+
+
+def loop_path(sound_path: Path) -> Path:
+    """Return path of the loop cached next to the sound."""
+    return sound_path.parent / LOOPS_DIR_NAME / f"{sound_path.stem}.wav"
+
+
+def is_loop_fresh(sound_path: Path) -> bool:
+    """Loop is fresh when it was built after the sound was modified."""
+    try:
+        return loop_path(sound_path).stat().st_mtime_ns >= sound_path.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def crossfade_loop(samples: "np.ndarray", fade: int) -> "np.ndarray":
+    """Return samples shorter by `fade` frames that loop without a seam.
+
+    Last `fade` frames are blended into the first ones with equal-power
+    curves, so playback wraps from the blend right into frame `fade`.
+    """
+    import numpy as np
+
+    if fade <= 0:
+        return samples
+    curve = np.linspace(0, np.pi / 2, fade, dtype=np.float32)[:, np.newaxis]
+    head = samples[:fade].astype(np.float32)
+    tail = samples[-fade:].astype(np.float32)
+    blend = tail * np.cos(curve) + head * np.sin(curve)
+    info = np.iinfo(samples.dtype)
+    blend = np.clip(np.rint(blend), info.min, info.max).astype(samples.dtype)
+    return np.concatenate((samples[fade:-fade], blend))
+
+
+def build_loop(sound_path: Path) -> bool:
+    """Decode sound, crossfade it and save the loop, return False on failure.
+
+    Run it in a worker process.
+    """
+    import pygame
+
+    init_worker_mixer()
+    try:
+        sound = pygame.mixer.Sound(sound_path)
+    except pygame.error:
+        return False
+
+    frequency, size, _ = pygame.mixer.get_init()
+    samples = pygame.sndarray.array(sound)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    fade = min(
+        int(CROSSFADE_SECONDS * frequency),
+        int(samples.shape[0] * MAX_CROSSFADE_PART),
+    )
+    loop = crossfade_loop(samples, fade)
+
+    target = loop_path(sound_path)
+    target.parent.mkdir(exist_ok=True)
+    temp_path = target.with_suffix(".tmp")
+    with wave.open(str(temp_path), "wb") as wav:
+        wav.setnchannels(loop.shape[1])
+        wav.setsampwidth(abs(size) // 8)
+        wav.setframerate(frequency)
+        wav.writeframes(loop.tobytes())
+    temp_path.replace(target)
+    return True
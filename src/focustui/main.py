@@ -1,6 +1,9 @@
+import asyncio
+import contextlib
 import json
 import os
 import re
+import time
 import webbrowser
 import sys
 
@@ -8,30 +11,93 @@ from collections import ChainMap
 import shutil
 from pathlib import Path
 from re import Pattern
-from sqlite3 import connect
+from datetime import datetime, timedelta
 
-from typing import Iterable, Literal, cast
+from typing import TYPE_CHECKING, Callable, Iterable, Literal, cast
 
-import click
-import pygame
-from click import Choice, echo, style
-from dotenv import load_dotenv
-from platformdirs import user_data_dir
+from click import echo
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from textual.events import Click
+from textual.events import Click, DescendantBlur, DescendantFocus, Key
+from textual.message import Message
 from textual.reactive import reactive
 from textual.widget import Widget
 
 from textual.widgets import *
 from textual.validation import Validator, ValidationResult
 from textual import on
+from textual.binding import Binding
 from textual.screen import Screen, ModalScreen
 from textual.app import App, ComposeResult
 from textual.containers import Grid, Center, Horizontal, Vertical, VerticalScroll, Container
 
+from focustui.analysis import (
+    SoundAnalyser,
+    SoundAnalysis,
+    is_analysis_available,
+    loudness_gain,
+)
 from focustui.assets import *
+from focustui.audio_backend import (
+    AUDIO_BACKENDS,
+    AudioBackend,
+    AudioBackendTypeLit,
+    create_backend,
+)
+from focustui.audio_worker import AudioCommand, AudioWorker
+from focustui.history import SessionHistory
+from focustui.instances import InstanceLock, file_lock, merge_changes
+from focustui.journal import (
+    SessionJournal,
+    SessionResultTypeLit,
+    UnfinishedSession,
+    read_unfinished,
+)
+from focustui.loops import build_loop, is_loop_fresh, loop_path
+from focustui.metrics import metrics
+from focustui.mixer import ChannelPool
+from focustui.paths import (
+    ARCHIVE_PATH,
+    AUDIO_LOG_FILE_PATH,
+    CONFIG_FILE_PATH,
+    DB_FILE_PATH,
+    INSTANCE_LOCK_PATH,
+    JOURNAL_FILE_PATH,
+    LIBRARY_FILE_PATH,
+    LONGS_PATH,
+    MAIN_DIR_PATH,
+    METRICS_FILE_PATH,
+    QUEUES_PATH,
+    SHORTS_PATH,
+    SOUNDS_PATH,
+    STATUS_FILE_PATH,
+    THEMES_PATH,
+)
+from focustui.profiler import profiler
+from focustui.queues import EXAMPLE_QUEUE, Schedule, ScheduledSegment, load_queues
+from focustui.session_store import SessionStore
+from focustui.sound_index import SoundIndex
+from focustui.sound_store import (
+    SOUND_SUFFIXES,
+    ImportSummary,
+    SoundStore,
+    soundify,
+    walk_sounds,
+)
+from focustui.stats import STATS_RANGES, StatsEngine
+from focustui.status import IDLE_MODE, SessionStatus, read_status, write_status
+from focustui.themes import (
+    CACHE_DIR_NAME,
+    EXAMPLE_THEME,
+    CachedStylesheet,
+    StylesheetCache,
+    load_themes,
+)
+
+if TYPE_CHECKING:
+    from textual.timer import Timer
 
+profiler.record_imports("focustui.main")
 
 #############################
 #       Custom Types        #
@@ -40,6 +106,11 @@ from focustui.assets import *
 LengthTypeLit = Literal["short", "long"]
 InputModeTypeLit = Literal["minute", "hour_minute"]
 SoundTypeLit = Literal["alarm", "signal", "ambient", "test"]
+SoundChangeTypeLit = Literal["added", "renamed", "removed"]
+SessionModeTypeLit = Literal["stopwatch", "timer", "queue"]
+SessionEventTypeLit = Literal[
+    "started", "tick", "cancel_tick", "ended", "ambient", "segment",
+]
 VolumeTypeLit = Literal[
     "alarm_volume",
     "signal_volume",
@@ -51,10 +122,15 @@ VolumeTypeLit = Literal[
 #      Custom Settings      #
 #############################
 
-load_dotenv()
-
 # is Debug mode on
 FOCUSTUI_DEBUG: bool = os.getenv("FOCUSTUI_DEBUG") == "True"
+# Audio backend used when none is passed to SoundManager
+_audio_backend = os.getenv("FOCUSTUI_AUDIO", "pygame")
+AUDIO_BACKEND: AudioBackendTypeLit = cast(
+    "AudioBackendTypeLit",
+    _audio_backend if _audio_backend in AUDIO_BACKENDS else "pygame",
+)
+metrics.enabled = FOCUSTUI_DEBUG
 
 # Number of seconds in a minute
 _minute = os.getenv("FOCUSTUI_DEBUG_MINUTE")
@@ -74,22 +150,6 @@ SESSION_SIGNATURE: Pattern[str] = re.compile("^([0-9]{1,3}|[0-3]:[0-9]{1,2})$")
 #      Default Settings     #
 #############################
 
-# Root
-MAIN_DIR_PATH: Path = Path(user_data_dir()) / "focus-tui"
-
-# Sounds path
-SOUNDS_PATH: Path = MAIN_DIR_PATH / "sounds"
-SHORTS_PATH: Path = SOUNDS_PATH / "shorts"
-LONGS_PATH: Path = SOUNDS_PATH / "longs"
-
-# Others
-THEMES_PATH: Path = MAIN_DIR_PATH / "themes"
-QUEUES_PATH: Path = MAIN_DIR_PATH / "queues"
-
-# Files
-DB_FILE_PATH: Path = MAIN_DIR_PATH / "focus-tui.db"
-CONFIG_FILE_PATH: Path = MAIN_DIR_PATH / "config.json"
-
 # Default sounds
 DEFAULT_ALARM_NAME: str = "Woohoo"
 DEFAULT_SIGNAL_NAME: str = "Landing"
@@ -106,12 +166,29 @@ RESERVED_LONG: set[str] = {"Mexican_Forest.wav", "Woodpecker_Forest.flac"}
 RESERVED_ALL_SOUNDS: set[str] = RESERVED_SHORTS | RESERVED_LONG
 
 DEFAULT_SOUND_VOLUME: int = 50
+# Main ambient and extra layers played with it
+MAX_AMBIENT_LAYERS: int = 4
+SHORT_SOUND_CHANNELS: int = 3
+SEARCH_RESULTS_LIMIT: int = 20
 MIN_VOLUME_LEVEL: int = 1
 MAX_VOLUME_LEVEL: int = 100
+# Seconds between tries of follower instance to become leader
+LEADER_ELECTION_INTERVAL: int = 5
+# Minutes between signals that can be picked in settings
+SIGNAL_EVERY_CHOICES: tuple[int, ...] = (5, 10, 15, 20, 25, 30)
 
 DEFAULT_TIME_INPUT_TYPE: InputModeTypeLit = "minute"
 DEFAULT_CLOCK_DISPLAY_HOURS: bool = False
 DEFAULT_CLOCK_DISPLAY_SECONDS: bool = True
+DEFAULT_NORMALIZE_LOUDNESS: bool = False
+DEFAULT_CROSSFADE_AMBIENT: bool = False
+DEFAULT_THEME: str = "textual-dark"
+DEFAULT_ALARM_LEADER_ONLY: bool = False
+# Minutes between signals of a session, 0 never signals
+DEFAULT_SIGNAL_EVERY: int = 0
+DEFAULT_SIGNAL_HALFWAY: bool = False
+# Sessions older than that many days are archived, 0 never archives
+DEFAULT_ARCHIVE_AFTER_DAYS: int = 365
 
 HOURS_MINUTES_TIMER_PATTERN: Pattern[str] = re.compile(r"^([0-5]|[0-4]:[0-5]?[0-9])$")
 
@@ -142,6 +219,30 @@ def session_len_parser(string: str) -> int:
     return -1
 
 
+def next_signal_at(
+        elapsed: int,
+        length: int,
+        every: int,
+        *,
+        halfway: bool,
+) -> int | None:
+    """Return second of session of the first signal after `elapsed`.
+
+    Timer signals every `every` seconds and at half of its length, but
+    never at its end, which plays the alarm. Stopwatch has length 0
+    and signals only every `every` seconds. Return None if no signal is left.
+    """
+    offsets = []
+    if every > 0:
+        offsets.append((elapsed // every + 1) * every)
+    if halfway and length // 2 > elapsed:
+        offsets.append(length // 2)
+    return min(
+        (offset for offset in offsets if length == 0 or offset < length),
+        default=None,
+    )
+
+
 tooltip = (
     "Type 0 to set stopwatch\n"
     "Or 5-120 for timer in minutes\n"
@@ -178,16 +279,25 @@ class VolumeInput(Input):
 
 
 class Sound:
-    """Class that represent sound file."""
+    """Class that represent sound file.
 
-    def __init__(self, path: Path) -> None:
+    File is a blob of the sound store, so its name is not the name of the sound.
+    """
+
+    def __init__(self, path: Path, name: str, sound_type: LengthTypeLit) -> None:
         self.path: Path = path
-        self.parent: Path = path.parent
-        self.sound_type: str = "short" if self.parent.name == "shorts" else "long"
-        self.full_name: str = path.name
-        self.name: str = path.name.split(".")[0]
+        self.sound_type: LengthTypeLit = sound_type
         self.extension: str = path.suffix
+        self.full_name: str = name + self.extension
+        self.name: str = name
         self.is_default: bool = self.full_name in RESERVED_ALL_SOUNDS
+        self.analysis: SoundAnalysis | None = None
+        self.gain: float = 1.0
+        """Gain used when loudness is normalized, computed once from analysis."""
+
+    def set_analysis(self, analysis: SoundAnalysis | None) -> None:
+        self.analysis = analysis
+        self.gain = loudness_gain(analysis)
 
     def __repr__(self) -> str:
         return f"Sound({self.path})"
@@ -203,15 +313,42 @@ class Sound:
         return self.name < other.name
 
 
-def create_sounds_dict(path: Path) -> dict[str, Sound]:
-    """Return dict of Sounds names and Sounds object mapped to them."""
-    allowed_suffixes = {".wav", ".mp3", ".ogg", ".flac", ".opus"}
+class SoundChange:
+    """Change of sounds library emitted by SoundManager."""
 
-    return {
-        sound.name.split(".")[0]: Sound(sound)
-        for sound in path.glob("*")
-        if sound.suffix in allowed_suffixes
-    }
+    def __init__(
+        self,
+        change_type: SoundChangeTypeLit,
+        name: str,
+        length_type: LengthTypeLit,
+        old_name: str | None = None,
+    ) -> None:
+        self.change_type: SoundChangeTypeLit = change_type
+        self.name: str = name
+        self.length_type: LengthTypeLit = length_type
+        self.old_name: str | None = old_name
+
+    def __repr__(self) -> str:
+        return f"SoundChange({self.change_type}, {self.name}, {self.old_name})"
+
+
+class AudioCommandDone(Message):
+    """Posted to app from audio thread when audio command is done."""
+
+    def __init__(self, command: AudioCommand, error: BaseException | None) -> None:
+        super().__init__()
+        self.command: AudioCommand = command
+        self.error: BaseException | None = error
+
+
+def create_sounds_dicts(store: SoundStore) -> tuple[dict[str, Sound], dict[str, Sound]]:
+    """Return dicts of shorts and longs names and Sounds objects mapped to them."""
+    shorts: dict[str, Sound] = {}
+    longs: dict[str, Sound] = {}
+    for name, stored in store.sounds():
+        dict_ = shorts if stored.type == "short" else longs
+        dict_[name] = Sound(store.blob_path(stored.blob), name, stored.type)
+    return shorts, longs
 
 
 class SoundManager:
@@ -223,23 +360,115 @@ class SoundManager:
 
     _instance = None
 
-    def __new__(cls) -> "SoundManager":
+    def __new__(cls, *_args: object, **_kwargs: object) -> "SoundManager":
+        # Backend is taken by __init__
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self) -> None:
-        pygame.mixer.init(channels=2)
-        self._ambient_channel = pygame.mixer.Channel(1)
-        self._sound_channel = pygame.mixer.Channel(2)
-        """Channel 1 is for alarm and signal, Channel 2 is for ambient"""
+    def __init__(self, backend: AudioBackend | None = None) -> None:
+        with profiler.phase("sound_manager.mixer_init"):
+            self._backend = backend or create_backend(
+                AUDIO_BACKEND,
+                AUDIO_LOG_FILE_PATH,
+            )
+            self._channels = ChannelPool(
+                self._backend,
+                MAX_AMBIENT_LAYERS,
+                SHORT_SOUND_CHANNELS,
+            )
+        # Every backend call goes through audio thread, so UI never waits for disk.
+        # Attributes below are used only on that thread.
+        self._audio = AudioWorker()
+        # Sounds and volumes of playing ambient layers
+        self._ambient_layers: list[tuple[Sound, int]] = []
+        self._preloaded: dict[Path, object] = {}
+        self.normalize_loudness: bool = DEFAULT_NORMALIZE_LOUDNESS
+        self.crossfade_ambient: bool = DEFAULT_CROSSFADE_AMBIENT
         # Dicts containing all songs found at start up
-        self._shorts_dict = create_sounds_dict(SHORTS_PATH)
-        self._longs_dict = create_sounds_dict(LONGS_PATH)
+        with profiler.phase("sound_manager.scan"):
+            self._store = SoundStore(SOUNDS_PATH)
+            # Files put in shorts and longs folders are moved to the store
+            self._store.adopt(SHORTS_PATH, "short")
+            self._store.adopt(LONGS_PATH, "long")
+            self._shorts_dict, self._longs_dict = create_sounds_dicts(self._store)
 
         # Never change them, those maps are used to check existence or list - GET ONLY
         self._all_sounds_dict = ChainMap(self._shorts_dict, self._longs_dict)
 
+        self._listeners: list[Callable[[SoundChange], None]] = []
+
+        # Index used by type-ahead search, kept up to date with change events
+        self._index = SoundIndex()
+        for name in self._shorts_dict:
+            self._index.add(name, "short")
+        for name in self._longs_dict:
+            self._index.add(name, "long")
+        self.subscribe(self._update_index)
+
+        self._analyser = SoundAnalyser(LIBRARY_FILE_PATH)
+        if is_analysis_available():
+            with profiler.phase("sound_manager.analysis_pool"):
+                self._analyser.start()
+
+    def _update_index(self, change: SoundChange) -> None:
+        match change.change_type:
+            case "added":
+                self._index.add(change.name, change.length_type)
+            case "renamed":
+                self._index.rename(cast("str", change.old_name), change.name)
+            case "removed":
+                self._index.remove(change.name)
+
+    def search_sounds(
+        self,
+        query: str,
+        length_type: LengthTypeLit | None = None,
+        limit: int = SEARCH_RESULTS_LIMIT,
+    ) -> list[str]:
+        """Return names of sounds best matching query."""
+        return self._index.search(query, length_type, limit)
+
+    async def analyse_sounds(self, names: Iterable[str] | None = None) -> None:
+        """Attach analysis to sounds, the ones not cached are analysed
+        in a process pool. Without numpy sounds are not analysed.
+        """
+        if not is_analysis_available():
+            return
+        if names is None:
+            names = list(self._all_sounds_dict)
+        sounds = {sound.path: sound for sound in map(self.get_any_sound, names)}
+        async for path, analysis in self._analyser.analyse(sounds):
+            sounds[path].set_analysis(analysis)
+
+    async def build_ambient_loops(self, names: Iterable[str] | None = None) -> None:
+        """Build crossfaded loops of ambients that have no fresh loop yet."""
+        if not is_analysis_available():
+            return
+        if names is None:
+            names = list(self._longs_dict)
+        paths = [self._longs_dict[name].path for name in names]
+        await asyncio.gather(*(
+            self._analyser.run(build_loop, path)
+            for path in paths
+            if not is_loop_fresh(path)
+        ))
+
+    def shutdown_analysis(self) -> None:
+        self._analyser.shutdown()
+
+    def subscribe(self, listener: Callable[[SoundChange], None]) -> None:
+        """Call listener on every added, renamed or removed sound."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[SoundChange], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, change: SoundChange) -> None:
+        for listener in self._listeners:
+            listener(change)
+
     @property
     def user_shorts_list(self) -> list[str]:
         return sorted(
@@ -273,80 +502,228 @@ class SoundManager:
         return bool(self._all_sounds_dict.get(name, False))
 
     def rename_sound(self, old_name: str, new_name: str) -> None:
-        """Rename sound on users drive and remove old sound from
-        corresponding dict and create new instance of Sound class.
+        """Rename sound in the store index and create new instance of Sound
+        class, file of the sound stays where it is.
         """
-        # Rename on drive
         sound: Sound = self.get_any_sound(old_name)
-        old_file_path = sound.path
-        new_file_path = sound.parent / (new_name + sound.extension)
-        old_file_path.rename(new_file_path)
+        self._store.rename(old_name, new_name)
 
-        # Update dict
+        # Update dict, content is the same so analysis is kept
+        new_sound = Sound(sound.path, new_name, sound.sound_type)
+        new_sound.set_analysis(sound.analysis)
         if sound.sound_type == "short":
             del self._shorts_dict[sound.name]
-            self._shorts_dict[new_name] = Sound(new_file_path)
+            self._shorts_dict[new_name] = new_sound
         else:
             del self._longs_dict[sound.name]
-            self._longs_dict[new_name] = Sound(new_file_path)
+            self._longs_dict[new_name] = new_sound
+
+        self._emit(SoundChange("renamed", new_name, sound.sound_type, old_name))
 
     def add_sound(
         self,
         path: Path,
         name: str,
-        extension: str,
         length_type: LengthTypeLit,
-    ) -> None:
-        """Add sound to right folder, create instance of Sound and to dict."""
-        if length_type == "short":
-            new_path = SHORTS_PATH
-            dict_ = self._shorts_dict
-        else:
-            new_path = LONGS_PATH
-            dict_ = self._longs_dict
+    ) -> list[str]:
+        """Add sound to the store, create instance of Sound and add it to dict.
+
+        Return names of sounds with the same content, file is stored once.
+        """
+        dict_ = self._shorts_dict if length_type == "short" else self._longs_dict
+        with metrics.timer("sound.import_ms"):
+            self._store.add(path, name, length_type)
+        dict_[name] = Sound(self._store.path_of(name), name, length_type)
+        self._emit(SoundChange("added", name, length_type))
+        return self._store.names_of(name)
 
-        sound = Sound(new_path / (name + extension))
+    def import_sounds(self, folder: Path, length_type: LengthTypeLit) -> ImportSummary:
+        """Import sounds of the folder tree to the store, it can run in a thread.
 
-        dict_[name] = sound
-        shutil.copy(path, sound.path)
+        Imported sounds are listed after `add_imported` is called with the summary.
+        """
+        with metrics.timer("sound.import_folder_ms"):
+            return self._store.import_files(walk_sounds(folder), length_type)
+
+    def add_imported(self, summary: ImportSummary, length_type: LengthTypeLit) -> None:
+        """Create instances of Sound for imported sounds and add them to dict."""
+        dict_ = self._shorts_dict if length_type == "short" else self._longs_dict
+        for name in summary.imported:
+            dict_[name] = Sound(self._store.path_of(name), name, length_type)
+            self._emit(SoundChange("added", name, length_type))
 
     def remove_sound(self, name: str, length_type: LengthTypeLit) -> None:
-        """Remove sound from users drive and update config if needed."""
-        self._all_sounds_dict[name].path.unlink()
+        """Remove sound from the store and its file with the last name of it."""
+        self._store.remove(name)
         if length_type == "short":
             del self._shorts_dict[name]
         else:
             del self._longs_dict[name]
+        self._emit(SoundChange("removed", name, length_type))
 
     def play_sound(
             self,
             sound_name: str,
             sound_volume: int,
+            sound_type: SoundTypeLit = "test",
     ) -> None:
-        """Play chosen sound."""
-        self._sound_channel.set_volume(sound_volume / 100)
-        sound = pygame.mixer.Sound(self.get_any_sound(sound_name).path)
-        self._sound_channel.play(sound)
-
-    def play_ambient_in_background(self, ambient_name: str) -> None:
-        """Play ambient in background with set volume to 0."""
-        self._ambient_channel.set_volume(0)
-        sound_path = self.get_any_sound(ambient_name).path
-        sound = pygame.mixer.Sound(sound_path)
-        self._ambient_channel.play(sound, loops=-1)
+        """Play chosen sound, unless more important sounds take all channels."""
+        sound = self.get_any_sound(sound_name)
+        volume = self._volume(sound, sound_volume)
+        self._audio.submit(
+            "play_sound",
+            lambda: self._play_sound(sound.path, volume, sound_type),
+        )
+
+    def _play_sound(self, path: Path, volume: float, sound_type: SoundTypeLit) -> None:
+        channel = self._channels.short_channel(sound_type)
+        if channel is None:
+            return
+        self._backend.set_volume(channel, volume)
+        sound = self._preloaded.pop(path, None)
+        if sound is None:
+            with metrics.timer("sound.decode_ms"):
+                sound = self._backend.load(path)
+        with metrics.timer("sound.play_ms"):
+            self._backend.play(channel, sound)
+
+    def preload_sound(self, sound_name: str) -> None:
+        """Decode sound in advance, so next play of it starts immediately."""
+        path = self.get_any_sound(sound_name).path
+        self._audio.submit("preload_sound", lambda: self._preload_sound(path))
+
+    def _preload_sound(self, path: Path) -> None:
+        with metrics.timer("sound.decode_ms"):
+            self._preloaded[path] = self._backend.load(path)
+
+    def unload_sound(self, sound_name: str) -> None:
+        """Drop decoded sound that was not played."""
+        path = self.get_any_sound(sound_name).path
+        self._audio.submit("unload_sound", lambda: self._preloaded.pop(path, None))
+
+    def preload_ambient(self, sound_name: str) -> None:
+        """Decode ambient or its loop in advance, so layer starts immediately."""
+        sound = self.get_any_sound(sound_name)
+        self._audio.submit(
+            "preload_ambient",
+            lambda: self._preload_sound(self._ambient_path(sound)),
+        )
+
+    def clear_preloaded(self) -> None:
+        """Drop every decoded sound that was not played."""
+        self._audio.submit("clear_preloaded", self._preloaded.clear)
+
+    def _volume(self, sound: Sound | None, volume: int) -> float:
+        """Return channel volume, with gain of the sound if normalized.
+
+        Channel volume can't be above 1, so quiet sound is boosted
+        only as much as user volume leaves room for it.
+        """
+        if not self.normalize_loudness or sound is None:
+            return volume / 100
+        return min(1.0, volume / 100 * sound.gain)
+
+    def play_ambient_in_background(self, layers: list[tuple[str, int]]) -> None:
+        """Play every ambient layer on its own channel with set volume to 0.
+
+        Layers are names and volumes, mixer mixes them together.
+        """
+        ambients = [(self.get_any_sound(name), volume) for name, volume in layers]
+        self._audio.submit(
+            "play_ambient",
+            lambda: self._play_ambient_in_background(ambients),
+        )
+
+    def _play_ambient_in_background(self, layers: list[tuple[Sound, int]]) -> None:
+        self._stop_ambient()
+        for channel, (ambient, volume) in zip(
+            self._channels.layers, layers, strict=False,
+        ):
+            sound_path = self._ambient_path(ambient)
+            self._backend.set_volume(channel, 0)
+            sound = self._preloaded.pop(sound_path, None)
+            if sound is None:
+                with metrics.timer("ambient.decode_ms"):
+                    sound = self._backend.load(sound_path)
+            with metrics.timer("ambient.play_ms"):
+                self._backend.play(channel, sound, loops=-1)
+            self._ambient_layers.append((ambient, volume))
+
+    def _ambient_path(self, ambient: Sound) -> Path:
+        """Return path of crossfaded loop if it is used and fresh."""
+        if self.crossfade_ambient and is_loop_fresh(ambient.path):
+            return loop_path(ambient.path)
+        return ambient.path
 
     def stop_ambient(self) -> None:
         """Stop playing ambient in the background."""
-        self._ambient_channel.stop()
+        self._audio.submit("stop_ambient", self._stop_ambient)
+
+    def _stop_ambient(self) -> None:
+        self._channels.stop_layers()
+        self._ambient_layers.clear()
 
-    def toggle_ambient(self, quite: bool, ambient_volume: int) -> None:
+    def toggle_ambient(self, quite: bool) -> None:
         """Turn on and off ambient."""
-        volume = 0 if quite else ambient_volume / 100
-        self._ambient_channel.set_volume(volume)
+        self._audio.submit("toggle_ambient", lambda: self._toggle_ambient(quite))
+
+    def _toggle_ambient(self, quite: bool) -> None:
+        for channel, (ambient, volume) in zip(
+            self._channels.layers, self._ambient_layers, strict=False,
+        ):
+            volume_level = 0 if quite else self._volume(ambient, volume)
+            self._backend.set_volume(channel, volume_level)
 
     def stop_sound(self) -> None:
         """Stop playing sound."""
-        self._sound_channel.stop()
+        self._audio.submit("stop_sound", self._channels.stop_shorts)
+
+    def set_audio_done_handler(
+        self,
+        handler: Callable[[AudioCommand, BaseException | None], None] | None,
+    ) -> None:
+        """Set handler called on audio thread after every audio command."""
+        self._audio.on_done = handler
+
+    def wait_audio(self) -> None:
+        """Block until all queued audio commands are done."""
+        self._audio.wait()
+
+    def shutdown_audio(self) -> None:
+        self._audio.stop()
+        self._backend.close()
+
+
+def validate_volume_level(value: int) -> int:
+    """Return volume, or default volume when it is out of range."""
+    if value < MIN_VOLUME_LEVEL or value > MAX_VOLUME_LEVEL:
+        return DEFAULT_SOUND_VOLUME
+    return value
+
+
+def validate_sound_name(string: str) -> str:
+    """Raise ValueError if name has characters not allowed in sound names."""
+    for char in string:
+        if not (char.isalpha() or char.isdigit() or char in {"_", "-", "'"}):
+            msg = ("Only letters, numbers, underscore, "
+                   "dash or apostrophe are allowed in sound name")
+            raise ValueError(msg)
+    return string
+
+
+class AmbientLayerModel(BaseModel):
+    """Ambient played together with the main one."""
+
+    name: str
+    volume: int = DEFAULT_SOUND_VOLUME
+
+    @field_validator("volume")
+    def validate_volume(cls, value: int) -> int:
+        return validate_volume_level(value)
+
+    @field_validator("name")
+    def validate_name(cls, string: str) -> str:
+        return validate_sound_name(string)
 
 
 class ConfigModel(BaseModel):
@@ -365,6 +742,14 @@ class ConfigModel(BaseModel):
     input_mode_type: InputModeTypeLit = DEFAULT_TIME_INPUT_TYPE
     clock_display_hours: bool = DEFAULT_CLOCK_DISPLAY_HOURS
     clock_display_seconds: bool = DEFAULT_CLOCK_DISPLAY_SECONDS
+    normalize_loudness: bool = DEFAULT_NORMALIZE_LOUDNESS
+    crossfade_ambient: bool = DEFAULT_CROSSFADE_AMBIENT
+    ambient_layers: list[AmbientLayerModel] = []
+    theme: str = DEFAULT_THEME
+    alarm_leader_only: bool = DEFAULT_ALARM_LEADER_ONLY
+    archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS
+    signal_every: int = DEFAULT_SIGNAL_EVERY
+    signal_halfway: bool = DEFAULT_SIGNAL_HALFWAY
 
     @field_validator("session_length")
     def session_length_validator(cls, value: str):
@@ -374,18 +759,18 @@ class ConfigModel(BaseModel):
 
     @field_validator("test_volume", "alarm_volume", "signal_volume", "ambient_volume")
     def validate_volume(cls, value: int) -> int:
-        if value < MIN_VOLUME_LEVEL or value > MAX_VOLUME_LEVEL:
-            return DEFAULT_SOUND_VOLUME
-        return value
+        return validate_volume_level(value)
 
     @field_validator("alarm_name", "signal_name", "ambient_name")
     def validate_name(cls, string: str) -> str:
-        for char in string:
-            if not (char.isalpha() or char.isdigit() or char in {"_", "-", "'"}):
-                msg = ("Only letters, numbers, underscore, "
-                       "dash or apostrophe are allowed in sound name")
-                raise ValueError(msg)
-        return string
+        return validate_sound_name(string)
+
+    @field_validator("ambient_layers")
+    def validate_ambient_layers(
+        cls,
+        layers: list[AmbientLayerModel],
+    ) -> list[AmbientLayerModel]:
+        return layers[:MAX_AMBIENT_LAYERS - 1]
 
 
 class ConfigManager:
@@ -400,6 +785,17 @@ class ConfigManager:
     def __init__(self) -> None:
         with Path(CONFIG_FILE_PATH).open() as file:
             self.config = ConfigModel.model_validate(json.load(file))
+        # Config as last read or written, changes since are this instance's
+        self._saved: dict = self.config.model_dump()
+        self._listeners: list[Callable[[], None]] = []
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Call listener after every save, merge can bring changes of others."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def get_sound_name(self, sound_type: SoundTypeLit):
         """Get from config.json name of chosen sound_type."""
@@ -427,7 +823,8 @@ class ConfigManager:
         alarm = self.config.alarm_name == sound_name
         signal = self.config.signal_name == sound_name
         ambient = self.config.ambient_name == sound_name
-        return alarm or signal or ambient
+        layer = any(layer.name == sound_name for layer in self.config.ambient_layers)
+        return alarm or signal or ambient or layer
 
     def update_sound_name(self, old_name: str, new_name: str | None = None) -> None:
         """Update name to new if old in config."""
@@ -440,6 +837,16 @@ class ConfigManager:
         if self.config.ambient_name == old_name:
             self.config.ambient_name = new_name or DEFAULT_AMBIENT_NAME
 
+        # Layer of removed sound is removed
+        layers = []
+        for layer in self.config.ambient_layers:
+            if layer.name == old_name:
+                if new_name is None:
+                    continue
+                layer.name = new_name
+            layers.append(layer)
+        self.config.ambient_layers = layers
+
         self._save_config()
 
     def change_volume_value(self, volume_type: VolumeTypeLit, value: int) -> None:
@@ -463,6 +870,36 @@ class ConfigManager:
 
         self._save_config()
 
+    def get_ambient_layers(self) -> list[tuple[str, int]]:
+        """Return names and volumes of main ambient and its layers."""
+        return [
+            (self.config.ambient_name, self.config.ambient_volume),
+            *((layer.name, layer.volume) for layer in self.config.ambient_layers),
+        ]
+
+    def add_ambient_layer(self, name: str) -> AmbientLayerModel:
+        layer = AmbientLayerModel(name=name)
+        self.config.ambient_layers.append(layer)
+        self._save_config()
+        return layer
+
+    def update_ambient_layer(
+        self,
+        index: int,
+        name: str | None = None,
+        volume: int | None = None,
+    ) -> None:
+        layer = self.config.ambient_layers[index]
+        if name is not None:
+            layer.name = name
+        if volume is not None:
+            layer.volume = volume
+        self._save_config()
+
+    def remove_ambient_layer(self, index: int) -> None:
+        del self.config.ambient_layers[index]
+        self._save_config()
+
     def get_session_length(self) -> str:
         return self.config.session_length
 
@@ -471,8 +908,25 @@ class ConfigManager:
         self._save_config()
 
     def _save_config(self) -> None:
-        with Path(CONFIG_FILE_PATH).open("w") as file:
-            json.dump(self.config.model_dump(), file, sort_keys=False)
+        """Merge changes with ones saved by other instances and write config."""
+        with metrics.timer("config.save_ms"), file_lock(CONFIG_FILE_PATH):
+            mine = self.config.model_dump()
+            try:
+                with Path(CONFIG_FILE_PATH).open() as file:
+                    theirs = ConfigModel.model_validate(json.load(file)).model_dump()
+            except (OSError, ValueError):
+                theirs = mine
+            self.config = ConfigModel.model_validate(
+                merge_changes(self._saved, mine, theirs),
+            )
+            self._saved = self.config.model_dump()
+
+            tmp_path = CONFIG_FILE_PATH.with_suffix(".tmp")
+            with tmp_path.open("w") as file:
+                json.dump(self._saved, file, sort_keys=False)
+            tmp_path.replace(CONFIG_FILE_PATH)
+        for listener in self._listeners:
+            listener()
 
     def get_time_input_mode(self) -> InputModeTypeLit:
         return self.config.input_mode_type
@@ -495,6 +949,51 @@ class ConfigManager:
         self.config.clock_display_seconds = not self.config.clock_display_seconds
         self._save_config()
 
+    def get_normalize_loudness(self) -> bool:
+        return self.config.normalize_loudness
+
+    def set_normalize_loudness(self, value: bool) -> None:
+        self.config.normalize_loudness = value
+        self._save_config()
+
+    def get_crossfade_ambient(self) -> bool:
+        return self.config.crossfade_ambient
+
+    def set_crossfade_ambient(self, value: bool) -> None:
+        self.config.crossfade_ambient = value
+        self._save_config()
+
+    def get_alarm_leader_only(self) -> bool:
+        return self.config.alarm_leader_only
+
+    def set_alarm_leader_only(self, value: bool) -> None:
+        self.config.alarm_leader_only = value
+        self._save_config()
+
+    def get_archive_after_days(self) -> int:
+        return max(0, self.config.archive_after_days)
+
+    def get_signal_every(self) -> int:
+        return max(0, self.config.signal_every)
+
+    def update_signal_every(self, minutes: int) -> None:
+        self.config.signal_every = minutes
+        self._save_config()
+
+    def get_signal_halfway(self) -> bool:
+        return self.config.signal_halfway
+
+    def set_signal_halfway(self, value: bool) -> None:
+        self.config.signal_halfway = value
+        self._save_config()
+
+    def get_theme(self) -> str:
+        return self.config.theme
+
+    def update_theme(self, name: str) -> None:
+        self.config.theme = name
+        self._save_config()
+
 
 class DatabaseManager:
     _instance = None
@@ -506,28 +1005,46 @@ class DatabaseManager:
 
     def __init__(self) -> None:
         self.db_file = DB_FILE_PATH
+        self.history = SessionHistory(DB_FILE_PATH, ARCHIVE_PATH)
+        self.stats = StatsEngine(self.history)
 
     def db_setup(self) -> None:
         """Use only to set up DB on app initialization."""
-        with connect(self.db_file) as con:
-            # Setup Session table
-            con.cursor().execute("""
-                CREATE TABLE study_sessions(
-                    id INTEGER PRIMARY KEY,
-                    length INTEGER,
-                    date DATE,
-                    done BIT
-                )
-            """)
-            con.commit()
+        self.history.setup()
 
-    # def create_session_entry(self, length: int, is_successful: int) -> None:
-    #     with connect(self.db_file) as con:
-    #         con.cursor().execute("""
-    #             INSERT INTO study_sessions(length, date, done)
-    #             VALUES (?, ?, ?)
-    #         """, (length, datetime.now(), is_successful),
-    #                              )
+    def create_session_entry(
+            self,
+            length: int,
+            is_successful: int,
+            date: datetime | None = None,
+    ) -> None:
+        date = datetime.now() if date is None else date
+        with metrics.timer("db.insert_ms"):
+            self.history.record(length, is_successful, date)
+        self.stats.record(date, length, is_successful)
+
+    @property
+    def store(self) -> SessionStore:
+        """Every session in columns, loaded on first use and kept up to date."""
+        return self.stats.store
+
+    def archive_sessions(self, days: int) -> int:
+        """Archive sessions started before the day `days` ago.
+
+        Return number of archived sessions.
+        """
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+        with metrics.timer("db.archive_ms"):
+            return self.history.archive_before(cutoff)
+
+    def get_sessions(
+            self,
+            start: datetime,
+            end: datetime,
+    ) -> list[tuple[int, int, int]]:
+        """Return start epoch, length and done of sessions in [start, end)."""
+        return list(self.history.sessions(start, end))
 
 
 class AboutSettings(Container):
@@ -553,6 +1070,29 @@ class AboutSettings(Container):
         webbrowser.open(SIMONS_X_ACCOUNT)
 
 
+class ThemeSettings(Container):
+    """Pick one of built-in and user themes."""
+
+    def __init__(self, cm: "ConfigManager") -> None:
+        super().__init__()
+        self._cm = cm
+
+    def compose(self) -> ComposeResult:
+        yield Select(
+            ((name, name) for name in sorted(self.app.available_themes)),
+            value=self.app.theme,
+            allow_blank=False,
+            id="theme-select",
+        )
+
+    @on(Select.Changed, "#theme-select")
+    def _theme_selected(self, event: Select.Changed) -> None:
+        """Swap CSS variables of the app, screens are not composed again."""
+        event.stop()
+        self._cm.update_theme(event.value)
+        self.app.theme = event.value
+
+
 def create_tooltip(volume_type: SoundTypeLit) -> str:
     """Return a tooltip string with volume_type interpolated."""
     return (
@@ -561,6 +1101,183 @@ def create_tooltip(volume_type: SoundTypeLit) -> str:
     )
 
 
+class SoundPicker(Vertical):
+    """Search-as-you-type picker of sounds.
+
+    Matches come from SoundManager index and only
+    top `SEARCH_RESULTS_LIMIT` of them are rendered.
+    """
+
+    class Changed(Message):
+        """Posted when user picks a sound."""
+
+        def __init__(self, picker: "SoundPicker", value: str) -> None:
+            super().__init__()
+            self.picker = picker
+            self.value = value
+
+        @property
+        def control(self) -> "SoundPicker":
+            return self.picker
+
+    def __init__(
+        self,
+        sm: "SoundManager",
+        *,
+        prompt: str,
+        length_type: LengthTypeLit | None = None,
+        id: str | None = None,
+    ) -> None:
+        super().__init__(id=id)
+        self._sm = sm
+        self._length_type = length_type
+        self._input = Input(placeholder=prompt)
+        self._results = OptionList()
+
+    @property
+    def prompt(self) -> str:
+        return self._input.placeholder
+
+    @prompt.setter
+    def prompt(self, prompt: str) -> None:
+        self._input.placeholder = prompt
+
+    def compose(self) -> ComposeResult:
+        yield self._input
+        yield self._results
+
+    def _show_results(self) -> None:
+        """Render best matches of typed query."""
+        names = self._sm.search_sounds(self._input.value, self._length_type)
+        self._results.set_options(names)
+        if names:
+            self._results.highlighted = 0
+        self.set_class(bool(names), "-expanded")
+
+    def _pick(self, name: str) -> None:
+        with self._input.prevent(Input.Changed):
+            self._input.value = ""
+        self.set_class(False, "-expanded")
+        self.post_message(self.Changed(self, name))
+
+    @on(Input.Changed)
+    def query_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        self._show_results()
+
+    @on(Input.Submitted)
+    def query_submitted(self, event: Input.Submitted) -> None:
+        """Pick highlighted match."""
+        event.stop()
+        index = self._results.highlighted
+        if self.has_class("-expanded") and index is not None:
+            self._pick(str(self._results.get_option_at_index(index).prompt))
+
+    @on(OptionList.OptionSelected)
+    def option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.stop()
+        self._pick(str(event.option.prompt))
+
+    def on_key(self, event: Key) -> None:
+        """Move between query and matches."""
+        expanded = self.has_class("-expanded")
+        if event.key == "down" and self._input.has_focus and expanded:
+            event.stop()
+            self._results.focus()
+        elif event.key == "escape" and expanded:
+            event.stop()
+            self.set_class(False, "-expanded")
+            self._input.focus()
+
+    @on(DescendantFocus)
+    def picker_focused(self) -> None:
+        if not self.has_class("-expanded"):
+            self._show_results()
+
+    @on(DescendantBlur)
+    def picker_blurred(self) -> None:
+        self.call_after_refresh(self._collapse_if_blurred)
+
+    def _collapse_if_blurred(self) -> None:
+        if not self.has_focus_within:
+            self.set_class(False, "-expanded")
+
+
+class AmbientLayers(Vertical):
+    """Extra ambients played together with the main one,
+    each of them with its own volume.
+    """
+
+    def __init__(
+        self,
+        cm: "ConfigManager",
+        sm: "SoundManager",
+        *args: tuple,
+        **kwargs: dict,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._cm = cm
+        self._sm = sm
+
+    def compose(self) -> ComposeResult:
+        for layer in self._cm.config.ambient_layers:
+            yield self._layer_row(layer)
+        yield Button(
+            "Add ambient layer",
+            id="add-layer-bt",
+            disabled=self._is_full(),
+        )
+
+    def _is_full(self) -> bool:
+        return len(self._cm.config.ambient_layers) >= MAX_AMBIENT_LAYERS - 1
+
+    def _layer_row(self, layer: AmbientLayerModel) -> Horizontal:
+        return Horizontal(
+            SoundPicker(self._sm, prompt=f"Layer: {layer.name}", length_type="long"),
+            VolumeInput(value=str(layer.volume), tooltip="Volume of the layer"),
+            Button("Remove", variant="error", classes="remove-layer-bt"),
+            classes="ambient-layer",
+        )
+
+    def _layer_index(self, widget: Widget) -> int:
+        return list(self.query(".ambient-layer")).index(widget.parent)
+
+    @on(SoundPicker.Changed)
+    def layer_sound_changed(self, event: SoundPicker.Changed) -> None:
+        event.stop()
+        self._cm.update_ambient_layer(self._layer_index(event.picker), name=event.value)
+        event.picker.prompt = f"Layer: {event.value}"
+
+    @on(VolumeInput.Changed)
+    def layer_volume_changed(self, event: VolumeInput.Changed) -> None:
+        event.stop()
+        if event.value == "":
+            return
+        if not MIN_VOLUME_LEVEL <= int(event.value) <= MAX_VOLUME_LEVEL:
+            return
+        self._cm.update_ambient_layer(
+            self._layer_index(event.input),
+            volume=int(event.value),
+        )
+
+    @on(Button.Pressed, ".remove-layer-bt")
+    async def remove_layer(self, event: Button.Pressed) -> None:
+        event.stop()
+        self._cm.remove_ambient_layer(self._layer_index(event.button))
+        await cast("Widget", event.button.parent).remove()
+        self.query_one("#add-layer-bt", Button).disabled = self._is_full()
+
+    @on(Button.Pressed, "#add-layer-bt")
+    async def add_layer(self, event: Button.Pressed) -> None:
+        """Add layer with first ambient that is not played yet."""
+        event.stop()
+        used = {name for name, _ in self._cm.get_ambient_layers()}
+        unused = (name for name in self._sm.all_longs_list if name not in used)
+        layer = self._cm.add_ambient_layer(next(unused, DEFAULT_AMBIENT_NAME))
+        await self.mount(self._layer_row(layer), before=event.button)
+        event.button.disabled = self._is_full()
+
+
 class SoundSettings(Grid):
     """SoundSettings allow user to change used sounds,
     test any sound and open EditSound modal.
@@ -574,11 +1291,22 @@ class SoundSettings(Grid):
         super().__init__()
         self._cm = cm
         self._sm = sm
+        self._pending_changes: list[SoundChange] = []
+
+    def on_mount(self) -> None:
+        self._sm.subscribe(self._pending_changes.append)
+
+    def on_unmount(self) -> None:
+        self._sm.unsubscribe(self._pending_changes.append)
+
+    def _sound_prompt(self, sound_type: SoundTypeLit) -> str:
+        return f"{sound_type.capitalize()}: {self._cm.get_sound_name(sound_type)}"
 
     def compose(self) -> ComposeResult:
-        yield Select.from_values(
-            self._sm.all_shorts_list,
-            prompt=f"Alarm:{self._cm.get_sound_name("alarm")}",
+        yield SoundPicker(
+            self._sm,
+            prompt=self._sound_prompt("alarm"),
+            length_type="short",
             id="alarm",
         )
         yield VolumeInput(
@@ -587,9 +1315,10 @@ class SoundSettings(Grid):
             id="alarm_volume",
         )
         yield Button("Alarms\nSignals", id="short", classes="add-sound-bt")
-        yield Select.from_values(
-            self._sm.all_shorts_list,
-            prompt=f"Signal:{self._cm.get_sound_name("signal")}",
+        yield SoundPicker(
+            self._sm,
+            prompt=self._sound_prompt("signal"),
+            length_type="short",
             id="signal",
         )
         yield VolumeInput(
@@ -597,9 +1326,10 @@ class SoundSettings(Grid):
             tooltip=create_tooltip("signal"),
             id="signal_volume",
         )
-        yield Select.from_values(
-            self._sm.all_longs_list,
-            prompt=f"Ambient: {self._cm.get_sound_name("ambient")}",
+        yield SoundPicker(
+            self._sm,
+            prompt=self._sound_prompt("ambient"),
+            length_type="long",
             id="ambient",
         )
         yield VolumeInput(
@@ -608,9 +1338,10 @@ class SoundSettings(Grid):
             id="ambient_volume",
         )
         yield Button("Ambiences", id="long", classes="add-sound-bt")
-        yield Select.from_values(
-            self._sm.all_sounds_list,
-            prompt="Select to play sound",
+        yield AmbientLayers(cm=self._cm, sm=self._sm)
+        yield SoundPicker(
+            self._sm,
+            prompt="Type to play sound",
             id="test-sound",
         )
         yield VolumeInput(
@@ -623,21 +1354,51 @@ class SoundSettings(Grid):
             variant="warning",
             id="test-sound-bt",
         )
+        yield Checkbox(
+            "Normalize loudness",
+            value=self._cm.get_normalize_loudness(),
+            tooltip="Play every sound equally loud at the same volume",
+            id="normalize-loudness",
+        )
+        yield Checkbox(
+            "Crossfade ambient loops",
+            value=self._cm.get_crossfade_ambient(),
+            tooltip="Blend end of ambient into its start, so it loops without a seam",
+            id="crossfade-ambient",
+        )
+        yield Checkbox(
+            "Play alarm in one instance",
+            value=self._cm.get_alarm_leader_only(),
+            tooltip="Session started in many terminals at once rings only in the first",
+            id="alarm-leader-only",
+        )
+        every = self._cm.get_signal_every()
+        choices = sorted({*SIGNAL_EVERY_CHOICES, every} - {0})
+        yield Select(
+            [("No signal during session", 0)]
+            + [(f"Signal every {minutes} min", minutes) for minutes in choices],
+            value=every,
+            allow_blank=False,
+            id="signal-every",
+        )
+        yield Checkbox(
+            "Signal at halfway",
+            value=self._cm.get_signal_halfway(),
+            tooltip="Play signal when half of the timer is over",
+            id="signal-halfway",
+        )
 
-    @on(Select.Changed)
-    def select_changed(self, event: Select.Changed) -> None:
+    @on(SoundPicker.Changed)
+    def select_changed(self, event: SoundPicker.Changed) -> None:
         """Change sound connected to type and update config."""
-        # If button's id is 'test-sound' press blank or already chosen return
-        if event.select.id == "test-sound" or event.value == Select.BLANK:
+        # If picker's id is 'test-sound' return
+        if event.picker.id == "test-sound":
             return
 
-        self._cm.update_used_sound(
-            sound_type=cast(SoundTypeLit, event.select.id),
-            name=event.value,
-        )
+        sound_type = cast("SoundTypeLit", event.picker.id)
+        self._cm.update_used_sound(sound_type=sound_type, name=event.value)
         # Update song's name
-        sound_type = event.control.id.capitalize()
-        event.select.prompt = f"{sound_type}: {self._cm.config.alarm_name}"
+        event.picker.prompt = self._sound_prompt(sound_type)
 
     @on(Button.Pressed, ".add-sound-bt")
     def open_edit_sound_popup(self, event: Button.Pressed) -> None:
@@ -648,22 +1409,33 @@ class SoundSettings(Grid):
                 sm=self._sm,
                 cm=self._cm,
             ),
-            lambda x: self.recompose(),
+            self._apply_sound_changes,
         )
 
-    @on(Select.Changed, "#test-sound")
-    def test_sound(self, event: Select.Changed) -> None:
-        """Play sound selected from list."""
-        if event.value == Select.BLANK:
+    def _apply_sound_changes(self, arg_from_callback) -> None:
+        """Update prompts, renamed or removed sound could be used in config.
+
+        Pickers need no update because SoundManager index is already up to date.
+        """
+        if not self._pending_changes:
             return
+        self._pending_changes.clear()
+        for sound_type in ("alarm", "signal", "ambient"):
+            self.query_one(f"#{sound_type}", SoundPicker).prompt = self._sound_prompt(
+                sound_type,
+            )
+        # Layers of renamed or removed sounds are changed in config
+        self.query_one(AmbientLayers).refresh(recompose=True)
 
-        if event.value in self._sm.all_sounds_list:
+    @on(SoundPicker.Changed, "#test-sound")
+    def test_sound(self, event: SoundPicker.Changed) -> None:
+        """Play sound selected from list."""
+        if self._sm.is_duplicate(event.value):
             self._sm.play_sound(
                 sound_name=event.value,
                 sound_volume=self._cm.config.test_volume,
             )
-            event.select.prompt = f"Last: {event.value}"
-            event.select.clear()
+            event.picker.prompt = f"Last: {event.value}"
         else:
             msg = "Sound is not in expected folder"
             raise FileNotFoundError(msg)
@@ -673,6 +1445,27 @@ class SoundSettings(Grid):
         """Stop playing any sound."""
         self._sm.stop_sound()
 
+    @on(Checkbox.Changed, "#normalize-loudness")
+    def toggle_normalize_loudness(self, event: Checkbox.Changed) -> None:
+        self._cm.set_normalize_loudness(event.value)
+
+    @on(Checkbox.Changed, "#alarm-leader-only")
+    def toggle_alarm_leader_only(self, event: Checkbox.Changed) -> None:
+        self._cm.set_alarm_leader_only(event.value)
+
+    @on(Select.Changed, "#signal-every")
+    def signal_every_selected(self, event: Select.Changed) -> None:
+        self._cm.update_signal_every(event.value)
+
+    @on(Checkbox.Changed, "#signal-halfway")
+    def toggle_signal_halfway(self, event: Checkbox.Changed) -> None:
+        self._cm.set_signal_halfway(event.value)
+
+    @on(Checkbox.Changed, "#crossfade-ambient")
+    def toggle_crossfade_ambient(self, event: Checkbox.Changed) -> None:
+        # App builds loops when config turns crossfade on
+        self._cm.set_crossfade_ambient(event.value)
+
     @on(VolumeInput.Changed)
     def new_volume_submitted(self, event: VolumeInput.Submitted) -> None:
         if event.value == "":
@@ -733,12 +1526,13 @@ class ClockDisplay(Horizontal):
         yield self._ones_sec
 
     def update_time(self, minutes: str, seconds: str) -> None:
-        if self._cm.get_clock_display_hours():
-            self.update_hour_mode(minutes)
-        else:
-            self.update_minute_mode(minutes)
+        with metrics.timer("clock.update_ms"):
+            if self._cm.get_clock_display_hours():
+                self.update_hour_mode(minutes)
+            else:
+                self.update_minute_mode(minutes)
 
-        self._update_seconds(seconds)
+            self._update_seconds(seconds)
 
     def update_minute_mode(self, minutes: str):
         """Update clock number."""
@@ -799,13 +1593,6 @@ def get_users_folder() -> str:
     raise NotImplementedError(msg)
 
 
-def soundify(sound: str):
-    """Remove all characters that are not a letter, number, - or _."""
-    return "".join(
-        char if char.isalnum() or char in {"_", "-"} else "_" for char in sound
-    )
-
-
 class MusicDirectoryTree(DirectoryTree):
     show_root = False
 
@@ -813,38 +1600,10 @@ class MusicDirectoryTree(DirectoryTree):
         def not_hidden(path: Path) -> bool:
             return path.is_dir() and not path.name.startswith(".")
 
-        suffixes = {".wav", ".mp3", ".ogg", ".flac", ".opus", "/"}
+        suffixes = SOUND_SUFFIXES | {"/"}
         return [path for path in paths if not_hidden(path) or path.suffix in suffixes]
 
 
-class Accordion(Container):
-    """Accordion class is a container for Collapsibles
-    that turns them into Accordion.
-    """
-
-    def __init__(
-        self,
-        *children: Widget,
-        name: str | None = None,
-        id: str | None = None,
-        classes: str | None = None,
-        disabled: bool = False,
-    ) -> None:
-        super().__init__(
-            *children, name=name, id=id, classes=classes, disabled=disabled,
-        )
-        self._currently_expanded: Collapsible | None = None
-
-    @on(Collapsible.Expanded)
-    def collapse_other_expanded(self, event: Collapsible.Expanded) -> None:
-        """Close last when new clicked."""
-        if self._currently_expanded is event.collapsible:
-            self._currently_expanded.collapsed = False
-        elif self._currently_expanded is not None:
-            self._currently_expanded.collapsed = True
-        self._currently_expanded = event.collapsible
-
-
 class AddSoundPopup(ModalScreen):
     BINDINGS = [
         ("ctrl+q", "quit_app", "Quit App"),
@@ -878,7 +1637,15 @@ class AddSoundPopup(ModalScreen):
         self._sm = sm
 
     def compose(self) -> ComposeResult:
-        yield MusicDirectoryTree(get_users_folder())
+        with Vertical(id="add-sound-popup"):
+            yield MusicDirectoryTree(get_users_folder())
+            with Center(id="import-folder-wrapper"):
+                yield Button(
+                    "Import Folder",
+                    variant="primary",
+                    id="import-folder-bt",
+                    tooltip="Import sounds of highlighted folder and its subfolders",
+                )
 
     @on(MusicDirectoryTree.FileSelected)
     def file_selected(self, event: MusicDirectoryTree.FileSelected) -> None:
@@ -890,23 +1657,63 @@ class AddSoundPopup(ModalScreen):
             self.notify(message, severity="error")
             return
 
-        extension = f".{event.path.name.split('.')[1]}"
-        self._sm.add_sound(
-            event.path,
-            sound,
-            extension,
-            self.sound_type,
+        same_sounds = self._sm.add_sound(event.path, sound, self.sound_type)
+        if same_sounds:
+            self.notify(f"Imported: {sound}, same file as {same_sounds[0]}")
+        else:
+            self.notify(f"Imported: {sound}")
+
+    def _highlighted_folder(self) -> Path:
+        """Return highlighted folder, or folder of highlighted file."""
+        tree = self.query_one(MusicDirectoryTree)
+        node = tree.cursor_node
+        if node is None or node.data is None:
+            return Path(tree.path)
+        path = node.data.path
+        return path if path.is_dir() else path.parent
+
+    @on(Button.Pressed, "#import-folder-bt")
+    def import_folder(self, event: Button.Pressed) -> None:
+        """Import sounds of the folder in a thread, files are copied in parallel."""
+        folder = self._highlighted_folder()
+        event.button.disabled = True
+        self.notify(f"Importing: {folder.name}")
+        self.run_worker(
+            lambda: self._import_folder(folder),
+            thread=True,
+            group="import",
+            exit_on_error=False,
         )
-        self.notify(f"Imported: {sound}")
 
+    def _import_folder(self, folder: Path) -> None:
+        try:
+            summary = self._sm.import_sounds(folder, self.sound_type)
+        except Exception as error:
+            self.app.call_from_thread(self._folder_import_failed, folder, error)
+            raise
+        self.app.call_from_thread(self._folder_imported, summary)
 
-def remove_id_suffix(string: str) -> str:
-    """Remove _something from the end of the string."""
-    return string[:string.rindex("_")]
+    def _enable_import_folder(self) -> None:
+        # Popup could have been closed while folder was imported
+        if self.is_attached:
+            self.query_one("#import-folder-bt", Button).disabled = False
+
+    def _folder_imported(self, summary: ImportSummary) -> None:
+        self._sm.add_imported(summary, self.sound_type)
+        self._enable_import_folder()
+        self.app.notify(summary.describe())
+
+    def _folder_import_failed(self, folder: Path, error: Exception) -> None:
+        self._enable_import_folder()
+        self.app.notify(f"Could not import {folder.name}: {error}", severity="error")
 
 
 class EditSound(ModalScreen):
-    """EditSound allow user to perform CRUD operation on sounds."""
+    """EditSound allow user to perform CRUD operation on sounds.
+
+    Sounds are listed in an OptionList, that renders only visible rows,
+    and edited with a single panel shared by all of them.
+    """
 
     BINDINGS = [
         ("ctrl+q", "quit_app", "Quit App"),
@@ -928,8 +1735,25 @@ class EditSound(ModalScreen):
         self._cm = cm
         self._sm = sm
         self._sound_type = sound_type
-        self._sounds_names = self._sm.user_shorts_list \
-            if sound_type == "short" else self._sm.user_longs_list
+        self._sounds_names = self._get_user_sounds()
+        self._sounds_list = OptionList(*self._sounds_names, id="sounds-list")
+        self._name_input = Input(
+            id="sound-name-input",
+            restrict="^[a-zA-Z0-9_-]+$",
+            disabled=True,
+        )
+        self._rename_button = Button(
+            "Rename",
+            variant="success",
+            disabled=True,
+            id="sound-rename-bt",
+        )
+        self._remove_button = Button(
+            "Remove",
+            variant="error",
+            disabled=True,
+            id="sound-remove-bt",
+        )
 
     def action_close_popup(self) -> None:
         self.dismiss(True)
@@ -944,25 +1768,13 @@ class EditSound(ModalScreen):
             self.dismiss(True)
 
     def compose(self) -> ComposeResult:
-        with Accordion(id="sounds-accordion"):
-            for name in self._sounds_names:
-                with Collapsible(title=name, id=f"{name}_coll"):
-                    yield Input(value=name, id=f"{name}_input", restrict="^[a-zA-Z0-9_-]+$")
-                    with Horizontal(classes="sound-buttons-wrapper"):
-                        yield Button(
-                            "Rename",
-                            variant="success",
-                            disabled=True,
-                            id=f"{name}_rename",
-                            classes="sound-rename-bt",
-                        )
-                        yield Static(classes="sound-buttons-divider")
-                        yield Button(
-                            "Remove",
-                            variant="error",
-                            id=f"{name}_remove",
-                            classes="sound-remove-bt",
-                        )
+        with Vertical(id="edit-sound-wrapper"):
+            yield self._sounds_list
+            yield self._name_input
+            with Horizontal(classes="sound-buttons-wrapper"):
+                yield self._rename_button
+                yield Static(classes="sound-buttons-divider")
+                yield self._remove_button
 
             yield Static(id="add-sound-divider")
             with Center(id="add-sound-wrapper"):
@@ -972,40 +1784,69 @@ class EditSound(ModalScreen):
                     id="add-sound-bt",
                 )
 
-    @on(Input.Changed)
+    def _get_user_sounds(self) -> list[str]:
+        if self._sound_type == "short":
+            return self._sm.user_shorts_list
+        return self._sm.user_longs_list
+
+    def _selected_sound(self) -> str | None:
+        """Return name of highlighted sound."""
+        index = self._sounds_list.highlighted
+        if index is None or index >= len(self._sounds_names):
+            return None
+        return self._sounds_names[index]
+
+    def _show_selected_sound(self) -> None:
+        """Fill edit panel with highlighted sound."""
+        name = self._selected_sound()
+        self._name_input.disabled = name is None
+        self._remove_button.disabled = name is None
+        self._name_input.value = name or ""
+        self._rename_button.disabled = True
+
+    @on(OptionList.OptionHighlighted, "#sounds-list")
+    def sound_highlighted(self) -> None:
+        self._show_selected_sound()
+
+    @on(Input.Changed, "#sound-name-input")
     def check_sound_name(self, event: Input.Changed) -> None:
         """Check is new sound name correct."""
-        query = f"#{remove_id_suffix(event.input.id)}_rename"
         sound_name = event.input.value
         disable = not sound_name or self._sm.is_duplicate(sound_name)
-        self.query_one(query).disabled = disable
-
-    @on(Button.Pressed, ".sound-rename-bt")
-    async def change_sound_name(self, event: Button.Pressed) -> None:
-        """Change name of a sound and update DOM."""
-        # Change name
-        old_name = remove_id_suffix(event.button.id)
-        new_name = self.query_one(f"#{old_name}_input", Input).value
+        self._rename_button.disabled = disable
+
+    @on(Button.Pressed, "#sound-rename-bt")
+    def change_sound_name(self) -> None:
+        """Change name of a sound and update its row."""
+        index = self._sounds_list.highlighted
+        old_name = self._selected_sound()
+        if index is None or old_name is None:
+            return
+        new_name = self._name_input.value
         self._sm.rename_sound(old_name, new_name)
         # Update config if needed
         self._cm.update_sound_name(old_name, new_name)
 
-        # Update DOM
-        await self.recompose_(None)
+        # Update row
+        self._sounds_names[index] = new_name
+        self._sounds_list.replace_option_prompt_at_index(index, new_name)
+        self._rename_button.disabled = True
         if self._sound_type == "long":
             self.notify("Renamed ambient")
         else:
             self.notify("Renamed sound")
 
-        self.query_one(f"#{new_name}_coll", Collapsible).collapsed = False
-
-    @on(Button.Pressed, ".sound-remove-bt")
-    async def should_remove_sound(self, event: Button.Pressed) -> None:
+    @on(Button.Pressed, "#sound-remove-bt")
+    async def should_remove_sound(self) -> None:
         """Display confirmation screen if users accepts
         Sound is removed from drive.
         """
+        index = self._sounds_list.highlighted
+        sound_name = self._selected_sound()
+        if index is None or sound_name is None:
+            return
 
-        async def remove_sound(boolean: bool) -> None:
+        def remove_sound(boolean: bool) -> None:
             """Remove sound."""
             if not boolean:
                 return
@@ -1013,10 +1854,11 @@ class EditSound(ModalScreen):
             if self._cm.is_sound_in_config(sound_name):
                 self._cm.update_sound_name(sound_name)
             self._sm.remove_sound(sound_name, self._sound_type)
+            del self._sounds_names[index]
+            self._sounds_list.remove_option_at_index(index)
+            self._show_selected_sound()
             self.notify("Removed sound")
-            await self.recompose_(None)
 
-        sound_name = remove_id_suffix(event.button.id)
         message = "Are you sure you want to remove the sound?"
         await self.app.push_screen(ConfirmPopup(message=message), remove_sound)
 
@@ -1026,16 +1868,15 @@ class EditSound(ModalScreen):
         await self.app.push_screen(
             AddSoundPopup(
                 self._sound_type, sm=self._sm),
-            self.recompose_,
+            self.add_new_sounds,
         )
 
-    async def recompose_(self, arg_from_callback) -> None:
-        """Update list before recompose."""
-        if self._sound_type == "short":
-            self._sounds_names = self._sm.user_shorts_list
-        else:
-            self._sounds_names = self._sm.user_longs_list
-        await self.recompose()
+    def add_new_sounds(self, arg_from_callback) -> None:
+        """Append rows of sounds imported in AddSoundPopup."""
+        listed = set(self._sounds_names)
+        new_sounds = [name for name in self._get_user_sounds() if name not in listed]
+        self._sounds_names.extend(new_sounds)
+        self._sounds_list.add_options(new_sounds)
 
 
 class ConfirmPopup(ModalScreen[bool]):
@@ -1063,11 +1904,539 @@ class ConfirmPopup(ModalScreen[bool]):
         self.dismiss(True)
 
 
+class MetricsScreen(ModalScreen):
+    """Hidden debug screen that displays runtime metrics."""
+
+    BINDINGS = [
+        ("escape", "close_popup", "Close Popup"),
+        ("r", "refresh_metrics", "Refresh"),
+        ("ctrl+r", "reset_metrics", "Reset"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        yield DataTable(cursor_type="row", zebra_stripes=True)
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.add_columns("Metric", "Count", "Mean", "P50", "P95", "P99", "Max")
+        self.action_refresh_metrics()
+        self.set_interval(1, self.action_refresh_metrics)
+
+    def action_close_popup(self) -> None:
+        self.dismiss()
+
+    def action_refresh_metrics(self) -> None:
+        """Fill table with current state of metrics."""
+        table = self.query_one(DataTable)
+        table.clear()
+        for name, value in sorted(metrics.counters.items()):
+            table.add_row(name, str(value), "", "", "", "", "")
+        for name, histogram in sorted(metrics.histograms.items()):
+            table.add_row(
+                name,
+                str(histogram.count),
+                f"{histogram.mean:.3f}",
+                f"{histogram.percentile(50):.3f}",
+                f"{histogram.percentile(95):.3f}",
+                f"{histogram.percentile(99):.3f}",
+                f"{histogram.max:.3f}",
+            )
+
+    def action_reset_metrics(self) -> None:
+        metrics.reset()
+        self.action_refresh_metrics()
+
+
+class StatsScreen(ModalScreen):
+    """Totals of every range, streaks and best hours of the day."""
+
+    BINDINGS = [
+        ("escape", "close_popup", "Close Popup"),
+        ("r", "refresh_stats", "Refresh"),
+    ]
+
+    def __init__(self, stats: StatsEngine) -> None:
+        super().__init__()
+        self._stats = stats
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="stats"):
+            yield DataTable(cursor_type="row", zebra_stripes=True)
+            yield Static("", id="streaks")
+            yield Static("", id="best-hours")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.add_columns("Range", "Sessions", "Done", "Focused", "Completion")
+        table.loading = True
+        self._run_queries()
+
+    def action_close_popup(self) -> None:
+        self.dismiss()
+
+    def action_refresh_stats(self) -> None:
+        # Engine reloads sessions other instances have recorded
+        self._run_queries()
+
+    def _run_queries(self) -> None:
+        """Query engine in a thread, first query loads the whole history."""
+        self.run_worker(
+            self._query_stats,
+            thread=True,
+            group="stats",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _query_stats(self) -> None:
+        now = datetime.now()
+        totals = [
+            (stats_range, self._stats.totals(stats_range, now))
+            for stats_range in STATS_RANGES
+        ]
+        streaks = self._stats.streaks(now)
+        best_hours = self._stats.best_hours("month", now)
+        self.app.call_from_thread(self._show_stats, totals, streaks, best_hours)
+
+    def _show_stats(
+            self,
+            totals: list,
+            streaks: tuple[int, int],
+            best_hours: list[tuple[int, int]],
+    ) -> None:
+        table = self.query_one(DataTable)
+        table.clear()
+        for stats_range, range_totals in totals:
+            table.add_row(
+                stats_range.capitalize(),
+                str(range_totals.sessions),
+                str(range_totals.done),
+                f"{range_totals.done_minutes} min",
+                f"{range_totals.completion_rate:.0%}",
+            )
+        table.loading = False
+        current, longest = streaks
+        self.query_one("#streaks", Static).update(
+            f"Streak: {current} days, longest {longest} days",
+        )
+        hours = ", ".join(
+            f"{hour:02}:00 ({minutes} min)" for hour, minutes in best_hours
+        )
+        self.query_one("#best-hours", Static).update(
+            f"Best hours this month: {hours or '-'}",
+        )
+
+
+class SessionEngine:
+    """Focus session state and its timers.
+
+    Engine lives as long as the app, so a running session keeps
+    its timers when screens are switched. Screens subscribe to it
+    to be notified about every change.
+    """
+
+    def __init__(
+        self,
+        app: App,
+        cm: "ConfigManager",
+        db: "DatabaseManager",
+        sm: "SoundManager",
+    ) -> None:
+        self._app = app
+        self._cm = cm
+        self._db = db
+        self._sm = sm
+        self.active: bool = False
+        self.mode: SessionModeTypeLit | None = None
+        self.session_len: int = 0
+        self.remaining_session: int = 0
+        self.cancel_session_remaining: int = MINUTE
+        self.ambient_silent: bool = True
+        self.min_length: int = MIN_SESSION_LEN * MINUTE
+        self._intervals: list[Timer] = []
+        self._deadlines: list[asyncio.TimerHandle] = []
+        self._session_started: float = 0
+        self._ticks: int = 0
+        # Queue files are compiled once, session only walks the schedule
+        self.queues, self.queue_errors = load_queues(QUEUES_PATH, MINUTE)
+        self.schedule: Schedule | None = None
+        self.segment_index: int = 0
+        # Only the leader instance writes the journal and resumes from it
+        self.instance = InstanceLock(INSTANCE_LOCK_PATH)
+        self.instance.try_acquire()
+        self._journal = SessionJournal(JOURNAL_FILE_PATH)
+        self._journaled: bool = False
+        # Session that the leader runs too, e.g. started in every tmux pane at once
+        self._shared: bool = False
+        # Session of previous launch that was not finished
+        self.unfinished: UnfinishedSession | None = None
+        if self.instance.is_leader:
+            self.unfinished = read_unfinished(JOURNAL_FILE_PATH)
+        self._listeners: list[Callable[[SessionEventTypeLit], None]] = []
+        self.subscribe(self._publish_status)
+
+    def subscribe(self, listener: Callable[[SessionEventTypeLit], None]) -> None:
+        self._listeners.append(listener)
+
+    def _emit(self, event: SessionEventTypeLit) -> None:
+        for listener in self._listeners:
+            listener(event)
+
+    @property
+    def requires_kill(self) -> bool:
+        """Timer, queue and too short stopwatch can only be killed."""
+        return self.mode in ("timer", "queue") or self.session_len < self.min_length
+
+    @property
+    def segment(self) -> ScheduledSegment | None:
+        """Segment of the queue that is played now."""
+        if self.schedule is None:
+            return None
+        return self.schedule.segments[self.segment_index]
+
+    def display_time(self) -> tuple[str, str]:
+        """Return minutes and seconds to display on the clock."""
+        if self.mode in ("timer", "queue"):
+            minutes, seconds = divmod(self.remaining_session, 60)
+        else:
+            minutes, seconds = divmod(self.session_len, 60)
+        return str(minutes).zfill(1), str(seconds).zfill(2)
+
+    def start(self, session_length: str) -> None:
+        """Start a Timer or Stopwatch session."""
+        self.session_len = session_len_parser(session_length) * MINUTE
+        self.mode = "stopwatch" if self.session_len == 0 else "timer"
+        if self.mode == "timer":
+            self.remaining_session = self.session_len
+            self._start_clock(self._timer_tick)
+        else:
+            self._start_clock(self._stopwatch_tick)
+        self._start_sounds()
+        self._emit("started")
+
+    def start_queue(self, queue_name: str) -> None:
+        """Start a session that walks segments of the queue one by one."""
+        self.schedule = self.queues[queue_name]
+        self.segment_index = 0
+        self.mode = "queue"
+        self.session_len = self.schedule.length
+        self.remaining_session = self.session_len
+        self._start_clock(self._timer_tick)
+        self._start_sounds()
+        self._emit("started")
+
+    def can_resume(self, unfinished: UnfinishedSession) -> bool:
+        """Timer and queue can be resumed only before their deadline."""
+        if unfinished.mode == "stopwatch":
+            return True
+        if unfinished.mode == "queue":
+            schedule = self.queues.get(unfinished.queue)
+            if schedule is None or schedule.length != unfinished.length:
+                return False
+        return unfinished.remaining() > 0
+
+    def resume(self, unfinished: UnfinishedSession) -> None:
+        """Continue session of previous launch.
+
+        Timer and queue keep their deadline, stopwatch continues
+        from last checkpoint, time when app was closed is not counted.
+        """
+        self.unfinished = None
+        self.mode = unfinished.mode
+        if self.mode == "stopwatch":
+            self.session_len = unfinished.elapsed
+            self._start_clock(self._stopwatch_tick, elapsed=unfinished.elapsed)
+        else:
+            self.session_len = unfinished.length
+            self.remaining_session = unfinished.remaining()
+            elapsed = self.session_len - self.remaining_session
+            if self.mode == "queue":
+                self.schedule = self.queues[unfinished.queue]
+                self.segment_index = self.schedule.segment_at(elapsed)
+            self._start_clock(self._timer_tick, elapsed=elapsed)
+        self._start_sounds()
+        self._emit("started")
+        self._emit("tick")
+
+    def record_unfinished(self, unfinished: UnfinishedSession) -> None:
+        """Add session of previous launch to DB as killed."""
+        self.unfinished = None
+        focused_for = unfinished.elapsed // MINUTE
+        # DB keeps local time like every other entry
+        started = datetime.fromtimestamp(unfinished.started)  # noqa: DTZ006
+        self._db.create_session_entry(focused_for, 0, started)
+        self._journal.end("killed", unfinished.elapsed)
+
+    def _start_clock(self, tick: Callable[[], None], elapsed: int = 0) -> None:
+        """Start ticking, `elapsed` seconds of the session have already passed."""
+        self.active = True
+        self._session_started = time.monotonic() - elapsed
+        self._ticks = elapsed
+        self.cancel_session_remaining = max(0, MINUTE - elapsed)
+        update_clock = self._app.set_interval(1, tick)
+        cancel_session = self._app.set_interval(1, self._cancel_tick)
+        self._intervals.extend([update_clock, cancel_session])
+        if self.mode != "stopwatch":
+            # Alarm fires on the deadline, not on the tick that reaches it
+            self._call_at(self.session_len, self._deadline_reached)
+            if not self.instance.is_leader:
+                # Leader publishes its session as soon as it starts
+                self._call_at(elapsed + 1, self._detect_shared)
+        # Leader can change during session, so it is checked once at start
+        self._journaled = self.instance.is_leader
+        if self._journaled:
+            self._journal.start(
+                self.mode,
+                self.session_len,
+                queue=None if self.schedule is None else self.schedule.name,
+                started=time.time() - elapsed,
+            )
+
+    def _start_sounds(self) -> None:
+        """Play ambient and decode sounds that session will play."""
+        if self.segment is None:
+            self._sm.play_ambient_in_background(self._cm.get_ambient_layers())
+        else:
+            self._sm.play_ambient_in_background(self._segment_layers(self.segment))
+            self._prepare_next_segment()
+        self._sm.preload_sound(self._cm.config.alarm_name)
+        self._prepare_signal(int(time.monotonic() - self._session_started))
+
+    def _segment_layers(self, segment: ScheduledSegment) -> list[tuple[str, int]]:
+        """Return ambient layers of segment, break is silent by default."""
+        if segment.ambient is not None and self._sm.is_duplicate(segment.ambient):
+            return [(segment.ambient, self._cm.config.ambient_volume)]
+        if segment.kind == "focus":
+            return self._cm.get_ambient_layers()
+        return []
+
+    def _segment_signal(self, segment: ScheduledSegment) -> str | None:
+        """Return signal of segment, None if there is no sound to play."""
+        for name in (segment.signal, self._cm.config.signal_name):
+            if name is not None and self._sm.is_duplicate(name):
+                return name
+        return None
+
+    def _prepare_next_segment(self) -> None:
+        """Decode sounds of the next segment and switch to it on its deadline.
+
+        Deadline is counted from start of the session, so timer
+        delays don't add up and segments follow without gaps.
+        """
+        next_index = self.segment_index + 1
+        if next_index >= len(self.schedule):
+            return
+        segment = self.schedule.segments[next_index]
+        if (signal := self._segment_signal(segment)) is not None:
+            self._sm.preload_sound(signal)
+        for name, _ in self._segment_layers(segment):
+            self._sm.preload_ambient(name)
+
+        self._call_at(segment.start, self._next_segment)
+
+    def _next_segment(self) -> None:
+        """Signal start of the next segment and switch ambient to it."""
+        if metrics.enabled:
+            late = time.monotonic() - self._session_started - self.segment.end
+            metrics.observe("queue.transition_ms", abs(late) * 1000)
+        self.segment_index += 1
+        segment = self.segment
+        if (signal := self._segment_signal(segment)) is not None:
+            self._sm.play_sound(
+                sound_name=signal,
+                sound_volume=self._cm.config.signal_volume,
+                sound_type="signal",
+            )
+        self._sm.play_ambient_in_background(self._segment_layers(segment))
+        if not self.ambient_silent:
+            self._sm.toggle_ambient(quite=False)
+        self._prepare_next_segment()
+        self._emit("segment")
+
+    def _prepare_signal(self, after: int) -> None:
+        """Decode signal and play it on the next signal deadline.
+
+        Queue plays signals of its segments instead.
+        """
+        signal = self._cm.config.signal_name
+        if self.mode == "queue" or not self._sm.is_duplicate(signal):
+            return
+        offset = next_signal_at(
+            after,
+            self.session_len if self.mode == "timer" else 0,
+            self._cm.get_signal_every() * MINUTE,
+            halfway=self._cm.get_signal_halfway(),
+        )
+        if offset is None:
+            return
+        self._sm.preload_sound(signal)
+        self._call_at(offset, lambda: self._play_signal(offset))
+
+    def _call_at(self, offset: float, callback: Callable[[], None]) -> None:
+        """Call back `offset` seconds after start of the session.
+
+        Scheduled on the event loop itself, Textual timers deliver their
+        callback through the message queue, which adds milliseconds.
+        """
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._session_started + offset - time.monotonic())
+        self._deadlines.append(loop.call_at(loop.time() + delay, callback))
+
+    def _play_signal(self, offset: int) -> None:
+        if metrics.enabled:
+            late = time.monotonic() - self._session_started - offset
+            metrics.observe("signal.late_ms", abs(late) * 1000)
+        self._sm.play_sound(
+            sound_name=self._cm.config.signal_name,
+            sound_volume=self._cm.config.signal_volume,
+            sound_type="signal",
+        )
+        self._prepare_signal(offset)
+
+    def _detect_shared(self) -> None:
+        """Session is shared when the leader runs one that ends at the same time."""
+        status = read_status(STATUS_FILE_PATH)
+        end = self.session_len if self.segment is None else self.segment.end
+        deadline = time.time() - (time.monotonic() - self._session_started) + end
+        self._shared = (
+            status is not None
+            and status.pid != os.getpid()
+            and status.is_same_session(cast("str", self.mode), deadline)
+        )
+
+    def _deadline_reached(self) -> None:
+        if metrics.enabled:
+            late = time.monotonic() - self._session_started - self.session_len
+            metrics.observe("alarm.late_ms", abs(late) * 1000)
+        self.successful_session()
+
+    def _timer_tick(self) -> None:
+        """Count down, session ends on its deadline in `_deadline_reached`."""
+        self._observe_tick()
+        self.remaining_session = max(0, self.remaining_session - 1)
+        self._emit("tick")
+
+    def _stopwatch_tick(self) -> None:
+        self._observe_tick()
+        self.session_len += 1
+        self._emit("tick")
+
+    def _observe_tick(self) -> None:
+        """Measure how far from wall clock the tick was fired."""
+        self._ticks += 1
+        if self._journaled and self._ticks % MINUTE == 0:
+            self._journal.checkpoint(self._ticks)
+        if metrics.enabled:
+            late = time.monotonic() - self._session_started - self._ticks
+            metrics.observe("timer.tick_jitter_ms", abs(late) * 1000)
+
+    def _cancel_tick(self) -> None:
+        """Allow user to cancel session in first minute."""
+        self.cancel_session_remaining -= 1
+        self._emit("cancel_tick")
+
+    def successful_session(self) -> None:
+        """Play song, add successful session to DB and reset clock."""
+        # Played first, so DB write doesn't delay it, and before reset,
+        # which drops preloaded alarm. Shared session rings in the leader only.
+        if (
+            not self._shared
+            or self.instance.is_leader
+            or not self._cm.get_alarm_leader_only()
+        ):
+            self._sm.play_sound(
+                sound_name=self._cm.config.alarm_name,
+                sound_volume=self._cm.config.alarm_volume,
+                sound_type="alarm",
+            )
+        self._db.create_session_entry(self.session_len // MINUTE, 1)
+        self.reset("successful")
+
+    def not_successful_session(self, should_kill: bool) -> None:
+        """Add killed session to DB and reset clock."""
+        if not should_kill:
+            return
+
+        focused_for = (self.session_len - self.remaining_session) // MINUTE
+        self._db.create_session_entry(focused_for, 0)
+        self.reset("killed")
+
+    def reset(self, result: SessionResultTypeLit = "cancelled") -> None:
+        """Set all session properties to default."""
+        if self._journaled:
+            self._journal.end(result, self._ticks)
+            self._journaled = False
+        self.active = False
+        self._shared = False
+        self.mode = None
+        self.session_len = 0
+        self.remaining_session = 0
+        self.cancel_session_remaining = MINUTE
+        for interval in self._intervals:
+            interval.stop()
+        self._intervals.clear()
+        for deadline in self._deadlines:
+            deadline.cancel()
+        self._deadlines.clear()
+        self.schedule = None
+        self.segment_index = 0
+        self.ambient_silent = True
+        self._sm.stop_ambient()
+        self._sm.clear_preloaded()
+        self._emit("ended")
+
+    def _publish_status(self, event: SessionEventTypeLit) -> None:
+        """Write status for status bars when session changes.
+
+        Status file has one writer, the leader instance.
+        """
+        if event in ("tick", "cancel_tick") or not self.instance.is_leader:
+            return
+        status = SessionStatus(IDLE_MODE)
+        if self.active:
+            elapsed = time.monotonic() - self._session_started
+            started = int(time.time() - elapsed)
+            end = self.session_len if self.segment is None else self.segment.end
+            status = SessionStatus(
+                self.mode,
+                started,
+                0 if self.mode == "stopwatch" else started + end,
+                ambient=not self.ambient_silent,
+                label=None if self.segment is None else self.segment.label,
+            )
+        try:
+            write_status(STATUS_FILE_PATH, status)
+        except OSError as error:
+            # Status bars are extra, session goes on without them
+            self._app.log.warning("Could not write status", error=error)
+
+    def elect_leader(self) -> bool:
+        """Try to become the leader instance, return True if it is one."""
+        if self.instance.is_leader:
+            return True
+        if not self.instance.try_acquire():
+            return False
+        self._publish_status("started")
+        return True
+
+    def close(self) -> None:
+        """Close journal and let other instance become the leader."""
+        self._journal.close()
+        if self.instance.is_leader:
+            with contextlib.suppress(OSError):
+                write_status(STATUS_FILE_PATH, SessionStatus(IDLE_MODE))
+        self.instance.release()
+
+    def toggle_ambient(self, silent: bool) -> None:
+        self.ambient_silent = silent
+        self._sm.toggle_ambient(silent)
+        self._emit("ambient")
 
 
 class FocusScreen(Screen):
     app: "FocusTUI"
-    _ambient_silent = reactive(True, bindings=True)
     _input_mode = reactive("PLACEHOLDER", bindings=True)
 
     BINDINGS = [
@@ -1077,6 +2446,7 @@ class FocusScreen(Screen):
         ("ctrl+a", "stop_ambient", "Stop Ambient"),
         ("ctrl+e", "toggle_hours", "Toggle Hours"),
         ("ctrl+r", "toggle_seconds", "Toggle Seconds"),
+        ("ctrl+t", "open_stats", "Statistics"),
     ]
 
     def action_quit_app(self) -> None:
@@ -1086,19 +2456,14 @@ class FocusScreen(Screen):
         """Open settings screen."""
         self.app.open_settings()
 
+    def action_open_stats(self) -> None:
+        self.app.push_screen(StatsScreen(self.app.stats))
+
     def action_play_ambient(self):
-        self._ambient_silent = False
-        self._sm.toggle_ambient(
-            self._ambient_silent,
-            self._cm.config.ambient_volume,
-        )
+        self._session.toggle_ambient(silent=False)
 
     def action_stop_ambient(self):
-        self._ambient_silent = True
-        self._sm.toggle_ambient(
-            self._ambient_silent,
-            self._cm.config.ambient_volume,
-        )
+        self._session.toggle_ambient(silent=True)
 
     def action_toggle_hours(self):
         self._cm.toggle_clock_display_hours()
@@ -1106,36 +2471,32 @@ class FocusScreen(Screen):
     def action_toggle_seconds(self):
         self._cm.toggle_clock_display_seconds()
 
-    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:  # noqa: PLR0911
-        """If clock is active allow to toggle ambient and hide rest."""
-        not_allowed = "play_ambient", "stop_ambient", "toggle_hours", "toggle_seconds"
-        if self._active_session and action not in not_allowed:
-            return False
-
-        if action in ("play_ambient", "stop_ambient") and not self._active_session:
-            return False
-        if action == "play_ambient" and self._ambient_silent:
-            return True
-        if action == "stop_ambient" and not self._ambient_silent:
-            return True
-
-        if action in ("toggle_hours", "toggle_seconds") and not self._active_session:
-            return False
-        if action in ("toggle_hours", "toggle_seconds"):
-            return True
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        """If clock is active allow to toggle ambient and hide rest.
 
-        return not self._active_session
+        Settings and statistics stay available, session keeps running
+        in the engine while they are open.
+        """
+        active = self._session.active
+        match action:
+            case "open_settings" | "open_stats":
+                return True
+            case "play_ambient":
+                return active and self._session.ambient_silent
+            case "stop_ambient":
+                return active and not self._session.ambient_silent
+            case "toggle_hours" | "toggle_seconds":
+                return active
+        return not active
 
     def __init__(
         self,
         cm: "ConfigManager",
-        db: "DatabaseManager",
-        sm: "SoundManager",
+        session: "SessionEngine",
     ) -> None:
         super().__init__()
         self._cm = cm
-        self._db = db
-        self._sm = sm
+        self._session = session
         self._session_len_input = Input(
             value=cm.get_session_length(),
             id="session-duration",
@@ -1143,36 +2504,49 @@ class FocusScreen(Screen):
             restrict="[0-9:]*$",
             validators=[SessionInputValidator()],
         )
+        self._queue_select = Select(
+            ((name, name) for name in session.queues),
+            prompt="No queue",
+            id="queue-select",
+        )
+        self._queue_select.display = bool(session.queues)
+        self._segment_label = Label(id="segment-label")
         self._clock_display = ClockDisplay(cm=self._cm)
         self._focus_button = Button("Focus", variant="success")
-        self._active_session = False
-        self._session_len: int = session_len_parser(self._cm.get_session_length())
-        self._remaining_session: int = 0
-        self._cancel_session_remaining: int = MINUTE
-        self._intervals = []
-        self._mode: Literal["stopwatch", "timer"] | None = None
-        self._min_length: int = MIN_SESSION_LEN * MINUTE
         self._input_mode = self._cm.get_time_input_mode()
+        self._session.subscribe(self._session_changed)
 
     def compose(self):
+        profiler.start("focus_screen.compose")
         yield self._clock_display
         with Vertical():
+            yield self._segment_label
             yield self._session_len_input
+            yield self._queue_select
             yield self._focus_button
         yield Footer()
+        profiler.stop("focus_screen.compose")
+
+    def on_mount(self) -> None:
+        if profiler.enabled:
+            profiler.start("focus_screen.first_paint")
+            self.call_after_refresh(self.app.startup_profiled)
 
     @on(Button.Pressed)
     def _focus_button_clicked(self) -> None:
         """Start, Cancel, Kill session."""
         if self._focus_button.variant == "success":
-            self._start_session()
+            if self._queue_select.is_blank():
+                self._session.start(self._session_len_input.value)
+            else:
+                self._session.start_queue(self._queue_select.value)
         elif self._focus_button.variant == "warning":
-            self._reset_timer()
-        elif self._mode == "timer" or self._session_len < self._min_length:
+            self._session.reset()
+        elif self._session.requires_kill:
             popup = ConfirmPopup(message="Do you want to kill the session?")
-            self.app.push_screen(popup, self._not_successful_session)
+            self.app.push_screen(popup, self._session.not_successful_session)
         else:
-            self._successful_session()
+            self._session.successful_session()
 
     @on(Input.Changed)
     def _is_valid_session_length(self, event: Input.Changed) -> None:
@@ -1184,91 +2558,51 @@ class FocusScreen(Screen):
                 self._session_len_input.value,
             )
 
-    def _start_session(self) -> None:
-        """Start a Timer session."""
-        self._active_session = True
-        self._session_len_input.visible = False
-        self._session_len = session_len_parser(self._session_len_input.value) * MINUTE
-        self._mode = "stopwatch" if self._session_len == 0 else "timer"
-        if self._mode == "timer":
-            self._remaining_session = self._session_len
-            update_clock = self.set_interval(1, self._timer_display_update)
-        else:
-            update_clock = self.set_interval(1, self._stopwatch_display_update)
-
-        cancel_session = self.set_interval(1, self._cancel_session)
-        self._intervals.extend([update_clock, cancel_session])
-        self._focus_button.variant = "warning"
-        self._sm.play_ambient_in_background(
-            ambient_name=self._cm.config.ambient_name,
-        )
-        self.app.refresh_bindings()  # Deactivates Bindings
-
-    def _timer_display_update(self) -> None:
-        """Update variable used by timer, update displayed time and
-        call `TimerScreen._successful_session()` when self._remaining_session == 0.
-        """
-        self._remaining_session -= 1
-        if self._remaining_session == 0:
-            self._successful_session()
-        else:
-            minutes, seconds = divmod(self._remaining_session, 60)
-            minutes_str = str(minutes).zfill(1)
-            seconds_str = str(seconds).zfill(2)
-            self._clock_display.update_time(minutes_str, seconds_str)
-
-    def _stopwatch_display_update(self) -> None:
-        """Update variable used by timer and update displayed time."""
-        self._session_len += 1
-        minutes, seconds = divmod(self._session_len, 60)
-        minutes_str = str(minutes).zfill(1)
-        seconds_str = str(seconds).zfill(2)
-        self._clock_display.update_time(minutes_str, seconds_str)
-
-    def _successful_session(self) -> None:
-        """Play song, add successful session to DB and reset clock."""
-        # self._db.create_session_entry(self._session_len // 60, 1)  # noqa: ERA001
-        self._reset_timer()
-        self._sm.play_sound(
-            sound_name=self._cm.config.alarm_name,
-            sound_volume=self._cm.config.alarm_volume,
+    @on(Select.Changed, "#queue-select")
+    def _queue_selected(self) -> None:
+        """Queue sets length of session, so input is not needed."""
+        queue_selected = not self._queue_select.is_blank()
+        self._session_len_input.disabled = queue_selected
+        self._focus_button.disabled = not (
+            queue_selected or self._session_len_input.is_valid
         )
 
-    def _not_successful_session(self, should_kill: bool) -> None:
-        """Add killed session to DB and reset clock."""
-        if not should_kill:
-            return
-
-        focused_for = (self._session_len - self._remaining_session) // MINUTE  # noqa: F841
-        # self._db.create_session_entry(focused_for, 0)  # noqa: ERA001
-        self._reset_timer()
-
-    def _reset_timer(self) -> None:
-        """Set all clock properties to default."""
-        self._active_session = False
-        self._session_len_input.visible = True
-        self._session_len = self._cm.get_session_length()
-        self._cancel_session_remaining = MINUTE
-        for interval in self._intervals:
-            interval.stop()
-        self._intervals.clear()
-        self._clock_display.update_time("0", "00")
-        self._focus_button.variant = "success"
-        self._focus_button.label = "Focus"
-        self._ambient_silent = True
-        self._sm.stop_ambient()
-        self.app.refresh_bindings()
-
-    def _cancel_session(self) -> None:
-        """Allow user to cancel timer in first
-        `self._cancel_timer_counter_default` seconds.
-        """
-        self._cancel_session_remaining -= 1
-        if self._cancel_session_remaining > 0:
-            self._focus_button.label = f"Cancel ({self._cancel_session_remaining})"
-        elif self._mode == "timer" or (
-                self._mode == "stopwatch" and self._session_len < self._min_length
-        ):
+    def _session_changed(self, event: SessionEventTypeLit) -> None:
+        """Update widgets to match state of the session."""
+        match event:
+            case "tick":
+                self._clock_display.update_time(*self._session.display_time())
+            case "cancel_tick":
+                self._update_focus_button()
+            case "started":
+                self._session_len_input.visible = False
+                self._queue_select.visible = False
+                self._update_segment_label()
+                self._focus_button.variant = "warning"
+                self.app.refresh_bindings()  # Deactivates Bindings
+            case "segment":
+                self._update_segment_label()
+            case "ended":
+                self._session_len_input.visible = True
+                self._queue_select.visible = True
+                self._update_segment_label()
+                self._clock_display.update_time("0", "00")
+                self._focus_button.variant = "success"
+                self._focus_button.label = "Focus"
+                self.app.refresh_bindings()
+            case "ambient":
+                self.app.refresh_bindings()
+
+    def _update_segment_label(self) -> None:
+        segment = self._session.segment
+        self._segment_label.update("" if segment is None else segment.label)
+
+    def _update_focus_button(self) -> None:
+        """Allow user to cancel session in first minute then kill or end it."""
+        remaining = self._session.cancel_session_remaining
+        if remaining > 0:
+            self._focus_button.label = f"Cancel ({remaining})"
+        elif self._session.requires_kill:
             self._focus_button.label = "Kill"
             self._focus_button.variant = "error"
         else:
@@ -1328,7 +2662,7 @@ class SettingsScreen(Screen):
             with self.sound_settings_border:
                 yield SoundSettings(cm=self._cm, sm=self._sm)
             with self.theme_settings_border:
-                yield Button("PLACEHOLDER")
+                yield ThemeSettings(cm=self._cm)
             with self.theme_store_settings_border:
                 yield Button("PLACEHOLDER")
             with self.about:
@@ -1339,6 +2673,9 @@ class SettingsScreen(Screen):
 class FocusTUI(App, inherit_bindings=False):
     ENABLE_COMMAND_PALETTE = False
     CSS_PATH = "styles/style.tcss"
+    BINDINGS = [
+        Binding("f12", "open_metrics", "Metrics", show=False),
+    ]
 
     def __init__(
         self,
@@ -1346,34 +2683,202 @@ class FocusTUI(App, inherit_bindings=False):
         cm: "ConfigManager",
         sm: "SoundManager",
         *,
-        borders: bool = False
+        borders: bool = False,
+        analyse_sounds: bool = True,
     ) -> None:
         super().__init__()
         self._db = db
         self._cm = cm
         self._sm = sm
-
-        pygame.init()
+        self._analyse_sounds = analyse_sounds
+        self._added_sounds: list[SoundChange] = []
+        sm.normalize_loudness = cm.get_normalize_loudness()
+        sm.crossfade_ambient = cm.get_crossfade_ambient()
+        self.session = SessionEngine(self, cm=cm, db=db, sm=sm)
+
+        themes, self._theme_errors = load_themes(THEMES_PATH)
+        for theme in themes:
+            self.register_theme(theme)
+        if cm.get_theme() in self.available_themes:
+            self.theme = cm.get_theme()
+        # Rules parsed with variables of every used theme are cached,
+        # so startup and theme switch don't parse unchanged CSS again
+        self.stylesheet = CachedStylesheet(
+            variables=self.get_css_variables(),
+            cache=StylesheetCache(THEMES_PATH / CACHE_DIR_NAME),
+        )
 
         if borders:
-            path = os.path.join(
-                os.path.dirname(__file__),
-                "styles/borders.tcss"
-            )
-            with open(path) as f:
-                self.stylesheet.add_source("".join(f.readlines()))
+            self.stylesheet.read(Path(__file__).parent / "styles/borders.tcss")
+
+    def on_load(self) -> None:
+        if profiler.enabled:
+            # Textual parses CSS lazily, so parse it here to measure it
+            with profiler.phase("css"):
+                self.stylesheet.parse()
 
     def on_mount(self):
-        self.push_screen(FocusScreen(cm=self._cm, db=self._db, sm=self._sm))
+        for error in self._theme_errors:
+            self.notify(f"Invalid theme {error}", severity="error")
+        for error in self.session.queue_errors:
+            self.notify(f"Invalid queue {error}", severity="error")
+        # Screens are installed once and reused on every switch
+        self.install_screen(FocusScreen(cm=self._cm, session=self.session), "focus")
+        self.install_screen(SettingsScreen(cm=self._cm, sm=self._sm), "settings")
+        self.push_screen("focus")
         # self.push_screen(AddSoundPopup(callback=lambda x: self.exit()))
+        if self.session.unfinished is not None:
+            self._offer_resume(self.session.unfinished)
+        if not self.session.instance.is_leader:
+            self._election = self.set_interval(
+                LEADER_ELECTION_INTERVAL, self._elect_leader,
+            )
+        elif self._cm.get_archive_after_days():
+            # Only leader archives, so archives have one writer
+            self.run_worker(
+                self._archive_sessions,
+                thread=True,
+                group="archive",
+                exit_on_error=False,
+            )
+
+        self._sm.set_audio_done_handler(
+            lambda command, error: self.post_message(AudioCommandDone(command, error)),
+        )
+        self._cm.subscribe(self._apply_sound_options)
+
+        if self._analyse_sounds:
+            # Analyse library in background and every sound added later
+            self._sm.subscribe(self._analyse_added_sound)
+            self.run_worker(
+                self._sm.analyse_sounds(),
+                group="analysis",
+                exit_on_error=False,
+            )
+            if self._sm.crossfade_ambient:
+                self.run_worker(
+                    self._sm.build_ambient_loops(),
+                    group="loops",
+                    exit_on_error=False,
+                )
+
+    def on_unmount(self) -> None:
+        self.session.close()
+        self._db.history.close()
+        self._sm.unsubscribe(self._analyse_added_sound)
+        self._cm.unsubscribe(self._apply_sound_options)
+        self._sm.shutdown_analysis()
+        self._sm.set_audio_done_handler(None)
+        self._sm.shutdown_audio()
+        if metrics.enabled:
+            metrics.dump_json(METRICS_FILE_PATH)
+
+    def _apply_sound_options(self) -> None:
+        """Follow sound options of saved config, other instances could change them."""
+        self._sm.normalize_loudness = self._cm.get_normalize_loudness()
+        crossfade = self._cm.get_crossfade_ambient()
+        if crossfade and not self._sm.crossfade_ambient:
+            self.run_worker(
+                self._sm.build_ambient_loops(),
+                group="loops",
+                exit_on_error=False,
+            )
+        self._sm.crossfade_ambient = crossfade
+
+    def _archive_sessions(self) -> None:
+        self._db.archive_sessions(self._cm.get_archive_after_days())
+
+    def _elect_leader(self) -> None:
+        if self.session.elect_leader():
+            self._election.stop()
+
+    def _offer_resume(self, unfinished: UnfinishedSession) -> None:
+        """Ask to resume session that app was closed in or record it."""
+        if not self.session.can_resume(unfinished):
+            self.session.record_unfinished(unfinished)
+            self.notify("Unfinished session was recorded as killed")
+            return
+
+        def resume_answered(resume: bool) -> None:
+            if resume:
+                self.session.resume(unfinished)
+            else:
+                self.session.record_unfinished(unfinished)
+
+        minutes = unfinished.elapsed // MINUTE
+        popup = ConfirmPopup(
+            message=f"Resume unfinished session? ({minutes} min done)",
+        )
+        self.push_screen(popup, resume_answered)
+
+    def on_audio_command_done(self, message: AudioCommandDone) -> None:
+        if message.error is not None:
+            self.log.error(
+                "Audio command failed",
+                command=message.command.name,
+                error=message.error,
+            )
+            self.notify(
+                f"Could not {message.command.name.replace('_', ' ')}: {message.error}",
+                severity="error",
+            )
+
+    def _analyse_added_sound(self, change: SoundChange) -> None:
+        if change.change_type != "added":
+            return
+        # Folder import adds many sounds at once, they are analysed together
+        if not self._added_sounds:
+            self.call_later(self._analyse_added_sounds)
+        self._added_sounds.append(change)
+
+    def _analyse_added_sounds(self) -> None:
+        changes, self._added_sounds = self._added_sounds, []
+        # Sound could have been removed in the meantime
+        names = [
+            change.name for change in changes if self._sm.is_duplicate(change.name)
+        ]
+        self.run_worker(
+            self._sm.analyse_sounds(names),
+            group="analysis",
+            exit_on_error=False,
+        )
+        longs = [
+            change.name for change in changes
+            if change.length_type == "long" and change.name in names
+        ]
+        if longs and self._sm.crossfade_ambient:
+            self.run_worker(
+                self._sm.build_ambient_loops(longs),
+                group="loops",
+                exit_on_error=False,
+            )
+
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        """Metrics are available only in debug mode."""
+        if action == "open_metrics":
+            return metrics.enabled and not isinstance(self.screen, MetricsScreen)
+        return True
+
+    def action_open_metrics(self) -> None:
+        self.push_screen(MetricsScreen())
+
+    def startup_profiled(self) -> None:
+        """Close app after first paint when startup is profiled."""
+        profiler.stop("focus_screen.first_paint")
+        profiler.finish()
+        self.exit()
+
+    @property
+    def stats(self) -> StatsEngine:
+        return self._db.stats
 
     def open_settings(self):
         """Switch to settings screen."""
-        self.switch_screen(SettingsScreen(cm=self._cm, sm=self._sm))
+        self.switch_screen("settings")
 
     def open_focus(self):
         """Switch to focus screen."""
-        self.switch_screen(FocusScreen(cm=self._cm, db=self._db, sm=self._sm))
+        self.switch_screen("focus")
 
 
 class SoundFileManager:
@@ -1410,8 +2915,16 @@ def setup_app() -> None:
     db = DatabaseManager()
 
     _create_dir_if_not_exist(MAIN_DIR_PATH)
-    _create_dir_if_not_exist(THEMES_PATH)
-    _create_dir_if_not_exist(QUEUES_PATH)
+    if not THEMES_PATH.exists():
+        # Create themes folder with example theme
+        THEMES_PATH.mkdir()
+        with (THEMES_PATH / "forest.json").open("w") as file:
+            json.dump(EXAMPLE_THEME, file, indent=4)
+    if not QUEUES_PATH.exists():
+        # Create queues folder with example queue
+        QUEUES_PATH.mkdir()
+        with (QUEUES_PATH / "pomodoro.json").open("w") as file:
+            json.dump(EXAMPLE_QUEUE, file, indent=4)
     _create_dir_if_not_exist(SOUNDS_PATH)
     if not SHORTS_PATH.exists():
         # Create shorts folder
@@ -1425,12 +2938,12 @@ def setup_app() -> None:
         for sound in sfm.get_longs():
             shutil.copy(sound, LONGS_PATH)
 
-    # if not DB_FILE_PATH.exists():
-    # Create SQLite database file
-    # Path(DB_FILE_PATH).touch()  # noqa: ERA001
-    # This is the only place where
-    # this methods should be used
-    # db.db_setup()  # noqa: ERA001
+    if not DB_FILE_PATH.exists():
+        # Create SQLite database file
+        Path(DB_FILE_PATH).touch()
+        # This is the only place where
+        # this methods should be used
+        db.db_setup()
 
     if not CONFIG_FILE_PATH.exists():
         # Create config.json file
@@ -1440,35 +2953,34 @@ def setup_app() -> None:
             json.dump(json_config, file, sort_keys=False, indent=4)
 
 
-_paths = {
-    "db": DB_FILE_PATH,
-    "config": CONFIG_FILE_PATH,
-    "themes": THEMES_PATH,
-    "queues": QUEUES_PATH,
-    "shorts": SHORTS_PATH,
-    "longs": LONGS_PATH,
-}
-
+def start_app(
+    *,
+    audio: AudioBackendTypeLit | None = None,
+    profile_startup: bool = False,
+    profile_json: Path | None = None,
+    profile_cprofile: Path | None = None,
+) -> None:
+    """Set up app folder and run the app until it is closed."""
+    profile_startup = profile_startup or bool(profile_json or profile_cprofile)
+    if profile_startup:
+        profiler.enable(cprofile=profile_cprofile is not None)
 
-@click.group(invoke_without_command=True)
-@click.pass_context
-def main(ctx) -> None:
-    """Start app."""
-    if ctx.invoked_subcommand is None:
-        # Prevent app start on command use
+    with profiler.phase("setup_app"):
         setup_app()
-        FocusTUI(
-            db=DatabaseManager(),
-            cm=ConfigManager(),
-            sm=SoundManager(),
-        ).run()
-
-
-@main.command()
-@click.argument("what", type=Choice(list(_paths.keys())))
-def locate(what: str) -> None:
-    """Help you find location of a needed resource used by the app."""
-    echo(style("Path: ", "green") + str(_paths[what]))
+    with profiler.phase("config_manager"):
+        cm = ConfigManager()
+    backend = create_backend(audio or AUDIO_BACKEND, AUDIO_LOG_FILE_PATH)
+    sm = SoundManager(backend=backend)
+    FocusTUI(db=DatabaseManager(), cm=cm, sm=sm).run()
+
+    if not profile_startup:
+        return
+    if profile_cprofile is not None:
+        profiler.dump_cprofile(profile_cprofile)
+    if profile_json is not None:
+        profiler.dump_json(profile_json)
+    else:
+        echo(profiler.report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""In-process runtime metrics, enabled only in debug mode."""
+import json
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+
+# Upper bounds of histogram buckets in milliseconds
+BUCKETS_MS: tuple[float, ...] = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"),
+)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Histogram:
+    """Count observations in fixed buckets, so memory use is constant."""
+
+    __slots__ = ("buckets", "count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        self.buckets: list[int] = [0] * len(BUCKETS_MS)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float = float("inf")
+        self.max: float = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return upper bound of bucket that contains percentile."""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, bucket in zip(BUCKETS_MS, self.buckets, strict=True):
+            seen += bucket
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "min": round(self.min, 4) if self.count else 0.0,
+            "max": round(self.max, 4) if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class Metrics:
+    """Registry of counters and histograms.
+
+    When disabled every method returns immediately,
+    so instrumentation can stay in hot paths.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Add value to histogram, create histogram if needed."""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def timer(self, name: str) -> AbstractContextManager:
+        """Observe duration of the block in milliseconds."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+
+    def to_dict(self) -> dict[str, dict]:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "histograms": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+    def dump_json(self, path: Path) -> None:
+        with path.open("w") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+
+metrics = Metrics()
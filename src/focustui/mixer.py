@@ -0,0 +1,45 @@
+"""Pool of mixer channels shared by ambient layers and short sounds."""
+from focustui.audio_backend import AudioBackend
+
+# Short sound with higher priority is never cut off by lower one
+SHORT_SOUND_PRIORITIES: dict[str, int] = {"test": 0, "signal": 1, "alarm": 2}
+
+
+class ChannelPool:
+    """Reserve mixer channels for ambient layers and short sounds.
+
+    Every ambient layer has its own channel, so layers are mixed
+    by the mixer. Short sounds take any idle channel, when all are
+    busy the one playing sound of the lowest priority is reused,
+    as long as its priority is not higher than priority of new sound.
+    """
+
+    def __init__(self, backend: AudioBackend, layers: int, shorts: int) -> None:
+        self._backend = backend
+        backend.init(layers + shorts)
+        self.layers: list[int] = list(range(layers))
+        self._shorts: list[int] = list(range(layers, layers + shorts))
+        self._priorities: list[int] = [-1] * shorts
+
+    def short_channel(self, sound_type: str) -> int | None:
+        """Return channel for short sound or None if all play more important ones."""
+        priority = SHORT_SOUND_PRIORITIES[sound_type]
+        for index, channel in enumerate(self._shorts):
+            if not self._backend.is_busy(channel):
+                self._priorities[index] = priority
+                return channel
+
+        index = min(range(len(self._shorts)), key=self._priorities.__getitem__)
+        if self._priorities[index] > priority:
+            return None
+        self._priorities[index] = priority
+        self._backend.stop(self._shorts[index])
+        return self._shorts[index]
+
+    def stop_shorts(self) -> None:
+        for channel in self._shorts:
+            self._backend.stop(channel)
+
+    def stop_layers(self) -> None:
+        for channel in self.layers:
+            self._backend.stop(channel)
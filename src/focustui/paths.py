@@ -0,0 +1,59 @@
+"""Locations of app files.
+
+Kept apart from the app, so commands that only read files start
+without importing Textual or pygame.
+"""
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from platformdirs import user_data_dir
+
+load_dotenv()
+
+# Root, can be moved with FOCUSTUI_DATA_DIR e.g. for benchmarks
+_data_dir = os.getenv("FOCUSTUI_DATA_DIR")
+MAIN_DIR_PATH: Path = (
+    Path(_data_dir) if _data_dir else Path(user_data_dir()) / "focus-tui"
+)
+
+# Sounds path
+SOUNDS_PATH: Path = MAIN_DIR_PATH / "sounds"
+SHORTS_PATH: Path = SOUNDS_PATH / "shorts"
+LONGS_PATH: Path = SOUNDS_PATH / "longs"
+
+# Others
+THEMES_PATH: Path = MAIN_DIR_PATH / "themes"
+QUEUES_PATH: Path = MAIN_DIR_PATH / "queues"
+ARCHIVE_PATH: Path = MAIN_DIR_PATH / "archive"
+
+# Files
+DB_FILE_PATH: Path = MAIN_DIR_PATH / "focus-tui.db"
+JOURNAL_FILE_PATH: Path = MAIN_DIR_PATH / "session.journal"
+CONFIG_FILE_PATH: Path = MAIN_DIR_PATH / "config.json"
+METRICS_FILE_PATH: Path = MAIN_DIR_PATH / "metrics.json"
+AUDIO_LOG_FILE_PATH: Path = MAIN_DIR_PATH / "audio.log"
+LIBRARY_FILE_PATH: Path = MAIN_DIR_PATH / "library.json"
+INSTANCE_LOCK_PATH: Path = MAIN_DIR_PATH / "instance.lock"
+STATUS_FILE_PATH: Path = MAIN_DIR_PATH / "status"
+
+# Bundled with the app
+STATUS_READER_PATH: Path = Path(__file__).parent / "static" / "focustui-status.sh"
+
+# Resources that `focustui locate` finds
+LOCATABLE_PATHS: dict[str, Path] = {
+    "db": DB_FILE_PATH,
+    "journal": JOURNAL_FILE_PATH,
+    "config": CONFIG_FILE_PATH,
+    "metrics": METRICS_FILE_PATH,
+    "audio-log": AUDIO_LOG_FILE_PATH,
+    "library": LIBRARY_FILE_PATH,
+    "themes": THEMES_PATH,
+    "queues": QUEUES_PATH,
+    "archive": ARCHIVE_PATH,
+    "status": STATUS_FILE_PATH,
+    "status-reader": STATUS_READER_PATH,
+    "sounds": SOUNDS_PATH,
+    "shorts": SHORTS_PATH,
+    "longs": LONGS_PATH,
+}
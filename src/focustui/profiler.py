@@ -0,0 +1,123 @@
+"""Startup profiler used by `focustui --profile-startup`."""
+import cProfile
+import json
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+
+import focustui
+
+
+class _Phase:
+    """Accumulated timings of one startup phase."""
+
+    __slots__ = ("calls", "cpu", "wall")
+
+    def __init__(self) -> None:
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.calls: int = 0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "calls": self.calls,
+        }
+
+
+class StartupProfiler:
+    """Record wall-clock and CPU time of every startup phase.
+
+    Phases are measured only when profiler is enabled,
+    otherwise `phase` returns a no-op context manager.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self._phases: dict[str, _Phase] = {}
+        self._started: dict[str, tuple[float, float]] = {}
+        self._cprofile: cProfile.Profile | None = None
+
+    def enable(self, *, cprofile: bool = False) -> None:
+        """Start measuring phases and optionally collect cProfile stats."""
+        self.enabled = True
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """Add measured time to phase."""
+        phase = self._phases.setdefault(name, _Phase())
+        phase.wall += wall
+        phase.cpu += cpu
+        phase.calls += 1
+
+    def start(self, name: str) -> None:
+        """Start measuring phase that ends in a different place than it begins."""
+        if self.enabled:
+            self._started[name] = (time.perf_counter(), time.process_time())
+
+    def stop(self, name: str) -> None:
+        """Stop measuring phase started with `start`."""
+        if name not in self._started:
+            return
+        wall, cpu = self._started.pop(name)
+        self.record(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def phase(self, name: str) -> AbstractContextManager:
+        """Measure block of code as a phase."""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def record_imports(self, module: str) -> None:
+        """Record time elapsed from import of focustui package."""
+        wall, cpu = focustui.IMPORT_STARTED
+        self.record(
+            f"imports ({module})",
+            time.perf_counter() - wall,
+            time.process_time() - cpu,
+        )
+
+    def finish(self) -> None:
+        """Record total startup time and stop cProfile."""
+        wall, cpu = focustui.IMPORT_STARTED
+        self.record("total", time.perf_counter() - wall, time.process_time() - cpu)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def to_dict(self) -> dict[str, dict[str, float | int]]:
+        """Return phases sorted from the slowest."""
+        phases = sorted(self._phases.items(), key=lambda x: x[1].wall, reverse=True)
+        return {name: phase.to_dict() for name, phase in phases}
+
+    def report(self) -> str:
+        """Return human-readable table of phases."""
+        lines = [f"{'Phase':<32}{'Wall ms':>12}{'CPU ms':>12}{'Calls':>8}"]
+        for name, phase in self.to_dict().items():
+            lines.append(
+                f"{name:<32}{phase['wall_ms']:>12.2f}"
+                f"{phase['cpu_ms']:>12.2f}{phase['calls']:>8}",
+            )
+        return "\n".join(lines)
+
+    def dump_json(self, path: Path) -> None:
+        with path.open("w") as file:
+            json.dump({"phases": self.to_dict()}, file, indent=4)
+
+    def dump_cprofile(self, path: Path) -> None:
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(path)
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,142 @@
+"""Focus queues: sequences of focus and break segments.
+
+Queue files are parsed and compiled once into a flat schedule,
+so a running session only walks a list of precomputed deadlines.
+
+Example of a queue file:
+    {
+        "name": "Pomodoro",
+        "repeat": 4,
+        "segments": [
+            {"kind": "focus", "minutes": 50, "ambient": "Woodpecker_Forest"},
+            {"kind": "break", "minutes": 10, "signal": "Landing"}
+        ]
+    }
+"""
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+SegmentKindTypeLit = Literal["focus", "break"]
+SEGMENT_KINDS: tuple[SegmentKindTypeLit, ...] = ("focus", "break")
+
+MAX_SEGMENT_MINUTES: int = 600
+MAX_QUEUE_REPEAT: int = 100
+EXAMPLE_QUEUE: dict = {
+    "name": "Pomodoro",
+    "repeat": 4,
+    "segments": [
+        {"kind": "focus", "minutes": 25},
+        {"kind": "break", "minutes": 5},
+    ],
+}
+
+
+class SegmentModel(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    kind: SegmentKindTypeLit = "focus"
+    minutes: int = Field(gt=0, le=MAX_SEGMENT_MINUTES)
+    ambient: str | None = None
+    """Ambient played in segment, focus uses config ambient and break silence."""
+    signal: str | None = None
+    """Signal played when segment starts, config signal if not set."""
+
+
+class QueueModel(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    name: str | None = None
+    repeat: int = Field(default=1, ge=1, le=MAX_QUEUE_REPEAT)
+    segments: list[SegmentModel] = Field(min_length=1)
+
+
+class ScheduledSegment:
+    """Segment of compiled queue, `start` and `end` are seconds from start."""
+
+    __slots__ = ("ambient", "end", "kind", "label", "signal", "start")
+
+    def __init__(  # noqa: PLR0913 - one argument per field
+        self,
+        kind: SegmentKindTypeLit,
+        start: int,
+        end: int,
+        label: str,
+        *,
+        ambient: str | None,
+        signal: str | None,
+    ) -> None:
+        self.kind: SegmentKindTypeLit = kind
+        self.start: int = start
+        self.end: int = end
+        self.label: str = label
+        self.ambient: str | None = ambient
+        self.signal: str | None = signal
+
+    def __repr__(self) -> str:
+        return f"ScheduledSegment({self.label}, {self.start}-{self.end})"
+
+
+class Schedule:
+    """Flat list of segments of a queue with repeats unrolled."""
+
+    def __init__(self, name: str, segments: list[ScheduledSegment]) -> None:
+        self.name: str = name
+        self.segments: list[ScheduledSegment] = segments
+        self.length: int = segments[-1].end
+        self._starts: list[int] = [segment.start for segment in segments]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def segment_at(self, elapsed: int) -> int:
+        """Return index of segment that is played after `elapsed` seconds."""
+        return max(0, bisect_right(self._starts, elapsed) - 1)
+
+
+def compile_queue(name: str, queue: QueueModel, minute: int = 60) -> Schedule:
+    """Unroll repeats and compute start and end of every segment."""
+    segments = queue.segments * queue.repeat
+    totals = {kind: sum(s.kind == kind for s in segments) for kind in SEGMENT_KINDS}
+    counters = dict.fromkeys(SEGMENT_KINDS, 0)
+
+    scheduled = []
+    start = 0
+    for segment in segments:
+        counters[segment.kind] += 1
+        end = start + segment.minutes * minute
+        number = f"{counters[segment.kind]}/{totals[segment.kind]}"
+        label = f"{segment.kind.capitalize()} {number}"
+        scheduled.append(
+            ScheduledSegment(
+                segment.kind,
+                start,
+                end,
+                label,
+                ambient=segment.ambient,
+                signal=segment.signal,
+            ),
+        )
+        start = end
+    return Schedule(queue.name or name, scheduled)
+
+
+def load_queues(path: Path, minute: int = 60) -> tuple[dict[str, Schedule], list[str]]:
+    """Compile every queue file in the folder.
+
+    Return schedules by their names and errors of files that are not valid.
+    """
+    schedules: dict[str, Schedule] = {}
+    errors: list[str] = []
+    for file_path in sorted(path.glob("*.json")):
+        try:
+            queue = QueueModel.model_validate(json.loads(file_path.read_text()))
+        except (OSError, ValueError, ValidationError) as error:
+            errors.append(f"{file_path.name}: {error}")
+            continue
+        schedule = compile_queue(file_path.stem, queue, minute)
+        schedules[schedule.name] = schedule
+    return schedules, errors
@@ -0,0 +1,321 @@
+"""Sessions kept in memory as columns for statistics.
+
+Every session is a start, a length and a done flag in three arrays,
+11 bytes per session instead of a tuple of Python ints. Starts are
+wall clock seconds, local time counted as if it was UTC, so day and
+hour of a session are plain integer division. Aggregations are single
+passes over the columns, vectorized with numpy when it is installed.
+"""
+import calendar
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Literal, get_args
+
+DAY: int = 24 * 60 * 60
+HOUR: int = 60 * 60
+HOURS_IN_DAY: int = 24
+
+SessionWeightTypeLit = Literal["sessions", "done", "minutes", "done_minutes"]
+SESSION_WEIGHTS: tuple[SessionWeightTypeLit, ...] = get_args(SessionWeightTypeLit)
+
+
+def wall_seconds(date: datetime) -> int:
+    """Return local date as seconds of the store."""
+    return calendar.timegm(date.timetuple())
+
+
+def local_seconds(epoch: float) -> int:
+    """Return epoch as seconds of the store."""
+    return int(epoch) + time.localtime(epoch).tm_gmtoff
+
+
+def is_numpy_available() -> bool:
+    """Vectorized queries need optional numpy dependency."""
+    return find_spec("numpy") is not None
+
+
+class HourRollups:
+    """Sums of sessions per hour, sorted by hour.
+
+    Archived sessions are kept only as rollups, there are at most 24
+    of them a day, so they are summed without numpy. A rollup is in
+    a range when its hour starts in it.
+    """
+
+    __slots__ = ("columns", "hours")
+
+    def __init__(self) -> None:
+        self.hours = array("q")
+        self.columns: dict[SessionWeightTypeLit, array] = {
+            weight: array("q") for weight in SESSION_WEIGHTS
+        }
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def extend(
+        self, rollups: Iterable[tuple[datetime, int, int, int, int]],
+    ) -> None:
+        """Add rollups of (hour, sessions, done, minutes, done minutes).
+
+        Rollups must come sorted by hour.
+        """
+        for hour, *sums in rollups:
+            self.hours.append(wall_seconds(hour))
+            for column, value in zip(self.columns.values(), sums, strict=True):
+                column.append(value)
+
+    def _slice(self, start: int, end: int) -> tuple[int, int]:
+        return bisect_left(self.hours, start), bisect_left(self.hours, end)
+
+    def totals(self, start: int, end: int) -> tuple[int, ...]:
+        first, last = self._slice(start, end)
+        return tuple(sum(column[first:last]) for column in self.columns.values())
+
+    def add_sums_by(
+        self,
+        sums: list[int],
+        start: int,
+        end: int,
+        key: Literal["day", "hour"],
+        weight: SessionWeightTypeLit,
+    ) -> None:
+        """Add weight of rollups in [start, end) to sums by key."""
+        first, last = self._slice(start, end)
+        origin = start // DAY
+        column = self.columns[weight]
+        for i in range(first, last):
+            value = self.hours[i]
+            index = value // DAY - origin if key == "day" else value % DAY // HOUR
+            sums[index] += column[i]
+
+
+class SessionStore:
+    """Columns of sessions sorted by start.
+
+    Sessions that are only rolled up are counted from `rollups`.
+    """
+
+    __slots__ = ("done", "lengths", "rollups", "starts", "vectorized")
+
+    def __init__(self, *, vectorized: bool | None = None) -> None:
+        self.starts = array("q")
+        self.lengths = array("H")
+        self.done = array("B")
+        self.rollups = HourRollups()
+        self.vectorized: bool = (
+            is_numpy_available() if vectorized is None else vectorized
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def session_count(self) -> int:
+        """Number of sessions with the rolled up ones."""
+        return len(self) + sum(self.rollups.columns["sessions"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            len(column) * column.itemsize
+            for column in (self.starts, self.lengths, self.done)
+        )
+
+    def add(self, epoch: float, length: int, done: int) -> None:
+        """Add session started at epoch, sessions are kept sorted."""
+        start = local_seconds(epoch)
+        if not self.starts or start >= self.starts[-1]:
+            self.starts.append(start)
+            self.lengths.append(length)
+            self.done.append(done)
+            return
+        # Session recorded late, e.g. one that app was closed in
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.lengths.insert(index, length)
+        self.done.insert(index, done)
+
+    def extend(self, sessions: Iterable[tuple[float, int, int]]) -> None:
+        """Add sessions of (epoch, length, done) sorted by start."""
+        for epoch, length, done in sessions:
+            self.add(epoch, length, done)
+
+    def slice(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """Return indexes of first and after last session in [start, end)."""
+        return self._slice(wall_seconds(start), wall_seconds(end))
+
+    def _slice(self, start: int, end: int) -> tuple[int, int]:
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+
+    def sum_by(
+        self,
+        start: datetime,
+        end: datetime,
+        key: Literal["day", "hour"],
+        weight: SessionWeightTypeLit,
+    ) -> list[int]:
+        """Return weight of sessions in [start, end) summed by key.
+
+        Days are counted from the day of start, hours are hours of day.
+        """
+        return self._sum_by(wall_seconds(start), wall_seconds(end), key, weight)
+
+    def _sum_by(
+        self,
+        start: int,
+        end: int,
+        key: Literal["day", "hour"],
+        weight: SessionWeightTypeLit,
+    ) -> list[int]:
+        sums = self._sum_sessions_by(start, end, key, weight)
+        self.rollups.add_sums_by(sums, start, end, key, weight)
+        return sums
+
+    def _sum_sessions_by(
+        self,
+        start: int,
+        end: int,
+        key: Literal["day", "hour"],
+        weight: SessionWeightTypeLit,
+    ) -> list[int]:
+        first, last = self._slice(start, end)
+        origin = start // DAY
+        size = HOURS_IN_DAY if key == "hour" else max(0, -(-end // DAY) - origin)
+        if first == last:
+            return [0] * size
+        if self.vectorized:
+            return self._sum_by_numpy(
+                first, last, key, weight, origin=origin, size=size,
+            )
+
+        sums = [0] * size
+        for i in range(first, last):
+            value = self.starts[i]
+            index = value // DAY - origin if key == "day" else value % DAY // HOUR
+            match weight:
+                case "sessions":
+                    sums[index] += 1
+                case "done":
+                    sums[index] += self.done[i]
+                case "minutes":
+                    sums[index] += self.lengths[i]
+                case "done_minutes":
+                    sums[index] += self.lengths[i] * self.done[i]
+        return sums
+
+    def _sum_by_numpy(  # noqa: PLR0913
+        self,
+        first: int,
+        last: int,
+        key: Literal["day", "hour"],
+        weight: SessionWeightTypeLit,
+        *,
+        origin: int,
+        size: int,
+    ) -> list[int]:
+        import numpy as np
+
+        # Views of the arrays, they are gone before arrays can grow again
+        starts = np.frombuffer(self.starts, dtype=np.int64)[first:last]
+        keys = starts // DAY - origin if key == "day" else starts % DAY // HOUR
+        weights = None
+        if weight != "sessions":
+            done = np.frombuffer(self.done, dtype=np.uint8)[first:last]
+            lengths = np.frombuffer(self.lengths, dtype=np.uint16)[first:last]
+            weights = {
+                "done": done,
+                "minutes": lengths,
+                "done_minutes": lengths * done,
+            }[weight].astype(np.int64)
+        sums = np.bincount(keys, weights=weights, minlength=size)
+        return [int(value) for value in sums]
+
+    def totals(self, start: datetime, end: datetime) -> tuple[int, int, int, int]:
+        """Return sessions, done sessions, minutes and done minutes."""
+        sessions = self._totals(start, end)
+        rollups = self.rollups.totals(wall_seconds(start), wall_seconds(end))
+        return tuple(a + b for a, b in zip(sessions, rollups, strict=True))
+
+    def _totals(self, start: datetime, end: datetime) -> tuple[int, int, int, int]:
+        first, last = self.slice(start, end)
+        if self.vectorized and first != last:
+            import numpy as np
+
+            done = np.frombuffer(self.done, dtype=np.uint8)[first:last]
+            lengths = np.frombuffer(self.lengths, dtype=np.uint16)[first:last]
+            return (
+                last - first,
+                int(done.sum()),
+                int(lengths.sum()),
+                int(lengths[done.astype(bool)].sum()),
+            )
+        done = self.done[first:last]
+        lengths = self.lengths[first:last]
+        return (
+            last - first,
+            sum(done),
+            sum(lengths),
+            sum(
+                length
+                for length, is_done in zip(lengths, done, strict=True)
+                if is_done
+            ),
+        )
+
+    def hour_distribution(self, start: datetime, end: datetime) -> list[int]:
+        """Return focused minutes of every hour of day."""
+        return self.sum_by(start, end, "hour", "done_minutes")
+
+    def daily_minutes(self, start: datetime, end: datetime) -> list[int]:
+        """Return focused minutes of every day in [start, end)."""
+        return self.sum_by(start, end, "day", "done_minutes")
+
+    def streaks(self, today: datetime) -> tuple[int, int]:
+        """Return current and longest streak of days with a done session.
+
+        Current streak is not broken before the first session of today.
+        """
+        firsts = [column[0] for column in (self.starts, self.rollups.hours) if column]
+        if not firsts:
+            return 0, 0
+        tomorrow = (wall_seconds(today) // DAY + 1) * DAY
+        days = self._sum_by(min(firsts), tomorrow, "day", "done")
+
+        current = 0
+        # Today without sessions yet continues streak of yesterday
+        for done in reversed(days[:-1] if days and not days[-1] else days):
+            if not done:
+                break
+            current += 1
+        longest = run = 0
+        for done in days:
+            run = run + 1 if done else 0
+            longest = max(longest, run)
+        return current, longest
+
+    def moving_average(
+        self, start: datetime, end: datetime, window: int,
+    ) -> list[float]:
+        """Return mean focused minutes of `window` days ending on every day."""
+        days = self.daily_minutes(start, end)
+        if self.vectorized and days:
+            import numpy as np
+
+            cumulative = np.concatenate(([0], np.cumsum(days)))
+            ends = np.arange(1, len(days) + 1)
+            begins = np.maximum(0, ends - window)
+            return [
+                float(value)
+                for value in (cumulative[ends] - cumulative[begins]) / window
+            ]
+        averages = []
+        total = 0
+        for i, minutes in enumerate(days):
+            total += minutes - (days[i - window] if i >= window else 0)
+            averages.append(total / window)
+        return averages
@@ -0,0 +1,111 @@
+"""In-memory index of sound names used by type-ahead search."""
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+
+def _normalize(name: str) -> str:
+    """Lower name and split it into words, so words start with padding."""
+    return name.lower().replace("_", " ").replace("-", " ")
+
+
+def _trigrams(text: str, *, closed: bool = True) -> set[str]:
+    """Return trigrams of text padded like in pg_trgm.
+
+    Query is not closed at the end, because user is still typing it.
+    """
+    padded = f"  {text} " if closed else f"  {text}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SoundIndex:
+    """Index sounds names by trigrams, updated incrementally.
+
+    Search ranks prefix matches first, then substrings and then
+    names that share most of trigrams with query, so typos are forgiven.
+    """
+
+    def __init__(self) -> None:
+        self._types: dict[str, str] = {}
+        self._sorted: list[tuple[str, str]] = []
+        self._trigrams: defaultdict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._types
+
+    def add(self, name: str, sound_type: str) -> None:
+        if name in self._types:
+            self.remove(name)
+        self._types[name] = sound_type
+        insort(self._sorted, (name.lower(), name))
+        for trigram in _trigrams(_normalize(name)):
+            self._trigrams[trigram].add(name)
+
+    def remove(self, name: str) -> None:
+        if self._types.pop(name, None) is None:
+            return
+        index = bisect_left(self._sorted, (name.lower(), name))
+        del self._sorted[index]
+        for trigram in _trigrams(_normalize(name)):
+            names = self._trigrams[trigram]
+            names.discard(name)
+            if not names:
+                del self._trigrams[trigram]
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        sound_type = self._types[old_name]
+        self.remove(old_name)
+        self.add(new_name, sound_type)
+
+    def _first(self, sound_type: str | None, limit: int) -> list[str]:
+        """Return up to `limit` names in alphabetical order."""
+        names = (name for _, name in self._sorted)
+        if sound_type is not None:
+            names = (name for name in names if self._types[name] == sound_type)
+        return [name for name, _ in zip(names, range(limit), strict=False)]
+
+    def search(
+        self,
+        query: str,
+        sound_type: str | None = None,
+        limit: int = 10,
+    ) -> list[str]:
+        """Return up to `limit` names best matching query."""
+        query = _normalize(query.strip())
+        if not query:
+            return self._first(sound_type, limit)
+
+        types = self._types
+
+        query_trigrams = _trigrams(query, closed=False)
+        # Trigrams without padding, all of them are shared by substring matches
+        inner = {trigram for trigram in query_trigrams if not trigram[0].isspace()}
+        shared: dict[str, int] = defaultdict(int)
+        inner_shared: dict[str, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            is_inner = trigram in inner
+            for name in self._trigrams.get(trigram, ()):
+                shared[name] += 1
+                if is_inner:
+                    inner_shared[name] += 1
+
+        min_inner_shared = (len(inner) + 2) // 3
+        candidates = []
+        for name, count in shared.items():
+            if sound_type is not None and types[name] != sound_type:
+                continue
+            lower = _normalize(name)
+            if lower.startswith(query):
+                tier = 0
+            elif query in lower:
+                tier = 1
+            elif inner and inner_shared[name] >= min_inner_shared:
+                tier = 2
+            else:
+                continue
+            candidates.append((tier, -count, len(name), lower, name))
+
+        return [match[-1] for match in heapq.nsmallest(limit, candidates)]
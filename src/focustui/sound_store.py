@@ -0,0 +1,378 @@
+"""Content-addressed storage of sound files.
+
+Every file is stored once in the blobs folder under the hash of its
+content, and the index maps names users see to the blobs. Importing
+a file that is already stored only adds a name to the index, renaming
+a sound only changes the index, and the blob is removed with the last
+name that refers to it. Files are hashed while they are copied, so
+they are read once.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+from focustui.analysis import HASH_CHUNK_SIZE, file_hash, probe_sound
+from focustui.instances import file_lock
+from focustui.loops import loop_path
+
+SOUND_SUFFIXES: set[str] = {".wav", ".mp3", ".ogg", ".flac", ".opus"}
+BLOBS_DIR_NAME: str = "blobs"
+INDEX_FILE_NAME: str = "index.json"
+# Copies wait for disk, so there are more of them than cores
+IMPORT_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
+
+
+class StoredSound(BaseModel):
+    type: Literal["short", "long"]
+    blob: str
+    """File name of the blob, hash of content with suffix of imported file."""
+
+
+class StoreIndexModel(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    sounds: dict[str, StoredSound] = {}
+
+
+def soundify(sound: str) -> str:
+    """Remove all characters that are not a letter, number, - or _."""
+    return "".join(
+        char if char.isalnum() or char in {"_", "-"} else "_" for char in sound
+    )
+
+
+def walk_sounds(folder: Path) -> Iterator[Path]:
+    """Yield sound files of the folder tree as they are found.
+
+    Hidden files and folders are skipped.
+    """
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return
+    for entry in sorted(entries, key=lambda entry: entry.name):
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir():
+            yield from walk_sounds(Path(entry.path))
+        elif Path(entry.name).suffix.lower() in SOUND_SUFFIXES and entry.is_file():
+            yield Path(entry.path)
+
+
+class ImportSummary:
+    __slots__ = ("duplicates", "imported", "skipped")
+
+    def __init__(self) -> None:
+        self.imported: list[str] = []
+        """Names of sounds added to the store."""
+        self.duplicates: list[Path] = []
+        """Files with content that is already stored."""
+        self.skipped: list[Path] = []
+        """Files that are not sounds mixer decodes or can't be read."""
+
+    def __repr__(self) -> str:
+        return f"ImportSummary({self.describe()})"
+
+    def describe(self) -> str:
+        return (
+            f"Imported {len(self.imported)}, "
+            f"duplicates {len(self.duplicates)}, skipped {len(self.skipped)}"
+        )
+
+
+def copy_hashed(source: Path, target: Path) -> str:
+    """Copy file in chunks and return hash of its content.
+
+    Hash is the same as `file_hash` of the copy.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with source.open("rb") as src, target.open("wb") as dst:
+        while chunk := src.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, target)
+    return digest.hexdigest()
+
+
+class SoundStore:
+    """Blobs of sound files and index of their names.
+
+    Index is shared by instances, so it is changed under file lock
+    and read again before every change.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.blobs_path = root / BLOBS_DIR_NAME
+        self.index_path = root / INDEX_FILE_NAME
+        self.index = self._load()
+
+    def _load(self) -> StoreIndexModel:
+        try:
+            with self.index_path.open() as file:
+                return StoreIndexModel.model_validate(json.load(file))
+        except (OSError, ValueError):
+            return StoreIndexModel()
+
+    def _save(self) -> None:
+        """Write index to temporary file and replace old one with it."""
+        temp_path = self.index_path.with_suffix(".tmp")
+        with temp_path.open("w") as file:
+            json.dump(self.index.model_dump(), file, indent=1)
+        temp_path.replace(self.index_path)
+
+    @contextmanager
+    def _update(self) -> Iterator[StoreIndexModel]:
+        """Change index written by any instance and save it once."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.index_path):
+            self.index = self._load()
+            yield self.index
+            self._save()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index.sounds
+
+    def sounds(self) -> Iterator[tuple[str, StoredSound]]:
+        yield from self.index.sounds.items()
+
+    def blob_path(self, blob: str) -> Path:
+        return self.blobs_path / blob
+
+    def path_of(self, name: str) -> Path:
+        return self.blob_path(self.index.sounds[name].blob)
+
+    def _blobs(self) -> dict[str, str]:
+        """Return content hashes mapped to blobs stored under them."""
+        return {
+            sound.blob.partition(".")[0]: sound.blob
+            for sound in self.index.sounds.values()
+        }
+
+    def names_of(self, name: str) -> list[str]:
+        """Return other names of the same content."""
+        blob = self.index.sounds[name].blob
+        return [
+            other for other, sound in self.index.sounds.items()
+            if sound.blob == blob and other != name
+        ]
+
+    def _store_blob(self, source: Path, blobs: dict[str, str], *, move: bool) -> str:
+        """Store content of the file, return its blob.
+
+        Moved file is hashed and renamed, unless blob of the same content
+        already exists, copied file is hashed while it is copied.
+        New blob is added to `blobs`.
+        """
+        self.blobs_path.mkdir(parents=True, exist_ok=True)
+        suffix = source.suffix.lower()
+        if move:
+            content_hash = file_hash(source)
+            blob = blobs.setdefault(content_hash, content_hash + suffix)
+            if self.blob_path(blob).exists():
+                source.unlink()
+            else:
+                shutil.move(source, self.blob_path(blob))
+            return blob
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.blobs_path, suffix=".tmp", delete=False,
+        ) as temp:
+            temp_path = Path(temp.name)
+        try:
+            content_hash = copy_hashed(source, temp_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        blob = blobs.setdefault(content_hash, content_hash + suffix)
+        if self.blob_path(blob).exists():
+            temp_path.unlink()
+        else:
+            temp_path.replace(self.blob_path(blob))
+        return blob
+
+    def add(
+        self,
+        source: Path,
+        name: str,
+        length_type: Literal["short", "long"],
+        *,
+        move: bool = False,
+    ) -> bool:
+        """Add file under the name, return False if content was stored already."""
+        with self._update() as index:
+            blobs = self._blobs()
+            stored = len(blobs)
+            blob = self._store_blob(source, blobs, move=move)
+            index.sounds[name] = StoredSound(type=length_type, blob=blob)
+        return len(blobs) > stored
+
+    def adopt(
+        self,
+        folder: Path,
+        length_type: Literal["short", "long"],
+    ) -> list[str]:
+        """Move sound files of the folder to the store, return added names.
+
+        Name taken by other content gets a number, file of the same
+        content and name is only removed.
+        """
+        files = [
+            path for path in folder.glob("*")
+            if path.suffix.lower() in SOUND_SUFFIXES and path.is_file()
+        ] if folder.is_dir() else []
+        if not files:
+            return []
+
+        added = []
+        with self._update() as index:
+            blobs = self._blobs()
+            for path in files:
+                blob = self._store_blob(path, blobs, move=True)
+                # Loop is built again for the blob
+                loop_path(path).unlink(missing_ok=True)
+                name = stem = soundify(path.stem)
+                number = 1
+                while name in index.sounds and index.sounds[name].blob != blob:
+                    number += 1
+                    name = f"{stem}_{number}"
+                if name not in index.sounds:
+                    index.sounds[name] = StoredSound(type=length_type, blob=blob)
+                    added.append(name)
+        return added
+
+    def _copy_valid(self, source: Path) -> tuple[Path, str | None, Path | None]:
+        """Copy decodable file to a temporary blob, return its hash.
+
+        Hash and temporary blob are None for a file that is not a sound
+        or can't be copied, copy that failed is never left behind.
+        """
+        temp_path: Path | None = None
+        content_hash: str | None = None
+        try:
+            with suppress(OSError):
+                if probe_sound(source):
+                    with tempfile.NamedTemporaryFile(
+                        dir=self.blobs_path, suffix=".tmp", delete=False,
+                    ) as temp:
+                        temp_path = Path(temp.name)
+                    content_hash = copy_hashed(source, temp_path)
+        finally:
+            if content_hash is None and temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+        if content_hash is None:
+            return source, None, None
+        return source, content_hash, temp_path
+
+    def import_files(
+        self,
+        files: Iterable[Path],
+        length_type: Literal["short", "long"],
+        *,
+        max_workers: int = IMPORT_WORKERS,
+    ) -> ImportSummary:
+        """Import many files at once under their soundified names.
+
+        Files are probed and copied by a thread pool as they come, at most
+        twice as many as there are workers at once. Copy of content that
+        is stored already is removed as soon as it is hashed, so only new
+        sounds take disk space. The index is changed once at the end.
+        Name that is taken gets a number.
+        """
+        summary = ImportSummary()
+        self.blobs_path.mkdir(parents=True, exist_ok=True)
+        self.index = self._load()
+        stored = self._blobs()
+        copies: dict[str, tuple[Path, Path]] = {}
+        """Temporary blobs of new content under its hash."""
+        pending: deque[Future[tuple[Path, str | None, Path | None]]] = deque()
+
+        def collect(future: Future[tuple[Path, str | None, Path | None]]) -> None:
+            source, content_hash, temp_path = future.result()
+            if content_hash is None or temp_path is None:
+                summary.skipped.append(source)
+            elif content_hash in stored or content_hash in copies:
+                temp_path.unlink(missing_ok=True)
+                summary.duplicates.append(source)
+            else:
+                copies[content_hash] = (source, temp_path)
+
+        try:
+            with ThreadPoolExecutor(max_workers) as pool:
+                for path in files:
+                    pending.append(pool.submit(self._copy_valid, path))
+                    if len(pending) >= max_workers * 2:
+                        collect(pending.popleft())
+                while pending:
+                    collect(pending.popleft())
+
+            self._add_copies(copies, length_type, summary)
+        finally:
+            # Pool has finished all copies here, also when one of them failed
+            temps = [temp_path for _, temp_path in copies.values()]
+            temps.extend(
+                future.result()[2] for future in pending
+                if future.exception() is None
+            )
+            for temp_path in temps:
+                if temp_path is not None:
+                    temp_path.unlink(missing_ok=True)
+        return summary
+
+    def _add_copies(
+        self,
+        copies: dict[str, tuple[Path, Path]],
+        length_type: Literal["short", "long"],
+        summary: ImportSummary,
+    ) -> None:
+        """Move temporary blobs to the store and add names of their sources."""
+        with self._update() as index:
+            blobs = self._blobs()
+            for content_hash, (source, temp_path) in copies.items():
+                if content_hash in blobs:
+                    # Other instance stored it meanwhile
+                    summary.duplicates.append(source)
+                    continue
+                blob = blobs[content_hash] = content_hash + source.suffix.lower()
+                temp_path.replace(self.blob_path(blob))
+                name = stem = soundify(source.stem)
+                number = 1
+                while name in index.sounds:
+                    number += 1
+                    name = f"{stem}_{number}"
+                index.sounds[name] = StoredSound(type=length_type, blob=blob)
+                summary.imported.append(name)
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        with self._update() as index:
+            index.sounds[new_name] = index.sounds.pop(old_name)
+
+    def remove(self, name: str) -> bool:
+        """Remove the name, and blob when no other name refers to it.
+
+        Return True if blob was removed.
+        """
+        return self.remove_many([name]) == 1
+
+    def remove_many(self, names: Iterable[str]) -> int:
+        """Remove names at once, return number of removed blobs."""
+        with self._update() as index:
+            blobs = {
+                sound.blob for name in names
+                if (sound := index.sounds.pop(name, None)) is not None
+            }
+            blobs.difference_update(sound.blob for sound in index.sounds.values())
+            for blob in blobs:
+                path = self.blob_path(blob)
+                path.unlink(missing_ok=True)
+                loop_path(path).unlink(missing_ok=True)
+        return len(blobs)
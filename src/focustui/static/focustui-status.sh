@@ -0,0 +1,24 @@
+#!/bin/sh
+# Print time of the running FocusTUI session for tmux, polybar or a prompt.
+# Prints nothing when no session runs. Find the status file with
+# `focustui locate status` and pass it when the app folder is not the
+# Linux default.
+#
+# Usage: focustui-status.sh [STATUS_FILE]
+
+file=${1:-${XDG_DATA_HOME:-$HOME/.local/share}/focus-tui/status}
+read -r version pid mode started deadline ambient label < "$file" 2>/dev/null || exit 0
+[ "$version" = 1 ] && [ "$mode" != idle ] || exit 0
+# App that was killed leaves its last status behind
+kill -0 "$pid" 2>/dev/null || exit 0
+
+now=$(date +%s)
+if [ "$mode" = stopwatch ]; then
+    seconds=$((now - started))
+else
+    seconds=$((deadline - now))
+fi
+[ "$seconds" -gt 0 ] || seconds=0
+[ "$label" = - ] && label="" || label="$(echo "$label" | tr _ ' ') "
+[ "$ambient" = 1 ] && note=" ~" || note=""
+printf '%s%d:%02d%s\n' "$label" $((seconds / 60)) $((seconds % 60)) "$note"
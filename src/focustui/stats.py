@@ -0,0 +1,226 @@
+"""Statistics of focus sessions.
+
+`StatsEngine` answers every statistics query of the app and CLI from
+the columnar session store, archived sessions are counted from their
+rollups. Results are memoized per query and range.
+Recording a session invalidates only results whose range contains it,
+so a new session today never drops cached totals of past weeks.
+Sessions recorded by other instances are noticed by the number of
+sessions in history, it is checked before every query.
+
+Engine is safe to query from a worker thread while the app records
+sessions.
+"""
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Literal, NamedTuple, TypeVar
+
+from focustui.history import SessionHistory
+from focustui.metrics import metrics
+from focustui.session_store import SessionStore
+
+StatsRangeTypeLit = Literal["today", "week", "month", "year", "all"]
+STATS_RANGES: tuple[StatsRangeTypeLit, ...] = (
+    "today", "week", "month", "year", "all",
+)
+DEFAULT_BEST_HOURS: int = 3
+# Range "all" starts with this year, before any recorded session
+FIRST_YEAR: int = 1970
+
+_Result = TypeVar("_Result")
+
+
+def range_bounds(
+    stats_range: StatsRangeTypeLit,
+    now: datetime | None = None,
+) -> tuple[datetime, datetime]:
+    """Return start and end of the range that contains now.
+
+    Weeks start on Monday, range "all" starts with `FIRST_YEAR`.
+    """
+    now = datetime.now() if now is None else now
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    match stats_range:
+        case "today":
+            return today, tomorrow
+        case "week":
+            monday = today - timedelta(days=today.weekday())
+            return monday, monday + timedelta(days=7)
+        case "month":
+            start = today.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1)
+            return start, end
+        case "year":
+            start = today.replace(month=1, day=1)
+            return start, start.replace(year=start.year + 1)
+        case "all":
+            return today.replace(year=FIRST_YEAR, month=1, day=1), tomorrow
+
+
+class Totals(NamedTuple):
+    sessions: int
+    done: int
+    minutes: int
+    done_minutes: int
+    """Minutes of sessions that were done."""
+
+    @property
+    def completion_rate(self) -> float:
+        """Part of sessions that were done, 0 without sessions."""
+        return self.done / self.sessions if self.sessions else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "sessions": self.sessions,
+            "done": self.done,
+            "minutes": self.minutes,
+            "done_minutes": self.done_minutes,
+            "completion_rate": round(self.completion_rate, 3),
+        }
+
+
+class StatsEngine:
+    """Memoized statistics queries of session history."""
+
+    def __init__(
+        self,
+        history: SessionHistory,
+        *,
+        vectorized: bool | None = None,
+    ) -> None:
+        self.history = history
+        self._vectorized = vectorized
+        self._store: SessionStore | None = None
+        self._cache: dict[tuple[str, datetime, datetime, object], object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> SessionStore:
+        """Sessions in columns with archived rollups, loaded on first use."""
+        with self._lock:
+            self._drop_outdated()
+            return self._load_store()
+
+    def _drop_outdated(self) -> None:
+        """Drop store and results when history has sessions store has not."""
+        if (
+            self._store is not None
+            and self._store.session_count != self.history.session_count()
+        ):
+            # Other instance recorded sessions
+            metrics.increment("stats.reload")
+            self._store = None
+            self._cache.clear()
+
+    def _load_store(self) -> SessionStore:
+        if self._store is None:
+            store = SessionStore(vectorized=self._vectorized)
+            with metrics.timer("stats.load_ms"):
+                rollups, sessions = self.history.statistics_rows()
+                store.rollups.extend(rollups)
+                store.extend(sessions)
+            self._store = store
+        return self._store
+
+    def record(self, date: datetime, length: int, is_successful: int) -> None:
+        """Add session recorded to history, drop results of ranges with it."""
+        with self._lock:
+            if self._store is not None:
+                self._store.add(date.timestamp(), length, is_successful)
+            stale = [
+                key for key in self._cache
+                if key[1] <= date < key[2]
+            ]
+            for key in stale:
+                del self._cache[key]
+
+    def clear(self) -> None:
+        """Drop store and every result."""
+        with self._lock:
+            self._store = None
+            self._cache.clear()
+
+    def _query(
+        self,
+        name: str,
+        start: datetime,
+        end: datetime,
+        compute: Callable[[SessionStore], _Result],
+        parameter: object = None,
+    ) -> _Result:
+        key = (name, start, end, parameter)
+        with self._lock:
+            self._drop_outdated()
+            if key in self._cache:
+                metrics.increment("stats.cache_hit")
+                return self._cache[key]
+            with metrics.timer("stats.query_ms"):
+                result = compute(self._load_store())
+            self._cache[key] = result
+            return result
+
+    def totals(
+        self,
+        stats_range: StatsRangeTypeLit,
+        now: datetime | None = None,
+    ) -> Totals:
+        start, end = range_bounds(stats_range, now)
+        return self.totals_between(start, end)
+
+    def totals_between(self, start: datetime, end: datetime) -> Totals:
+        return self._query(
+            "totals",
+            start,
+            end,
+            lambda store: Totals(*store.totals(start, end)),
+        )
+
+    def completion_rate(
+        self,
+        stats_range: StatsRangeTypeLit,
+        now: datetime | None = None,
+    ) -> float:
+        return self.totals(stats_range, now).completion_rate
+
+    def streaks(self, now: datetime | None = None) -> tuple[int, int]:
+        """Return current and longest streak of days with a done session."""
+        now = datetime.now() if now is None else now
+        start, end = range_bounds("all", now)
+        return self._query(
+            "streaks",
+            start,
+            end,
+            lambda store: store.streaks(now),
+        )
+
+    def best_hours(
+        self,
+        stats_range: StatsRangeTypeLit,
+        now: datetime | None = None,
+        count: int = DEFAULT_BEST_HOURS,
+    ) -> list[tuple[int, int]]:
+        """Return hours of day with most focused minutes, best first.
+
+        Every item is an hour and its minutes, hours without focus are skipped.
+        """
+        start, end = range_bounds(stats_range, now)
+
+        def compute(store: SessionStore) -> list[tuple[int, int]]:
+            hours = store.hour_distribution(start, end)
+            best = sorted(range(len(hours)), key=lambda hour: -hours[hour])
+            return [(hour, hours[hour]) for hour in best[:count] if hours[hour]]
+
+        return self._query("best_hours", start, end, compute, count)
+
+
+def stats_report(stats: StatsEngine, now: datetime | None = None) -> dict:
+    """Return totals of today and this week with streaks."""
+    now = datetime.now() if now is None else now
+    current, longest = stats.streaks(now)
+    return {
+        "today": stats.totals("today", now).to_dict(),
+        "week": stats.totals("week", now).to_dict(),
+        "streak": {"current": current, "longest": longest},
+    }
@@ -0,0 +1,163 @@
+"""Status of the running session for status bars.
+
+The app writes one fixed-width line to the status file when the session
+changes: it starts, ends, switches a segment or toggles ambient. Every
+field has a fixed column in bytes, label is cut at a character that fits
+and padded after encoding, so the file always has the same size and a
+reader polling every second does a single small read and never parses
+more than it needs. The line holds wall clock deadlines rather than
+remaining time, so it stays valid without being rewritten every tick.
+
+Line has fields: version, pid, mode, started, deadline, ambient, label.
+    1      12345 timer     1760000000 1760001500 1 -
+"""
+import os
+import sys
+from pathlib import Path
+
+STATUS_VERSION: int = 1
+IDLE_MODE: str = "idle"
+MAX_LABEL_LENGTH: int = 24
+"""Length of label in UTF-8 bytes."""
+# Sessions started together in many terminals end within this many seconds
+SAME_SESSION_SLACK: float = 2.0
+_LINE: str = (
+    "{version} {pid:>10} {mode:<9} {started:>10} {deadline:>10} {ambient:d} "
+    "{label}\n"
+)
+
+
+class SessionStatus:
+    __slots__ = ("ambient", "deadline", "label", "mode", "pid", "started")
+
+    def __init__(  # noqa: PLR0913 - one argument per field
+        self,
+        mode: str,
+        started: int = 0,
+        deadline: int = 0,
+        *,
+        ambient: bool = False,
+        label: str | None = None,
+        pid: int | None = None,
+    ) -> None:
+        self.mode: str = mode
+        self.started: int = started
+        """Wall clock time of session start."""
+        self.deadline: int = deadline
+        """Wall clock time of the end of timer or segment, 0 for stopwatch."""
+        self.ambient: bool = ambient
+        self.label: str | None = label
+        self.pid: int = os.getpid() if pid is None else pid
+
+    def __repr__(self) -> str:
+        return f"SessionStatus({self.mode}, {self.started}-{self.deadline})"
+
+    @property
+    def is_idle(self) -> bool:
+        return self.mode == IDLE_MODE
+
+    def to_line(self) -> bytes:
+        label = (self.label or "-").replace(" ", "_").encode()
+        # Cut bytes of a character that doesn't fit
+        label = label[:MAX_LABEL_LENGTH].decode(errors="ignore").encode()
+        return _LINE.format(
+            version=STATUS_VERSION,
+            pid=self.pid,
+            mode=self.mode,
+            started=self.started,
+            deadline=self.deadline,
+            ambient=self.ambient,
+            label=label.ljust(MAX_LABEL_LENGTH).decode(),
+        ).encode()
+
+    def is_same_session(self, mode: str, deadline: float) -> bool:
+        """Return True if status is of a session of the mode ending at deadline."""
+        return (
+            self.mode == mode
+            and self.deadline != 0
+            and abs(self.deadline - deadline) <= SAME_SESSION_SLACK
+        )
+
+    def seconds(self, now: float) -> int:
+        """Return seconds left to deadline, or elapsed of stopwatch."""
+        if self.mode == "stopwatch":
+            return max(0, int(now) - self.started)
+        return max(0, self.deadline - int(now))
+
+
+STATUS_LINE_SIZE: int = len(SessionStatus(IDLE_MODE, pid=0).to_line())
+
+
+def write_status(path: Path, status: SessionStatus) -> None:
+    """Replace status file, readers never see a half written line."""
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(status.to_line())
+    tmp_path.replace(path)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _PROCESS_QUERY_LIMITED_INFORMATION: int = 0x1000
+    _ERROR_ACCESS_DENIED: int = 5
+    _STILL_ACTIVE: int = 259
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    def _is_running(pid: int) -> bool:
+        # Signal 0 of os.kill is CTRL_C_EVENT on Windows, process is opened instead
+        handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # Process exists but belongs to someone else
+            return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+        try:
+            exit_code = wintypes.DWORD()
+            _kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            _kernel32.CloseHandle(handle)
+else:
+    def _is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Process exists but belongs to someone else
+            return True
+        return True
+
+
+def read_status(path: Path) -> SessionStatus | None:
+    """Return status of running session, None if app is idle or closed."""
+    try:
+        with path.open("rb") as file:
+            fields = file.read(STATUS_LINE_SIZE).decode().split()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if len(fields) != 7 or fields[0] != str(STATUS_VERSION):  # noqa: PLR2004
+        return None
+    _, pid, mode, started, deadline, ambient, label = fields
+    status = SessionStatus(
+        mode,
+        int(started),
+        int(deadline),
+        ambient=ambient == "1",
+        label=None if label == "-" else label.replace("_", " "),
+        pid=int(pid),
+    )
+    # App that was killed leaves its last status behind
+    if status.is_idle or not _is_running(status.pid):
+        return None
+    return status
+
+
+def format_status(status: SessionStatus | None, now: float) -> str:
+    """Return status as status bars show it, empty when idle."""
+    if status is None:
+        return ""
+    minutes, seconds = divmod(status.seconds(now), 60)
+    label = f"{status.label} " if status.label else ""
+    ambient = " ~" if status.ambient else ""
+    return f"{label}{minutes}:{seconds:02}{ambient}"
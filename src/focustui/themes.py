@@ -0,0 +1,231 @@
+"""User themes and cache of parsed stylesheets.
+
+Theme files in the themes folder define colors of a Textual theme.
+Colors become CSS variables, so switching theme never recomposes
+screens. Textual puts variables into rules while parsing, so rules
+parsed with variables of every theme are cached in memory and on disk,
+keyed by hash of the CSS and the variables.
+
+Example of a theme file:
+    {
+        "name": "forest",
+        "primary": "#4E9F3D",
+        "background": "#191A19",
+        "dark": true,
+        "variables": {"footer-key-foreground": "#D8E9A8"}
+    }
+"""
+import hashlib
+import json
+import pickle
+from importlib.metadata import version
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+from textual.color import Color, ColorParseError
+from textual.css.model import RuleSet
+from textual.css.stylesheet import Stylesheet
+from textual.css.types import CSSLocation
+from textual.theme import Theme
+
+CACHE_DIR_NAME: str = ".cache"
+EXAMPLE_THEME: dict = {
+    "name": "forest",
+    "primary": "#4E9F3D",
+    "secondary": "#1E5128",
+    "background": "#191A19",
+    "dark": True,
+}
+# Pickled rules are valid only for Textual that created them
+TEXTUAL_VERSION: str = version("textual")
+
+
+class ThemeModel(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    name: str | None = None
+    primary: str
+    secondary: str | None = None
+    warning: str | None = None
+    error: str | None = None
+    success: str | None = None
+    accent: str | None = None
+    foreground: str | None = None
+    background: str | None = None
+    surface: str | None = None
+    panel: str | None = None
+    boost: str | None = None
+    dark: bool = True
+    variables: dict[str, str] = {}
+
+    @field_validator(
+        "primary", "secondary", "warning", "error", "success", "accent",
+        "foreground", "background", "surface", "panel", "boost",
+    )
+    @classmethod
+    def validate_color(cls, value: str | None) -> str | None:
+        if value is None:
+            return value
+        try:
+            Color.parse(value)
+        except ColorParseError as error:
+            raise ValueError(str(error)) from None
+        return value
+
+
+def load_themes(path: Path) -> tuple[list[Theme], list[str]]:
+    """Read every theme file in the folder.
+
+    Return themes and errors of files that are not valid.
+    """
+    themes: list[Theme] = []
+    errors: list[str] = []
+    for file_path in sorted(path.glob("*.json")):
+        try:
+            model = ThemeModel.model_validate(json.loads(file_path.read_text()))
+        except (OSError, ValueError, ValidationError) as error:
+            errors.append(f"{file_path.name}: {error}")
+            continue
+        name = model.name or file_path.stem
+        themes.append(Theme(name=name, **model.model_dump(exclude={"name"})))
+    return themes, errors
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class StylesheetCache:
+    """Parsed rules kept in memory and on disk.
+
+    Rules parsed with the same variables share one file,
+    so startup reads only the file of the current theme.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._rules: dict[str, dict[str, list[RuleSet]]] = {}
+        self._dirty: set[str] = set()
+
+    def _file(self, variables_key: str) -> Path:
+        return self.path / f"{variables_key}.pickle"
+
+    def _load(self, variables_key: str) -> dict[str, list[RuleSet]]:
+        if variables_key in self._rules:
+            return self._rules[variables_key]
+        rules = {}
+        if self.path is not None:
+            try:
+                with self._file(variables_key).open("rb") as file:
+                    rules = pickle.load(file)  # noqa: S301
+            except FileNotFoundError:
+                pass
+            except Exception:  # noqa: BLE001
+                # Broken cache is parsed again and overwritten
+                rules = {}
+        self._rules[variables_key] = rules
+        return rules
+
+    def get(self, variables_key: str, key: str) -> list[RuleSet] | None:
+        return self._load(variables_key).get(key)
+
+    def put(self, variables_key: str, key: str, rules: list[RuleSet]) -> None:
+        self._load(variables_key)[key] = rules
+        self._dirty.add(variables_key)
+
+    def save(self) -> None:
+        """Write files of variables with newly parsed rules."""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.mkdir(exist_ok=True)
+            for variables_key in self._dirty:
+                file_path = self._file(variables_key)
+                tmp_path = file_path.with_suffix(".tmp")
+                with tmp_path.open("wb") as file:
+                    rules = self._rules[variables_key]
+                    pickle.dump(rules, file, pickle.HIGHEST_PROTOCOL)
+                tmp_path.replace(file_path)
+        except OSError:
+            # Cache only saves time, app works without it
+            return
+        self._dirty.clear()
+
+
+class CachedStylesheet(Stylesheet):
+    """Stylesheet that never parses the same CSS with the same variables twice.
+
+    Textual clears its own cache every time variables change,
+    this one keeps rules of every theme that was used.
+    """
+
+    def __init__(
+        self,
+        *,
+        variables: dict[str, str] | None = None,
+        cache: StylesheetCache | None = None,
+    ) -> None:
+        super().__init__(variables=variables)
+        self.cache = cache or StylesheetCache()
+        self._variables_key: str | None = None
+
+    @property
+    def variables_key(self) -> str:
+        if self._variables_key is None:
+            variables = json.dumps(self._variables, sort_keys=True)
+            self._variables_key = _hash(TEXTUAL_VERSION, variables)
+        return self._variables_key
+
+    def set_variables(self, variables: dict[str, str]) -> None:
+        super().set_variables(variables)
+        self._variables_key = None
+
+    def _parse_rules(
+        self,
+        css: str,
+        read_from: CSSLocation,
+        is_default_rules: bool = False,  # noqa: FBT002
+        tie_breaker: int = 0,
+        scope: str = "",
+    ) -> list[RuleSet]:
+        key = _hash(css, repr((read_from, is_default_rules, tie_breaker, scope)))
+        rules = self.cache.get(self.variables_key, key)
+        if rules is None:
+            rules = super()._parse_rules(
+                css, read_from, is_default_rules, tie_breaker, scope,
+            )
+            if not any(rule.errors for rule in rules):
+                self.cache.put(self.variables_key, key, rules)
+        return rules
+
+    def parse(self) -> None:
+        super().parse()
+        self.cache.save()
+
+    def copy(self) -> "CachedStylesheet":
+        stylesheet = CachedStylesheet(
+            variables=self._variables.copy(),
+            cache=self.cache,
+        )
+        stylesheet.source = self.source.copy()
+        return stylesheet
+
+    @property
+    def invalid_css(self) -> set[str]:
+        """CSS that failed to parse, it is not parsed again."""
+        return self._invalid_css
+
+    def reparse(self) -> None:
+        """Parse source with new variables, mostly from the cache."""
+        # Parsed in a copy, so invalid CSS doesn't break self
+        stylesheet = CachedStylesheet(variables=self._variables, cache=self.cache)
+        stylesheet.source = self.source.copy()
+        try:
+            stylesheet.parse()
+        except Exception:
+            # Otherwise the same invalid CSS is parsed again before app quits
+            self._invalid_css.update(stylesheet.invalid_css)
+            raise
+        self._rules = stylesheet.rules
+        self._rules_map = None
+        self._require_parse = False
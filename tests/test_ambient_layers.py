@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from focustui.main import MAX_AMBIENT_LAYERS, ConfigManager, ConfigModel
+
+
+@pytest.fixture
+def cm(mocker: MockerFixture, tmp_path: Path) -> ConfigManager:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(ConfigModel().model_dump()))
+    mocker.patch("focustui.main.CONFIG_FILE_PATH", config_path)
+    return ConfigManager()
+
+
+def test_main_ambient_is_first_layer(cm):
+    cm.add_ambient_layer("Rain")
+    cm.update_ambient_layer(0, volume=20)
+    assert cm.get_ambient_layers() == [
+        (cm.config.ambient_name, cm.config.ambient_volume),
+        ("Rain", 20),
+    ]
+
+
+def test_layers_are_saved(cm, tmp_path):
+    cm.add_ambient_layer("Rain")
+    saved = json.loads((tmp_path / "config.json").read_text())
+    assert saved["ambient_layers"] == [{"name": "Rain", "volume": 50}]
+
+
+def test_removed_sound_removes_its_layer(cm):
+    cm.add_ambient_layer("Rain")
+    cm.add_ambient_layer("Cafe")
+    assert cm.is_sound_in_config("Cafe")
+    cm.update_sound_name("Rain", "Storm")
+    cm.update_sound_name("Cafe")
+    assert [layer.name for layer in cm.config.ambient_layers] == ["Storm"]
+
+
+def test_too_many_layers_are_dropped():
+    layers = [{"name": f"Layer{i}"} for i in range(MAX_AMBIENT_LAYERS + 2)]
+    config = ConfigModel.model_validate({"ambient_layers": layers})
+    assert len(config.ambient_layers) == MAX_AMBIENT_LAYERS - 1
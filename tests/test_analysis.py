@@ -0,0 +1,115 @@
+import math
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from focustui.analysis import (
+    LibraryModel,
+    SoundAnalyser,
+    SoundAnalysis,
+    _probe_format,
+    analyse_sound,
+    file_hash,
+    loudness_gain,
+)
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def dummy_audio(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+
+
+def write_sine(path: Path, seconds: float = 2, amplitude: float = 0.5) -> Path:
+    rate = 44100
+    frames = (
+        int(amplitude * 32767 * math.sin(2 * math.pi * 440 * i / rate))
+        for i in range(int(rate * seconds))
+    )
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(struct.pack("<h", frame) for frame in frames))
+    return path
+
+
+def test_file_hash_depends_only_on_content(tmp_path):
+    first = tmp_path / "first.wav"
+    second = tmp_path / "second.wav"
+    first.write_bytes(b"sound")
+    second.write_bytes(b"sound")
+    assert file_hash(first) == file_hash(second)
+    second.write_bytes(b"other")
+    assert file_hash(first) != file_hash(second)
+
+
+def test_probe_wav_format(tmp_path):
+    path = write_sine(tmp_path / "sine.wav", seconds=0.1)
+    assert _probe_format(path) == (1, 44100)
+
+
+def test_probe_unknown_format(tmp_path):
+    path = tmp_path / "sound.mp3"
+    path.write_bytes(b"not a sound")
+    assert _probe_format(path) is None
+
+
+def test_analyse_sine(tmp_path):
+    analysis = analyse_sound(write_sine(tmp_path / "sine.wav"))
+    assert analysis is not None
+    assert analysis.channels == 1
+    assert analysis.sample_rate == 44100
+    assert analysis.duration == pytest.approx(2, abs=0.01)
+    # Sine of amplitude 0.5 peaks at -6 dBFS and its mean square is 0.125
+    assert analysis.peak == pytest.approx(-6.02, abs=0.05)
+    assert analysis.loudness == pytest.approx(-9.72, abs=0.1)
+
+
+def test_analyse_not_decodable_sound(tmp_path):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"version https://git-lfs.github.com/spec/v1")
+    assert analyse_sound(path) is None
+
+
+@pytest.mark.asyncio
+async def test_analyser_caches_by_content(tmp_path):
+    library_path = tmp_path / "library.json"
+    sound = write_sine(tmp_path / "sine.wav", seconds=0.5)
+    analyser = SoundAnalyser(library_path, max_workers=1)
+    try:
+        results = [result async for result in analyser.analyse([sound])]
+    finally:
+        analyser.shutdown()
+    assert results[0][0] == sound
+    assert isinstance(results[0][1], SoundAnalysis)
+
+    library = LibraryModel.model_validate_json(library_path.read_text())
+    assert list(library.analysis.values()) == [results[0][1]]
+
+    # Unchanged file is taken from cache, without starting the pool
+    analyser = SoundAnalyser(library_path)
+    assert analyser.cached(sound) == (True, results[0][1])
+    assert [result async for result in analyser.analyse([sound])] == results
+    assert analyser._pool is None
+
+
+def test_gain_brings_sound_to_normalized_loudness():
+    quiet = SoundAnalysis(
+        duration=1, channels=1, sample_rate=44100, peak=-20, loudness=-30,
+    )
+    assert loudness_gain(quiet) == pytest.approx(10 ** (12 / 20))
+
+
+def test_gain_never_clips_peak():
+    peaky = SoundAnalysis(
+        duration=1, channels=1, sample_rate=44100, peak=-3, loudness=-30,
+    )
+    assert loudness_gain(peaky) == pytest.approx(10 ** (3 / 20))
+
+
+def test_gain_of_not_analysed_sound():
+    assert loudness_gain(None) == 1.0
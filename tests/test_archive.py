@@ -0,0 +1,104 @@
+from array import array
+from datetime import datetime
+
+import pytest
+
+from focustui.archive import (
+    ArchiveColumns,
+    ArchiveError,
+    ArchiveReader,
+    SessionArchive,
+    write_archive,
+)
+from focustui.history import SessionHistory
+
+
+def columns(*rows: tuple[int, int, int, int]) -> ArchiveColumns:
+    starts, ids, lengths, done = zip(*rows, strict=True)
+    return ArchiveColumns(
+        array("I", starts), array("I", ids), array("H", lengths), array("B", done),
+    )
+
+
+def test_archive_is_written_sorted_and_read_back(tmp_path):
+    path = tmp_path / "sessions-2024.bin"
+    write_archive(path, columns((300, 3, 25, 1), (100, 1, 50, 0), (200, 2, 5, 1)))
+
+    reader = ArchiveReader(path)
+    assert list(reader.columns.starts) == [100, 200, 300]
+    assert list(reader.columns.ids) == [1, 2, 3]
+    assert list(reader.columns.lengths) == [50, 5, 25]
+    assert list(reader.columns.done) == [0, 1, 1]
+    assert reader.slice(150, 300) == (1, 2)
+    reader.close()
+
+
+def test_file_that_is_not_archive_raises(tmp_path):
+    path = tmp_path / "sessions-2024.bin"
+    path.write_bytes(b"not an archive")
+    reader = ArchiveReader(path)
+    with pytest.raises(ArchiveError):
+        reader.slice(0, 100)
+
+
+def test_adding_merges_and_skips_archived_sessions(tmp_path):
+    archive = SessionArchive(tmp_path / "archive")
+    archive.add(2024, columns((100, 1, 25, 1), (200, 2, 25, 0)))
+    # Rows archived before a crash can be archived again
+    archive.add(2024, columns((200, 2, 25, 0), (300, 3, 50, 1)))
+
+    assert archive.years() == [2024]
+    assert list(archive.rows(2024, 0, 1000)) == [
+        (100, 25, 1), (200, 25, 0), (300, 50, 1),
+    ]
+    assert list(archive.rows(2024, 150, 300)) == [(200, 25, 0)]
+    assert list(archive.rows(2023, 0, 1000)) == []
+    archive.close()
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = SessionHistory(tmp_path / "focus-tui.db", tmp_path / "archive")
+    history.setup()
+    yield history
+    history.close()
+
+
+def test_old_sessions_are_moved_to_archive_with_rollups(history):
+    history.record(25, 1, datetime(2023, 12, 31, 9, 15))
+    history.record(50, 0, datetime(2024, 1, 2, 9, 40))
+    history.record(25, 1, datetime(2024, 1, 2, 9, 50))
+    history.record(30, 1, datetime(2024, 3, 1, 18))
+
+    assert history.archive_before(datetime(2024, 2, 1)) == 3
+    assert history.archive.years() == [2023, 2024]
+    with history.connect() as con:
+        assert con.execute("SELECT COUNT(*) FROM study_sessions").fetchone() == (1,)
+        assert con.execute(
+            "SELECT * FROM session_rollups ORDER BY day",
+        ).fetchall() == [
+            ("2023-12-31", 9, 1, 1, 25, 25),
+            ("2024-01-02", 9, 2, 1, 75, 25),
+        ]
+        assert history.archived_until(con) == "2024-02-01 00:00:00"
+    assert history.archive_before(datetime(2024, 2, 1)) == 0
+
+
+def test_sessions_read_archive_and_db_transparently(history):
+    history.record(25, 1, datetime(2023, 12, 31, 9, 15))
+    history.record(50, 0, datetime(2024, 1, 2, 9, 40))
+    history.record(30, 1, datetime(2024, 3, 1, 18))
+    expected = list(history.sessions(datetime(2023, 1, 1), datetime(2025, 1, 1)))
+
+    history.archive_before(datetime(2024, 2, 1))
+
+    assert list(
+        history.sessions(datetime(2023, 1, 1), datetime(2025, 1, 1)),
+    ) == expected
+    assert list(history.sessions()) == expected
+    assert [length for _, length, _ in history.sessions(end=datetime(2024, 1, 1))] == [25]
+    assert [
+        length for _, length, _ in history.sessions(
+            datetime(2024, 1, 1), datetime(2024, 2, 1),
+        )
+    ] == [50]
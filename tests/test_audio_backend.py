@@ -0,0 +1,36 @@
+import json
+
+from focustui.audio_backend import (
+    NullBackend,
+    PygameBackend,
+    RecordingBackend,
+    create_backend,
+)
+
+
+def test_create_backend():
+    assert isinstance(create_backend("null"), NullBackend)
+    assert isinstance(create_backend("recording"), RecordingBackend)
+    assert isinstance(create_backend("pygame"), PygameBackend)
+
+
+def test_recording_backend_logs_commands_in_order(tmp_path):
+    log_path = tmp_path / "audio.log"
+    backend = RecordingBackend(log_path)
+    backend.init(2)
+    sound = backend.load(tmp_path / "bell.wav")
+    backend.set_volume(1, 0.5)
+    backend.play(1, sound)
+    assert backend.is_busy(1)
+    backend.stop(1)
+    assert not backend.is_busy(1)
+    backend.close()
+
+    events = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [event["command"] for event in events] == [
+        "init", "load", "set_volume", "play", "stop",
+    ]
+    times = [event["time"] for event in events]
+    assert times == sorted(times)
+    assert events[3]["channel"] == 1
+    assert backend.events == []
@@ -0,0 +1,44 @@
+import threading
+
+from focustui.audio_worker import AudioCommand, AudioWorker
+
+
+def test_commands_run_in_order_on_one_thread():
+    calls: list[tuple[int, int]] = []
+    worker = AudioWorker()
+    for i in range(3):
+        worker.submit("call", lambda i=i: calls.append((i, threading.get_ident())))
+    worker.wait()
+    worker.stop()
+    assert [i for i, _ in calls] == [0, 1, 2]
+    assert len({thread for _, thread in calls}) == 1
+    assert calls[0][1] != threading.get_ident()
+
+
+def test_errors_are_reported_and_worker_keeps_running():
+    done: list[tuple[AudioCommand, BaseException | None]] = []
+    worker = AudioWorker(on_done=lambda command, error: done.append((command, error)))
+
+    def fail() -> None:
+        msg = "no such file"
+        raise FileNotFoundError(msg)
+
+    worker.submit("play_sound", fail)
+    worker.submit("stop_sound", lambda: None)
+    worker.wait()
+    worker.stop()
+    assert [command.name for command, _ in done] == ["play_sound", "stop_sound"]
+    assert isinstance(done[0][1], FileNotFoundError)
+    assert done[1][1] is None
+
+
+def test_stop_finishes_queued_commands():
+    calls: list[int] = []
+    worker = AudioWorker()
+    worker.submit("call", lambda: calls.append(1))
+    worker.stop()
+    assert calls == [1]
+    # Worker starts again on next command
+    worker.submit("call", lambda: calls.append(2))
+    worker.stop()
+    assert calls == [1, 2]
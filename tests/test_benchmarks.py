@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARK = Path(__file__).parent.parent / "benchmarks" / "ui_benchmark.py"
+
+
+def test_ui_benchmark_runs_with_many_sizes(tmp_path):
+    # Sounds of one size must not be left for the next one
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [sys.executable, str(BENCHMARK), "--sizes", "3,5", "--output", str(output)],
+        capture_output=True,
+        check=True,
+        timeout=120,
+    )
+    results = output.read_text()
+    assert "edit_sound.rename[3]" in results
+    assert "edit_sound.rename[5]" in results
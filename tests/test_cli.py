@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from focustui import cli
+from focustui.history import SessionHistory
+from focustui.sound_store import SoundStore
+
+
+def test_stats_prints_json_report(tmp_path, monkeypatch):
+    history = SessionHistory(tmp_path / "focus-tui.db", tmp_path / "archive")
+    history.setup()
+    history.record(25, 1, datetime.now())
+    history.record(50, 0, datetime.now())
+    monkeypatch.setattr(cli, "DB_FILE_PATH", history.db_file)
+    monkeypatch.setattr(cli, "ARCHIVE_PATH", tmp_path / "archive")
+
+    result = CliRunner().invoke(cli.main, ["stats", "--json"])
+    assert result.exit_code == 0
+    report = json.loads(result.output)
+    assert report["today"]["sessions"] == 2
+    assert report["today"]["done_minutes"] == 25
+    assert report["streak"] == {"current": 1, "longest": 1}
+
+
+def test_stats_never_imports_app(tmp_path):
+    code = (
+        "import sys\n"
+        "from focustui.cli import main\n"
+        "main(['stats'], standalone_mode=False)\n"
+        "print(sorted({'textual', 'pygame', 'numpy'} & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={"FOCUSTUI_DATA_DIR": str(tmp_path)},
+        check=True,
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_import_sounds_prints_summary(tmp_path, monkeypatch):
+    folder = tmp_path / "pack"
+    folder.mkdir()
+    (folder / "bell.mp3").write_bytes(b"ID3" + bytes(100))
+    (folder / "broken.ogg").write_bytes(b"not a sound")
+    monkeypatch.setattr(cli, "SOUNDS_PATH", tmp_path / "sounds")
+
+    result = CliRunner().invoke(
+        cli.main, ["import-sounds", str(folder), "--type", "long"],
+    )
+    assert result.exit_code == 0
+    assert f"Skipped: {folder / 'broken.ogg'}" in result.output
+    assert "Imported 1, duplicates 0, skipped 1" in result.output
+    assert dict(SoundStore(tmp_path / "sounds").sounds())["bell"].type == "long"
@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+import focustui.main
+import focustui.paths
+from focustui.assets import NUMBERS_DICT
+from focustui.audio_backend import RecordingBackend
+from focustui.main import (
+    ConfigManager,
+    DatabaseManager,
+    FocusScreen,
+    FocusTUI,
+    SettingsScreen,
+    SoundManager,
+    StatsScreen,
+    setup_app,
+)
+
+
+@pytest.fixture
+def app(mocker: MockerFixture, tmp_path: Path) -> Iterator[FocusTUI]:
+    # Every path of the app folder points to a throwaway one
+    main_dir = focustui.paths.MAIN_DIR_PATH
+    for name, value in vars(focustui.main).items():
+        if isinstance(value, Path) and value.is_relative_to(main_dir):
+            mocker.patch(
+                f"focustui.main.{name}",
+                tmp_path / value.relative_to(main_dir),
+            )
+    setup_app()
+    sm = SoundManager(backend=RecordingBackend())
+    yield FocusTUI(DatabaseManager(), ConfigManager(), sm, analyse_sounds=False)
+    sm.shutdown_audio()
+
+
+def seconds_on_clock(screen: FocusScreen) -> str:
+    clock = screen.query_one(focustui.main.ClockDisplay)
+    return str(clock._ones_sec.render())
+
+
+@pytest.mark.asyncio
+async def test_session_keeps_counting_on_other_screens(app):
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        focus = app.screen
+        app.session.start("0")
+        await pilot.press("ctrl+s")
+        assert isinstance(app.screen, SettingsScreen)
+        await pilot.pause(2.2)
+        await pilot.press("escape")
+        assert app.screen is focus
+        assert app.session.active
+        assert app.session.session_len >= 2
+        last_digit = app.session.display_time()[1][-1]
+        assert seconds_on_clock(focus) == str(NUMBERS_DICT[last_digit])
+
+        await pilot.press("ctrl+t")
+        assert isinstance(app.screen, StatsScreen)
+        app.session.reset()
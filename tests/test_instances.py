@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from focustui.instances import InstanceLock, file_lock, merge_changes
+from focustui.main import ConfigManager, ConfigModel
+
+
+@pytest.fixture
+def cm(mocker: MockerFixture, tmp_path: Path) -> ConfigManager:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(ConfigModel().model_dump()))
+    mocker.patch("focustui.main.CONFIG_FILE_PATH", config_path)
+    return ConfigManager()
+
+
+def test_merge_keeps_changes_of_both_instances():
+    base = {"theme": "nord", "volume": 50, "name": "Rain"}
+    mine = {"theme": "nord", "volume": 80, "name": "Rain"}
+    theirs = {"theme": "forest", "volume": 50, "name": "Rain"}
+    assert merge_changes(base, mine, theirs) == {
+        "theme": "forest", "volume": 80, "name": "Rain",
+    }
+
+
+def test_config_save_merges_other_instance_changes(cm, tmp_path):
+    # Other instance changes theme after this one read the config
+    config_path = tmp_path / "config.json"
+    saved = json.loads(config_path.read_text())
+    saved["theme"] = "nord"
+    config_path.write_text(json.dumps(saved))
+
+    cm.set_crossfade_ambient(True)
+    assert cm.get_theme() == "nord"
+    saved = json.loads(config_path.read_text())
+    assert saved["theme"] == "nord"
+    assert saved["crossfade_ambient"] is True
+
+
+def test_setting_keeps_value_merged_from_other_instance(cm, tmp_path):
+    config_path = tmp_path / "config.json"
+    saved = json.loads(config_path.read_text())
+    saved["normalize_loudness"] = True
+    config_path.write_text(json.dumps(saved))
+    saved_configs = []
+    cm.subscribe(lambda: saved_configs.append(cm.config.model_copy()))
+
+    cm.set_crossfade_ambient(True)
+    assert saved_configs[-1].normalize_loudness is True
+    # Checkbox sets the value it shows, so merged value is not flipped back
+    cm.set_normalize_loudness(True)
+    assert cm.get_normalize_loudness() is True
+    assert json.loads(config_path.read_text())["normalize_loudness"] is True
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = tmp_path / "config.json"
+    order: list[str] = []
+
+    def other_instance() -> None:
+        with file_lock(path):
+            order.append("other")
+
+    with file_lock(path):
+        thread = threading.Thread(target=other_instance)
+        thread.start()
+        time.sleep(0.05)
+        order.append("first")
+    thread.join()
+    assert order == ["first", "other"]
+
+
+def test_only_one_instance_is_leader(tmp_path):
+    path = tmp_path / "instance.lock"
+    leader = InstanceLock(path)
+    follower = InstanceLock(path)
+    assert leader.try_acquire()
+    assert not follower.try_acquire()
+    assert not follower.is_leader
+    leader.release()
+    assert follower.try_acquire()
+    follower.release()
@@ -0,0 +1,71 @@
+from pytest_mock.plugin import MockerFixture
+
+from focustui.journal import (
+    CHECKPOINTS_PER_FSYNC,
+    SessionJournal,
+    UnfinishedSession,
+    read_unfinished,
+)
+
+
+def test_unfinished_session_is_read_with_last_checkpoint(tmp_path):
+    path = tmp_path / "session.journal"
+    journal = SessionJournal(path)
+    journal.start("timer", 3000, started=100.0)
+    journal.checkpoint(60)
+    journal.checkpoint(120)
+    journal.close()
+
+    unfinished = read_unfinished(path)
+    assert unfinished.mode == "timer"
+    assert unfinished.elapsed == 120
+    assert unfinished.remaining(now=400.0) == 2700
+    assert unfinished.remaining(now=4000.0) == 0
+
+
+def test_ended_session_is_not_unfinished(tmp_path):
+    path = tmp_path / "session.journal"
+    journal = SessionJournal(path)
+    journal.start("stopwatch", 0)
+    journal.end("successful", 600)
+    assert read_unfinished(path) is None
+    assert read_unfinished(tmp_path / "missing.journal") is None
+
+
+def test_new_session_drops_previous_journal(tmp_path):
+    path = tmp_path / "session.journal"
+    journal = SessionJournal(path)
+    journal.start("timer", 3000)
+    journal.checkpoint(60)
+    journal.start("queue", 600, queue="Pomodoro")
+    journal.close()
+
+    unfinished = read_unfinished(path)
+    assert unfinished.mode == "queue"
+    assert unfinished.queue == "Pomodoro"
+    assert unfinished.elapsed == 0
+
+
+def test_cut_off_record_is_ignored(tmp_path):
+    path = tmp_path / "session.journal"
+    journal = SessionJournal(path)
+    journal.start("timer", 3000)
+    journal.checkpoint(60)
+    journal.close()
+    with path.open("a") as file:
+        file.write('{"type": "end", "res')
+
+    assert isinstance(read_unfinished(path), UnfinishedSession)
+
+
+def test_checkpoints_are_synced_in_batches(mocker: MockerFixture, tmp_path):
+    fsync = mocker.patch("focustui.journal.os.fsync")
+    journal = SessionJournal(tmp_path / "session.journal")
+    journal.start("stopwatch", 0)
+    assert fsync.call_count == 1
+    for minute in range(1, CHECKPOINTS_PER_FSYNC * 2):
+        journal.checkpoint(minute * 60)
+    # Fifth checkpoint syncs the batch
+    assert fsync.call_count == 2
+    journal.end("killed", 600)
+    assert fsync.call_count == 3
@@ -0,0 +1,47 @@
+import os
+import wave
+
+import pytest
+
+from focustui.loops import build_loop, crossfade_loop, is_loop_fresh, loop_path
+from tests.test_analysis import write_sine
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def dummy_audio(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+
+
+def test_crossfade_wraps_without_seam():
+    samples = np.arange(1000, dtype=np.int16).reshape(-1, 1) * np.ones(2, np.int16)
+    loop = crossfade_loop(samples, 100)
+    assert loop.shape == (900, 2)
+    # Blend starts at the tail and ends at the head,
+    # so after last frame playback continues with frame 100 of the sound
+    assert tuple(loop[-100]) == tuple(samples[-100])
+    assert abs(int(loop[-1][0]) - int(samples[99][0])) <= 1
+    assert tuple(loop[0]) == tuple(samples[100])
+
+
+def test_crossfade_keeps_samples_in_range():
+    samples = np.full((100, 2), 32767, dtype=np.int16)
+    loop = crossfade_loop(samples, 10)
+    assert loop.dtype == np.int16
+    assert loop.max() == 32767
+
+
+def test_build_loop(tmp_path):
+    sound = write_sine(tmp_path / "rain.wav", seconds=1)
+    assert not is_loop_fresh(sound)
+    assert build_loop(sound)
+    assert is_loop_fresh(sound)
+    with wave.open(str(loop_path(sound))) as wav:
+        # Crossfade takes at most a quarter of the sound
+        assert wav.getnframes() == 44100 * 3 // 4
+
+    # Modified sound needs a new loop
+    stat = loop_path(sound).stat()
+    os.utime(sound, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert not is_loop_fresh(sound)
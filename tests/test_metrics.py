@@ -0,0 +1,49 @@
+from focustui.metrics import Histogram, Metrics
+
+
+def test_disabled_metrics_do_not_record():
+    metrics = Metrics()
+    metrics.increment("config.save")
+    metrics.observe("clock.update_ms", 1)
+    with metrics.timer("sound.play_ms"):
+        pass
+    assert metrics.to_dict() == {"counters": {}, "histograms": {}}
+
+
+def test_enabled_metrics_record_timer():
+    metrics = Metrics()
+    metrics.enabled = True
+    with metrics.timer("sound.play_ms"):
+        pass
+    assert metrics.histograms["sound.play_ms"].count == 1
+
+
+def test_counter_increment():
+    metrics = Metrics()
+    metrics.enabled = True
+    metrics.increment("config.save")
+    metrics.increment("config.save", 2)
+    assert metrics.counters["config.save"] == 3
+
+
+def test_histogram_stats():
+    histogram = Histogram()
+    for value in (1, 2, 3, 4):
+        histogram.observe(value)
+    assert histogram.count == 4
+    assert histogram.mean == 2.5
+    assert histogram.min == 1
+    assert histogram.max == 4
+
+
+def test_histogram_percentile_is_bucket_bound():
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.observe(0.2)
+    histogram.observe(700)
+    assert histogram.percentile(50) == 0.25
+    assert histogram.percentile(100) == 700
+
+
+def test_empty_histogram_percentile():
+    assert Histogram().percentile(95) == 0.0
@@ -0,0 +1,53 @@
+import pytest
+
+from focustui.audio_backend import RecordingBackend
+from focustui.mixer import ChannelPool
+
+
+@pytest.fixture
+def backend() -> RecordingBackend:
+    return RecordingBackend()
+
+
+@pytest.fixture
+def pool(backend: RecordingBackend) -> ChannelPool:
+    return ChannelPool(backend, layers=2, shorts=2)
+
+
+def play(pool: ChannelPool, backend: RecordingBackend, sound_type: str) -> int | None:
+    channel = pool.short_channel(sound_type)
+    if channel is not None:
+        backend.play(channel, sound_type)
+    return channel
+
+
+def test_layers_and_shorts_use_separate_channels(pool, backend):
+    assert backend.events[0]["channels"] == 4
+    assert pool.layers == [0, 1]
+    assert play(pool, backend, "test") not in pool.layers
+
+
+def test_idle_channel_is_used_first(pool, backend):
+    alarm = play(pool, backend, "alarm")
+    test = play(pool, backend, "test")
+    assert test != alarm
+    assert backend.is_busy(alarm)
+
+
+def test_test_sound_never_cuts_off_alarm(pool, backend):
+    play(pool, backend, "alarm")
+    play(pool, backend, "alarm")
+    assert play(pool, backend, "test") is None
+
+
+def test_alarm_cuts_off_test_sound(pool, backend):
+    play(pool, backend, "alarm")
+    test = play(pool, backend, "test")
+    assert play(pool, backend, "alarm") == test
+    assert {"command": "stop", "channel": test}.items() <= backend.events[-2].items()
+
+
+def test_sound_replaces_sound_of_same_priority(pool, backend):
+    play(pool, backend, "test")
+    play(pool, backend, "test")
+    assert play(pool, backend, "test") is not None
@@ -0,0 +1,46 @@
+import json
+
+from focustui.profiler import StartupProfiler
+
+
+def test_disabled_profiler_does_not_record():
+    profiler = StartupProfiler()
+    with profiler.phase("setup_app"):
+        pass
+    assert profiler.to_dict() == {}
+
+
+def test_enabled_profiler_records_phase():
+    profiler = StartupProfiler()
+    profiler.enable()
+    with profiler.phase("setup_app"):
+        pass
+    assert profiler.to_dict()["setup_app"]["calls"] == 1
+
+
+def test_phases_accumulate():
+    profiler = StartupProfiler()
+    profiler.record("css", 0.5, 0.25)
+    profiler.record("css", 0.5, 0.25)
+    assert profiler.to_dict()["css"] == {"wall_ms": 1000, "cpu_ms": 500, "calls": 2}
+
+
+def test_report_sorted_from_slowest():
+    profiler = StartupProfiler()
+    profiler.record("fast", 0.1, 0.1)
+    profiler.record("slow", 0.2, 0.1)
+    assert list(profiler.to_dict()) == ["slow", "fast"]
+
+
+def test_stop_without_start_is_ignored():
+    profiler = StartupProfiler()
+    profiler.stop("focus_screen.first_paint")
+    assert profiler.to_dict() == {}
+
+
+def test_dump_json(tmp_path):
+    profiler = StartupProfiler()
+    profiler.record("setup_app", 0.001, 0.001)
+    path = tmp_path / "startup.json"
+    profiler.dump_json(path)
+    assert "setup_app" in json.loads(path.read_text())["phases"]
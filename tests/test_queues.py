@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from focustui.queues import EXAMPLE_QUEUE, QueueModel, compile_queue, load_queues
+
+
+def test_compile_unrolls_repeats():
+    queue = QueueModel.model_validate({
+        "repeat": 2,
+        "segments": [
+            {"kind": "focus", "minutes": 50, "ambient": "Rain"},
+            {"kind": "break", "minutes": 10, "signal": "Bell"},
+        ],
+    })
+    schedule = compile_queue("deep", queue)
+    assert schedule.name == "deep"
+    assert len(schedule) == 4
+    assert [(s.start, s.end) for s in schedule.segments] == [
+        (0, 3000), (3000, 3600), (3600, 6600), (6600, 7200),
+    ]
+    assert [s.label for s in schedule.segments] == [
+        "Focus 1/2", "Break 1/2", "Focus 2/2", "Break 2/2",
+    ]
+    assert schedule.segments[0].ambient == "Rain"
+    assert schedule.segments[3].signal == "Bell"
+    assert schedule.length == 7200
+
+
+def test_segment_at():
+    queue = QueueModel.model_validate(EXAMPLE_QUEUE)
+    schedule = compile_queue("pomodoro", queue, minute=1)
+    assert schedule.segment_at(0) == 0
+    assert schedule.segment_at(24) == 0
+    assert schedule.segment_at(25) == 1
+    assert schedule.segment_at(schedule.length) == len(schedule) - 1
+
+
+def test_queue_needs_segments():
+    with pytest.raises(ValidationError):
+        QueueModel.model_validate({"segments": []})
+    with pytest.raises(ValidationError):
+        QueueModel.model_validate({"segments": [{"minutes": 0}]})
+
+
+def test_load_queues_skips_invalid_files(tmp_path):
+    (tmp_path / "pomodoro.json").write_text(json.dumps(EXAMPLE_QUEUE))
+    (tmp_path / "short.json").write_text(json.dumps({"segments": [{"minutes": 5}]}))
+    (tmp_path / "broken.json").write_text("{")
+    (tmp_path / "notes.txt").write_text("not a queue")
+
+    schedules, errors = load_queues(tmp_path, minute=1)
+    assert sorted(schedules) == ["Pomodoro", "short"]
+    assert schedules["short"].length == 5
+    assert len(errors) == 1
+    assert errors[0].startswith("broken.json")
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from focustui.session_store import SessionStore
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def store(request):
+    store = SessionStore(vectorized=request.param)
+    for date, length, done in (
+        (datetime(2024, 5, 1, 9, 15), 25, 1),
+        (datetime(2024, 5, 1, 9, 45), 50, 0),
+        (datetime(2024, 5, 2, 14), 30, 1),
+        (datetime(2024, 5, 4, 9), 60, 1),
+        (datetime(2024, 5, 5, 23, 59), 10, 1),
+        (datetime(2024, 5, 6, 8), 40, 1),
+    ):
+        store.add(date.timestamp(), length, done)
+    return store
+
+
+def test_store_is_compact(store):
+    assert len(store) == 6
+    assert store.nbytes == 6 * 11
+
+
+def test_late_session_is_kept_in_order(store):
+    store.add(datetime(2024, 5, 3, 12).timestamp(), 15, 1)
+    assert store.daily_minutes(datetime(2024, 5, 1), datetime(2024, 5, 7)) == [
+        25, 30, 15, 60, 10, 40,
+    ]
+
+
+def test_totals_of_range(store):
+    assert store.totals(datetime(2024, 5, 1), datetime(2024, 5, 2)) == (2, 1, 75, 25)
+    assert store.totals(datetime(2024, 6, 1), datetime(2024, 7, 1)) == (0, 0, 0, 0)
+
+
+def test_hour_distribution(store):
+    hours = store.hour_distribution(datetime(2024, 5, 1), datetime(2024, 6, 1))
+    assert len(hours) == 24
+    assert hours[9] == 85
+    assert hours[23] == 10
+    assert sum(hours) == 165
+
+
+def test_daily_minutes_and_moving_average(store):
+    start, end = datetime(2024, 5, 1), datetime(2024, 5, 5)
+    assert store.daily_minutes(start, end) == [25, 30, 0, 60]
+    assert store.moving_average(start, end, 2) == [12.5, 27.5, 15.0, 30.0]
+
+
+def test_streaks(store):
+    assert store.streaks(datetime(2024, 5, 6, 20)) == (3, 3)
+    # Streak lasts until the day without sessions is over
+    assert store.streaks(datetime(2024, 5, 7, 8)) == (3, 3)
+    assert store.streaks(datetime(2024, 5, 8, 8)) == (0, 3)
+    assert SessionStore().streaks(datetime(2024, 5, 6)) == (0, 0)
+
+
+def test_rollups_are_counted_with_sessions(store):
+    store.rollups.extend([
+        (datetime(2024, 4, 29, 9), 2, 1, 50, 25),
+        (datetime(2024, 4, 30, 14), 1, 1, 30, 30),
+    ])
+    assert store.totals(datetime(2024, 4, 29), datetime(2024, 5, 2)) == (
+        5, 3, 155, 80,
+    )
+    assert store.totals(datetime(2024, 4, 30), datetime(2024, 5, 1)) == (
+        1, 1, 30, 30,
+    )
+    hours = store.hour_distribution(datetime(2024, 4, 1), datetime(2024, 6, 1))
+    assert hours[9] == 110
+    assert hours[14] == 60
+    assert store.daily_minutes(datetime(2024, 4, 29), datetime(2024, 5, 2)) == [
+        25, 30, 25,
+    ]
+    assert store.streaks(datetime(2024, 5, 2, 20)) == (4, 4)
@@ -0,0 +1,26 @@
+from focustui.main import next_signal_at
+
+
+def test_timer_signals_every_interval_but_not_at_its_end():
+    offsets = []
+    elapsed = 0
+    while (elapsed := next_signal_at(elapsed, 1500, 300, halfway=False)) is not None:
+        offsets.append(elapsed)
+    assert offsets == [300, 600, 900, 1200]
+
+
+def test_halfway_signal_is_merged_with_interval():
+    assert next_signal_at(0, 1500, 0, halfway=True) == 750
+    assert next_signal_at(750, 1500, 0, halfway=True) is None
+    assert next_signal_at(600, 1500, 300, halfway=True) == 750
+    assert next_signal_at(0, 1200, 600, halfway=True) == 600
+    assert next_signal_at(600, 1200, 600, halfway=True) is None
+
+
+def test_stopwatch_signals_only_every_interval():
+    assert next_signal_at(0, 0, 0, halfway=True) is None
+    assert next_signal_at(9000, 0, 600, halfway=True) == 9600
+
+
+def test_resumed_session_signals_after_elapsed():
+    assert next_signal_at(301, 1500, 300, halfway=False) == 600
@@ -0,0 +1,126 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from focustui.audio_backend import RecordingBackend
+from focustui.loops import loop_path
+from focustui.main import SoundChange, SoundManager
+
+
+@pytest.fixture
+def sm(mocker: MockerFixture, tmp_path: Path) -> Iterator[SoundManager]:
+    shorts = tmp_path / "shorts"
+    longs = tmp_path / "longs"
+    shorts.mkdir()
+    longs.mkdir()
+    (shorts / "bell.wav").touch()
+    mocker.patch("focustui.main.SOUNDS_PATH", tmp_path)
+    mocker.patch("focustui.main.SHORTS_PATH", shorts)
+    mocker.patch("focustui.main.LONGS_PATH", longs)
+    mocker.patch("focustui.main.LIBRARY_FILE_PATH", tmp_path / "library.json")
+    sm = SoundManager(backend=RecordingBackend())
+    yield sm
+    sm.shutdown_audio()
+
+
+@pytest.fixture
+def changes(sm: SoundManager) -> list[SoundChange]:
+    changes: list[SoundChange] = []
+    sm.subscribe(changes.append)
+    return changes
+
+
+def test_rename_emits_change(sm, changes):
+    sm.rename_sound("bell", "gong")
+    assert len(changes) == 1
+    assert changes[0].change_type == "renamed"
+    assert changes[0].name == "gong"
+    assert changes[0].old_name == "bell"
+    assert changes[0].length_type == "short"
+
+
+def test_remove_emits_change(sm, changes):
+    sm.remove_sound("bell", "short")
+    assert changes[0].change_type == "removed"
+    assert changes[0].name == "bell"
+
+
+def test_add_emits_change(sm, changes, tmp_path):
+    source = tmp_path / "rain.wav"
+    source.touch()
+    sm.add_sound(source, "rain", "long")
+    assert changes[0].change_type == "added"
+    assert changes[0].length_type == "long"
+
+
+def test_unsubscribed_listener_is_not_called(sm, changes):
+    sm.unsubscribe(changes.append)
+    sm.remove_sound("bell", "short")
+    assert changes == []
+
+
+def test_search_follows_rename(sm):
+    sm.rename_sound("bell", "gong")
+    assert sm.search_sounds("bel") == []
+    assert sm.search_sounds("gon") == ["gong"]
+
+
+def test_search_filters_length_type(sm):
+    assert sm.search_sounds("bell", "long") == []
+    assert sm.search_sounds("bell", "short") == ["bell"]
+
+
+def test_normalized_volume_uses_gain(sm):
+    sound = sm.get_any_sound("bell")
+    sound.gain = 0.5
+
+    def played_volume() -> float:
+        sm.play_sound("bell", 80)
+        sm.wait_audio()
+        events = sm._backend.events
+        return next(e["volume"] for e in reversed(events) if e["command"] == "set_volume")
+
+    assert played_volume() == 0.8
+    sm.normalize_loudness = True
+    assert played_volume() == 0.4
+    # Channel volume is capped at 1
+    sound.gain = 4
+    assert played_volume() == 1.0
+
+
+def test_rename_keeps_file_and_remove_drops_loop_with_it(sm):
+    path = sm.get_any_sound("bell").path
+    loop = loop_path(path)
+    loop.parent.mkdir()
+    loop.touch()
+    sm.rename_sound("bell", "gong")
+    assert sm.get_any_sound("gong").path == path
+    assert loop.exists()
+    sm.remove_sound("gong", "short")
+    assert not path.exists()
+    assert not loop.exists()
+
+
+def test_same_file_is_stored_once(sm, tmp_path):
+    source = tmp_path / "rain.wav"
+    source.write_bytes(b"rain")
+    assert sm.add_sound(source, "rain", "long") == []
+    assert sm.add_sound(source, "storm", "long") == ["rain"]
+    path = sm.get_any_sound("rain").path
+    assert sm.get_any_sound("storm").path == path
+    sm.remove_sound("rain", "long")
+    assert path.exists()
+    sm.remove_sound("storm", "long")
+    assert not path.exists()
+
+
+def test_preloaded_ambient_is_not_decoded_again(sm):
+    sm.preload_ambient("bell")
+    sm.wait_audio()
+    loads = len([e for e in sm._backend.events if e["command"] == "load"])
+    sm.play_ambient_in_background([("bell", 50)])
+    sm.wait_audio()
+    assert len([e for e in sm._backend.events if e["command"] == "load"]) == loads
+    assert sm._backend.events[-1]["command"] == "play"
@@ -0,0 +1,67 @@
+import pytest
+
+from focustui.sound_index import SoundIndex
+
+
+@pytest.fixture
+def index() -> SoundIndex:
+    index = SoundIndex()
+    index.add("Acid_Bassline", "short")
+    index.add("Braam", "short")
+    index.add("Landing_Forcefield", "short")
+    index.add("Woodpecker_Forest", "long")
+    index.add("Mexican_Forest", "long")
+    return index
+
+
+def test_empty_query_returns_sorted_names(index):
+    assert index.search("", limit=2) == ["Acid_Bassline", "Braam"]
+
+
+def test_empty_query_filtered_by_type(index):
+    assert index.search("", "long") == ["Mexican_Forest", "Woodpecker_Forest"]
+
+
+def test_prefix_match(index):
+    assert index.search("bra") == ["Braam"]
+
+
+def test_query_is_case_insensitive(index):
+    assert index.search("BRA") == ["Braam"]
+
+
+def test_substring_match(index):
+    assert index.search("ass") == ["Acid_Bassline"]
+
+
+def test_word_prefix_ranked_before_fuzzy(index):
+    assert index.search("fore")[:2] == ["Mexican_Forest", "Woodpecker_Forest"]
+
+
+def test_typo_match(index):
+    assert "Mexican_Forest" in index.search("forst")
+
+
+def test_type_filter(index):
+    assert index.search("forest", "short") == []
+
+
+def test_limit(index):
+    assert len(index.search("", limit=3)) == 3
+
+
+def test_remove(index):
+    index.remove("Braam")
+    assert index.search("bra") == []
+    assert "Braam" not in index
+    assert len(index) == 4
+
+
+def test_remove_missing_is_ignored(index):
+    index.remove("Missing")
+    assert len(index) == 5
+
+
+def test_rename_keeps_type(index):
+    index.rename("Braam", "Gong")
+    assert index.search("gon", "short") == ["Gong"]
@@ -0,0 +1,171 @@
+import wave
+from pathlib import Path
+
+import pytest
+
+from focustui.analysis import file_hash, probe_sound
+from focustui.sound_store import SoundStore, copy_hashed, soundify, walk_sounds
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SoundStore:
+    return SoundStore(tmp_path / "sounds")
+
+
+def write(path: Path, content: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def write_wav(path: Path, frames: bytes = b"\x00\x00" * 100) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(44100)
+        wav.writeframes(frames)
+    return path
+
+
+def test_copy_is_hashed_while_copied(tmp_path):
+    source = write(tmp_path / "rain.ogg", bytes(range(256)) * 10_000)
+    target = tmp_path / "copy.ogg"
+    assert copy_hashed(source, target) == file_hash(source)
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_blob_is_named_by_content(store, tmp_path):
+    source = write(tmp_path / "Rain.FLAC", b"rain")
+    assert store.add(source, "rain", "long")
+    path = store.path_of("rain")
+    assert path.name == file_hash(source) + ".flac"
+    assert path.read_bytes() == b"rain"
+    assert source.exists()
+
+
+def test_same_content_is_stored_once(store, tmp_path):
+    assert store.add(write(tmp_path / "a.wav", b"bell"), "bell", "short")
+    assert not store.add(write(tmp_path / "b.ogg", b"bell"), "gong", "long")
+    assert store.path_of("bell") == store.path_of("gong")
+    assert store.names_of("gong") == ["bell"]
+    assert len(list(store.blobs_path.iterdir())) == 1
+
+
+def test_rename_only_changes_index(store, tmp_path):
+    store.add(write(tmp_path / "a.wav", b"bell"), "bell", "short")
+    path = store.path_of("bell")
+    mtime = path.stat().st_mtime_ns
+    store.rename("bell", "gong")
+    assert "bell" not in store
+    assert store.path_of("gong") == path
+    assert path.stat().st_mtime_ns == mtime
+    assert "gong" in SoundStore(store.index_path.parent)
+
+
+def test_blob_is_removed_with_last_name(store, tmp_path):
+    store.add(write(tmp_path / "a.wav", b"bell"), "bell", "short")
+    store.add(write(tmp_path / "b.wav", b"bell"), "gong", "short")
+    path = store.path_of("bell")
+    assert not store.remove("bell")
+    assert path.exists()
+    assert store.remove("gong")
+    assert not path.exists()
+
+
+def test_changes_of_other_instance_are_kept(store, tmp_path):
+    other = SoundStore(store.index_path.parent)
+    store.add(write(tmp_path / "a.wav", b"bell"), "bell", "short")
+    other.add(write(tmp_path / "b.wav", b"rain"), "rain", "long")
+    store.rename("bell", "gong")
+    assert dict(SoundStore(store.index_path.parent).sounds()).keys() == {
+        "gong", "rain",
+    }
+
+
+def test_files_in_folder_are_adopted(store, tmp_path):
+    shorts = tmp_path / "shorts"
+    write(shorts / "bell.wav", b"bell")
+    write(shorts / "notes.txt", b"")
+    store.add(write(tmp_path / "other.wav", b"other"), "gong", "short")
+    write(shorts / "gong.wav", b"gong")
+    assert sorted(store.adopt(shorts, "short")) == ["bell", "gong_2"]
+    assert [path.name for path in shorts.iterdir()] == ["notes.txt"]
+    assert store.path_of("gong_2").read_bytes() == b"gong"
+    # Same file put in folder again is only removed
+    write(shorts / "bell.wav", b"bell")
+    assert store.adopt(shorts, "short") == []
+    assert not (shorts / "bell.wav").exists()
+    assert store.adopt(tmp_path / "missing", "long") == []
+
+
+def test_probe_reads_only_header(tmp_path):
+    assert probe_sound(write_wav(tmp_path / "a.wav"))
+    assert probe_sound(write(tmp_path / "a.mp3", b"ID3\x04" + bytes(100)))
+    assert probe_sound(write(tmp_path / "b.mp3", b"\xff\xfb\x90\x00"))
+    assert not probe_sound(write(tmp_path / "c.mp3", b"not a sound"))
+    assert not probe_sound(write(tmp_path / "d.flac", b"version https://git-lfs"))
+
+
+def test_walk_finds_sounds_of_tree(tmp_path):
+    write(tmp_path / "pack" / "b.wav", b"")
+    write(tmp_path / "pack" / "deep" / "c.OGG", b"")
+    write(tmp_path / "pack" / ".hidden" / "d.wav", b"")
+    write(tmp_path / "pack" / "notes.txt", b"")
+    write(tmp_path / "a.flac", b"")
+    assert [path.relative_to(tmp_path).as_posix() for path in walk_sounds(tmp_path)] == [
+        "a.flac", "pack/b.wav", "pack/deep/c.OGG",
+    ]
+
+
+def test_folder_is_imported_with_summary(store, tmp_path):
+    pack = tmp_path / "Rain Pack"
+    store.add(write_wav(tmp_path / "old.wav", b"\x01\x00" * 100), "Light_rain", "long")
+    write_wav(pack / "Light rain.wav")
+    write_wav(pack / "storms" / "Thunder.wav", b"\x02\x00" * 100)
+    # Same content as light rain and as sound stored before
+    write_wav(pack / "storms" / "Copy.wav")
+    write_wav(pack / "Old.wav", b"\x01\x00" * 100)
+    write(pack / "broken.wav", b"RIFF")
+
+    summary = store.import_files(walk_sounds(pack), "long", max_workers=4)
+    assert sorted(summary.imported) == ["Light_rain_2", "Thunder"]
+    assert sorted(path.name for path in summary.duplicates) == ["Copy.wav", "Old.wav"]
+    assert [path.name for path in summary.skipped] == ["broken.wav"]
+    assert summary.describe() == "Imported 2, duplicates 2, skipped 1"
+    assert sorted(path.suffix for path in store.blobs_path.iterdir()) == [".wav"] * 3
+    assert store.index.sounds["Thunder"].type == "long"
+
+
+def test_walk_is_read_as_copies_finish(store, tmp_path):
+    sources = [write_wav(tmp_path / "pack" / f"rain{i:02}.wav") for i in range(20)]
+    temps = []
+
+    def walk():
+        for path in sources:
+            temps.append(len(list(store.blobs_path.glob("*.tmp"))))
+            yield path
+
+    summary = store.import_files(walk(), "long", max_workers=2)
+    assert summary.describe() == "Imported 1, duplicates 19, skipped 0"
+    # Duplicates are removed once hashed, only window of copies waits
+    assert max(temps) <= 5
+    assert [path.suffix for path in store.blobs_path.iterdir()] == [".wav"]
+
+
+def test_file_that_cant_be_copied_is_skipped(store, tmp_path, monkeypatch):
+    missing = tmp_path / "gone.wav"
+    full = write_wav(tmp_path / "full.wav")
+
+    def copy_until_full(source, target):
+        target.write_bytes(b"RIFF")
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("focustui.sound_store.copy_hashed", copy_until_full)
+    summary = store.import_files([missing, full], "short", max_workers=2)
+    assert summary.skipped == [missing, full]
+    assert not list(store.blobs_path.iterdir())
+
+
+def test_soundify_replaces_other_characters():
+    assert soundify("Rain & Thunder (live)") == "Rain___Thunder__live_"
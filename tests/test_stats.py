@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from focustui.history import SessionHistory
+from focustui.session_store import SessionStore
+from focustui.stats import StatsEngine, Totals, range_bounds
+
+NOW = datetime(2024, 5, 8, 20)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = SessionHistory(tmp_path / "focus-tui.db", tmp_path / "archive")
+    history.setup()
+    for date, length, done in (
+        (datetime(2023, 12, 31, 9), 25, 1),
+        (datetime(2024, 5, 6, 9), 50, 1),
+        (datetime(2024, 5, 7, 9, 30), 25, 0),
+        (datetime(2024, 5, 7, 14), 30, 1),
+        (datetime(2024, 5, 8, 14), 60, 1),
+    ):
+        history.record(length, done, date)
+    yield history
+    history.close()
+
+
+def test_range_bounds():
+    assert range_bounds("today", NOW) == (datetime(2024, 5, 8), datetime(2024, 5, 9))
+    assert range_bounds("week", NOW) == (datetime(2024, 5, 6), datetime(2024, 5, 13))
+    assert range_bounds("month", NOW) == (datetime(2024, 5, 1), datetime(2024, 6, 1))
+    assert range_bounds("year", NOW) == (datetime(2024, 1, 1), datetime(2025, 1, 1))
+    assert range_bounds("all", NOW) == (datetime(1970, 1, 1), datetime(2024, 5, 9))
+
+
+def test_queries(history):
+    stats = StatsEngine(history)
+    assert stats.totals("today", NOW) == Totals(1, 1, 60, 60)
+    assert stats.totals("week", NOW) == Totals(4, 3, 165, 140)
+    assert stats.completion_rate("week", NOW) == 0.75
+    assert stats.totals("all", NOW).sessions == 5
+    assert stats.streaks(NOW) == (3, 3)
+    assert stats.best_hours("month", NOW) == [(14, 90), (9, 50)]
+    assert stats.best_hours("month", NOW, count=1) == [(14, 90)]
+
+
+def test_results_are_memoized(history, mocker: MockerFixture):
+    stats = StatsEngine(history)
+    totals = mocker.spy(SessionStore, "totals")
+    stats.totals("week", NOW)
+    stats.totals("week", NOW)
+    stats.totals("year", NOW)
+    assert totals.call_count == 2
+
+
+def test_recording_invalidates_only_ranges_that_contain_session(
+    history,
+    mocker: MockerFixture,
+):
+    stats = StatsEngine(history)
+    stats.totals("week", NOW)
+    stats.totals_between(datetime(2023, 1, 1), datetime(2024, 1, 1))
+    totals = mocker.spy(SessionStore, "totals")
+
+    history.record(40, 1, datetime(2024, 5, 8, 18))
+    stats.record(datetime(2024, 5, 8, 18), 40, 1)
+    assert stats.totals("week", NOW) == Totals(5, 4, 205, 180)
+    last_year = stats.totals_between(datetime(2023, 1, 1), datetime(2024, 1, 1))
+    assert last_year.sessions == 1
+    assert totals.call_count == 1
+
+
+def test_sessions_of_other_instance_are_loaded(
+    history,
+    tmp_path,
+    mocker: MockerFixture,
+):
+    stats = StatsEngine(history)
+    assert stats.totals("today", NOW) == Totals(1, 1, 60, 60)
+    load = mocker.spy(history, "statistics_rows")
+
+    other = SessionHistory(history.db_file, tmp_path / "archive")
+    other.record(40, 1, datetime(2024, 5, 8, 18))
+    assert stats.totals("today", NOW) == Totals(2, 2, 100, 100)
+    assert stats.totals("today", NOW).sessions == 2
+    other.archive_before(datetime(2024, 5, 7))
+    assert stats.totals("week", NOW).sessions == 5
+    assert load.call_count == 1
+
+
+def test_archived_sessions_are_counted(history):
+    history.archive_before(datetime(2024, 5, 7))
+    stats = StatsEngine(history)
+    assert stats.totals("all", NOW) == Totals(5, 4, 190, 165)
+    assert stats.streaks(NOW) == (3, 3)
+
+
+def test_archived_sessions_are_counted_from_rollups(
+    history,
+    mocker: MockerFixture,
+):
+    history.archive_before(datetime(2024, 5, 7))
+    rows = mocker.spy(history.archive, "rows")
+    stats = StatsEngine(history)
+    assert stats.totals("week", NOW) == Totals(4, 3, 165, 140)
+    assert stats.totals_between(datetime(2023, 1, 1), datetime(2024, 1, 1)) == (
+        Totals(1, 1, 25, 25)
+    )
+    assert stats.best_hours("month", NOW) == [(14, 90), (9, 50)]
+    assert rows.call_count == 0
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import time
+
+from focustui.paths import STATUS_READER_PATH
+from focustui.status import (
+    IDLE_MODE,
+    STATUS_LINE_SIZE,
+    SessionStatus,
+    format_status,
+    read_status,
+    write_status,
+)
+
+
+def test_status_line_has_fixed_size(tmp_path):
+    path = tmp_path / "status"
+    write_status(path, SessionStatus(IDLE_MODE))
+    assert path.stat().st_size == STATUS_LINE_SIZE
+    write_status(
+        path,
+        SessionStatus("queue", 1_700_000_000, 1_700_001_500, label="Focus 10/10"),
+    )
+    assert path.stat().st_size == STATUS_LINE_SIZE
+
+
+def test_multibyte_label_keeps_line_size(tmp_path):
+    path = tmp_path / "status"
+    write_status(
+        path,
+        SessionStatus("queue", 1000, 2500, label="Przerwa ąąąąąąąąąąąąąąą"),
+    )
+    assert path.stat().st_size == STATUS_LINE_SIZE
+    # Label is cut before a character that doesn't fit whole
+    assert read_status(path).label == "Przerwa ąąąąąąąą"
+
+
+def test_status_is_read_and_formatted(tmp_path):
+    path = tmp_path / "status"
+    write_status(
+        path,
+        SessionStatus("queue", 1000, 2500, ambient=True, label="Focus 1/4"),
+    )
+    status = read_status(path)
+    assert status.mode == "queue"
+    assert status.label == "Focus 1/4"
+    assert format_status(status, now=1000) == "Focus 1/4 25:00 ~"
+    assert format_status(status, now=3000) == "Focus 1/4 0:00 ~"
+
+    write_status(path, SessionStatus("stopwatch", 1000))
+    assert format_status(read_status(path), now=1065.5) == "1:05"
+
+
+def test_session_ending_at_same_time_is_same():
+    status = SessionStatus("timer", 1000, 2500)
+    assert status.is_same_session("timer", 2501.5)
+    assert not status.is_same_session("timer", 2560)
+    assert not status.is_same_session("queue", 2500)
+    assert not SessionStatus("stopwatch", 1000).is_same_session("stopwatch", 0)
+
+
+def test_idle_or_closed_app_has_no_status(tmp_path):
+    path = tmp_path / "status"
+    assert read_status(path) is None
+    write_status(path, SessionStatus(IDLE_MODE))
+    assert read_status(path) is None
+    # Process that is gone can't be running a session
+    process = subprocess.Popen(["true"])
+    process.wait()
+    write_status(path, SessionStatus("timer", 1000, 2500, pid=process.pid))
+    assert read_status(path) is None
+    assert format_status(None, now=0) == ""
+
+
+def test_shell_reader_matches_python_reader(tmp_path):
+    path = tmp_path / "status"
+    now = int(time.time())
+    status = SessionStatus("timer", now, now + 600, label="Focus 1/4")
+    write_status(path, status)
+    result = subprocess.run(
+        ["sh", str(STATUS_READER_PATH), str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ},
+    )
+    assert result.stdout.strip() in {
+        format_status(status, now), format_status(status, now + 1),
+    }
+    write_status(path, SessionStatus(IDLE_MODE))
+    result = subprocess.run(
+        ["sh", str(STATUS_READER_PATH), str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout == ""
@@ -0,0 +1,66 @@
+import json
+
+from pytest_mock.plugin import MockerFixture
+from textual.css.stylesheet import Stylesheet
+
+from focustui.themes import (
+    EXAMPLE_THEME,
+    CachedStylesheet,
+    StylesheetCache,
+    load_themes,
+)
+
+CSS = "Screen { background: $background; }"
+
+
+def test_load_themes_skips_invalid_files(tmp_path):
+    (tmp_path / "forest.json").write_text(json.dumps(EXAMPLE_THEME))
+    (tmp_path / "plain.json").write_text(json.dumps({"primary": "red"}))
+    (tmp_path / "bad.json").write_text(json.dumps({"primary": "not a color"}))
+
+    themes, errors = load_themes(tmp_path)
+    assert [theme.name for theme in themes] == ["forest", "plain"]
+    assert themes[0].background == EXAMPLE_THEME["background"]
+    assert len(errors) == 1
+    assert errors[0].startswith("bad.json")
+
+
+def parsed_background(stylesheet: CachedStylesheet) -> str:
+    stylesheet.add_source(CSS, read_from=("test.tcss", ""))
+    stylesheet.parse()
+    return stylesheet.rules[0].styles.background.hex
+
+
+def test_rules_are_cached_per_variables(mocker: MockerFixture, tmp_path):
+    parse = mocker.spy(Stylesheet, "_parse_rules")
+    cache = StylesheetCache(tmp_path)
+    stylesheet = CachedStylesheet(variables={"background": "#000000"}, cache=cache)
+    assert parsed_background(stylesheet) == "#000000"
+
+    stylesheet.set_variables({"background": "#FFFFFF"})
+    stylesheet.reparse()
+    assert stylesheet.rules[0].styles.background.hex == "#FFFFFF"
+    # Switching back to known variables doesn't parse again
+    stylesheet.set_variables({"background": "#000000"})
+    stylesheet.reparse()
+    assert stylesheet.rules[0].styles.background.hex == "#000000"
+    assert parse.call_count == 2
+
+
+def test_cache_is_read_from_disk(mocker: MockerFixture, tmp_path):
+    variables = {"background": "#123456"}
+    stylesheet = CachedStylesheet(variables=variables, cache=StylesheetCache(tmp_path))
+    parsed_background(stylesheet)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+    parse = mocker.spy(Stylesheet, "_parse_rules")
+    stylesheet = CachedStylesheet(variables=variables, cache=StylesheetCache(tmp_path))
+    assert parsed_background(stylesheet) == "#123456"
+    assert parse.call_count == 0
+
+
+def test_broken_cache_is_parsed_again(tmp_path):
+    variables = {"background": "#123456"}
+    stylesheet = CachedStylesheet(variables=variables, cache=StylesheetCache(tmp_path))
+    (tmp_path / f"{stylesheet.variables_key}.pickle").write_bytes(b"broken")
+    assert parsed_background(stylesheet) == "#123456"